@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+fake-gemini-server.py — A local stand-in for the Gemini generateContent
+endpoint, for exercising generate-images.py (rate limiting, 429 backoff,
+concurrency, --resume) without spending API credits.
+
+Every request gets a solid-color PNG at the size Gemini 2.5 Flash Image
+returns for the requested aspect ratio, plus usage_metadata with the real
+per-image token counts, after --latency seconds. With --rpm the server
+enforces a sliding 60-second window and answers RESOURCE_EXHAUSTED (429)
+with a RetryInfo retryDelay, exactly as the real API does; --error-rate
+adds random 429/503 responses on top. --daily-limit makes every request
+past the limit fail with a per-day quota error.
+
+Usage
+-----
+    # Terminal 1: fake API that allows 20 RPM and takes 3s per image
+    python fake-gemini-server.py --rpm 20 --latency 3
+
+    # Terminal 2: point generate-images.py at it
+    GEMINI_API_KEY=fake python generate-images.py docs/stories/rene-descartes \
+        --base-url http://127.0.0.1:8765 --rpm 30 --concurrency 4
+
+Stop the server with Ctrl-C to print request, 429 and peak-concurrency
+totals. Standard library only.
+"""
+import argparse
+import base64
+import json
+import random
+import re
+import signal
+import struct
+import sys
+import threading
+import time
+import zlib
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_PORT = 8765
+
+# Output sizes of gemini-2.5-flash-image per aspect ratio
+# Source: https://ai.google.dev/gemini-api/docs/image-generation
+IMAGE_SIZES = {
+    "1:1": (1024, 1024), "2:3": (832, 1248), "3:2": (1248, 832),
+    "3:4": (864, 1184), "4:3": (1184, 864), "4:5": (896, 1152),
+    "5:4": (1152, 896), "9:16": (768, 1344), "16:9": (1344, 768),
+    "21:9": (1536, 672),
+}
+OUTPUT_TOKENS_PER_IMAGE = 1290
+
+_PATH = re.compile(r"^/[^/]+/models/([^/:]+):generateContent$")
+
+
+def solid_png(width: int, height: int, rgb: tuple[int, int, int]) -> bytes:
+    """A valid width x height PNG filled with one color."""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return (struct.pack(">I", len(data)) + kind + data
+                + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    row = b"\x00" + bytes(rgb) * width
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(row * height, 6))
+            + chunk(b"IEND", b""))
+
+
+class FakeGemini:
+    """Request accounting and the rate-limit window, shared by handler threads."""
+
+    def __init__(self, args):
+        self.args = args
+        self.lock = threading.Lock()
+        self.window: deque[float] = deque()
+        self.requests = 0
+        self.images = 0
+        self.rate_limited = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.started = time.monotonic()
+        self._pngs: dict[str, bytes] = {}
+
+    def admit(self) -> tuple[int, dict] | None:
+        """None if the request may proceed, else (status, error body)."""
+        now = time.monotonic()
+        with self.lock:
+            self.requests += 1
+            if self.args.daily_limit is not None and self.images >= self.args.daily_limit:
+                self.rate_limited += 1
+                return 429, error_body(
+                    429, "RESOURCE_EXHAUSTED",
+                    f"Quota exceeded for metric: generate_requests_per_model_per_day, "
+                    f"limit: {self.args.daily_limit}",
+                    quota_id="GenerateRequestsPerDayPerProjectPerModel")
+            while self.window and now - self.window[0] >= 60:
+                self.window.popleft()
+            if self.args.rpm and len(self.window) >= self.args.rpm:
+                self.rate_limited += 1
+                retry = 60 - (now - self.window[0])
+                return 429, error_body(
+                    429, "RESOURCE_EXHAUSTED",
+                    f"Quota exceeded for metric: generate_requests_per_model, "
+                    f"limit: {self.args.rpm}. Please retry in {retry:.1f}s.",
+                    quota_id="GenerateRequestsPerMinutePerProjectPerModel", retry=retry)
+            if random.random() < self.args.error_rate:
+                if random.random() < 0.5:
+                    self.rate_limited += 1
+                    return 429, error_body(429, "RESOURCE_EXHAUSTED", "Resource has been exhausted.",
+                                           quota_id="GenerateRequestsPerMinutePerProjectPerModel",
+                                           retry=self.args.retry_delay)
+                self.errors += 1
+                return 503, error_body(503, "UNAVAILABLE", "The model is overloaded. Please try again later.")
+            self.window.append(now)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        return None
+
+    def finish(self) -> None:
+        with self.lock:
+            self.in_flight -= 1
+            self.images += 1
+
+    def png(self, aspect_ratio: str) -> bytes:
+        if aspect_ratio not in self._pngs:
+            width, height = IMAGE_SIZES.get(aspect_ratio, IMAGE_SIZES["1:1"])
+            self._pngs[aspect_ratio] = solid_png(width, height, (70, 110, 170))
+        return self._pngs[aspect_ratio]
+
+    def summary(self) -> str:
+        elapsed = time.monotonic() - self.started
+        return (f"{self.requests} requests, {self.images} images, {self.rate_limited} x 429, "
+                f"{self.errors} x 503, peak {self.peak_in_flight} in flight, "
+                f"{elapsed:.0f}s ({self.images / elapsed * 60 if elapsed else 0:.1f} images/min)")
+
+
+def error_body(code: int, status: str, message: str, quota_id: str | None = None,
+               retry: float | None = None) -> dict:
+    """A google.rpc.Status error in the shape the Gemini API returns."""
+    details = []
+    if quota_id:
+        details.append({"@type": "type.googleapis.com/google.rpc.QuotaFailure",
+                        "violations": [{"quotaMetric": "generativelanguage.googleapis.com/"
+                                                       "generate_content_requests",
+                                        "quotaId": quota_id}]})
+    if retry is not None:
+        details.append({"@type": "type.googleapis.com/google.rpc.RetryInfo",
+                        "retryDelay": f"{max(1, round(retry))}s"})
+    return {"error": {"code": code, "message": message, "status": status, "details": details}}
+
+
+def make_handler(fake: FakeGemini):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, fmt, *args):
+            if not fake.args.quiet:
+                sys.stderr.write(f"  {time.strftime('%H:%M:%S')} {fmt % args}\n")
+
+        def send_json(self, status: int, body: dict) -> None:
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=UTF-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                request = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                self.send_json(400, error_body(400, "INVALID_ARGUMENT", "Invalid JSON payload"))
+                return
+            match = _PATH.match(self.path.split("?")[0])
+            if not match:
+                self.send_json(404, error_body(404, "NOT_FOUND", f"Unknown path {self.path}"))
+                return
+
+            rejected = fake.admit()
+            if rejected:
+                self.send_json(*rejected)
+                return
+            try:
+                time.sleep(fake.args.latency * random.uniform(0.8, 1.2))
+                config = request.get("generationConfig") or {}
+                aspect_ratio = (config.get("imageConfig") or {}).get("aspectRatio", "1:1")
+                prompt = " ".join(part.get("text", "")
+                                  for content in request.get("contents") or []
+                                  for part in content.get("parts") or [])
+                input_tokens = max(1, len(prompt) // 4)
+                body = {
+                    "candidates": [{
+                        "content": {"role": "model", "parts": [{"inlineData": {
+                            "mimeType": "image/png",
+                            "data": base64.b64encode(fake.png(aspect_ratio)).decode("ascii"),
+                        }}]},
+                        "finishReason": "STOP",
+                        "index": 0,
+                    }],
+                    "usageMetadata": {
+                        "promptTokenCount": input_tokens,
+                        "candidatesTokenCount": OUTPUT_TOKENS_PER_IMAGE,
+                        "totalTokenCount": input_tokens + OUTPUT_TOKENS_PER_IMAGE,
+                    },
+                    "modelVersion": match.group(1),
+                }
+            finally:
+                fake.finish()
+            self.send_json(200, body)
+
+    return Handler
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=DEFAULT_PORT,
+                    help=f"Port to listen on (default: {DEFAULT_PORT})")
+    ap.add_argument("--latency", type=float, default=2.0,
+                    help="Seconds per image, +/-20%% (default: 2.0)")
+    ap.add_argument("--rpm", type=int, default=0,
+                    help="Requests allowed per sliding minute before 429s (default: 0, unlimited)")
+    ap.add_argument("--error-rate", type=float, default=0.0,
+                    help="Fraction of requests answered with a random 429 or 503 (default: 0)")
+    ap.add_argument("--retry-delay", type=float, default=2.0,
+                    help="retryDelay sent with random 429s (default: 2.0)")
+    ap.add_argument("--daily-limit", type=int, default=None,
+                    help="Images after which every request fails with a per-day quota error")
+    ap.add_argument("--quiet", action="store_true", help="Do not log each request")
+    args = ap.parse_args()
+
+    fake = FakeGemini(args)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(fake))
+    server.daemon_threads = True
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f"Fake Gemini API on http://{args.host}:{args.port}  "
+          f"(latency {args.latency}s, rpm {args.rpm or 'unlimited'}, "
+          f"error rate {args.error_rate:.0%})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\n{fake.summary()}")
+
+
+if __name__ == "__main__":
+    main()
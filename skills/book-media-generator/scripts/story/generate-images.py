@@ -30,15 +30,47 @@ Usage
     # image before committing API credits to the remaining 12 panels
     python generate-images.py docs/stories/rene-descartes --first-only
 
-    # Resume after a partial run
+    # Resume after a partial or interrupted run: skips panels already
+    # generated from the same prompt, regenerates panels whose prompt changed
+    python generate-images.py docs/stories/rene-descartes --resume
+
+    # Skip every panel whose PNG exists, whatever prompt it came from
     python generate-images.py docs/stories/rene-descartes --skip-existing
 
+    # Paid tier: 60 requests per minute, up to 8 in flight at once
+    python generate-images.py docs/stories/rene-descartes --rpm 60 --concurrency 8
+
     # Portrait aspect for a book cover
     python generate-images.py docs/stories/rene-descartes --aspect-ratio 2:3
 
+    # Dry run against the local fake server (no API credits used)
+    python fake-gemini-server.py --rpm 20 &
+    GEMINI_API_KEY=fake python generate-images.py docs/stories/rene-descartes \
+        --base-url http://127.0.0.1:8765 --rpm 30 --concurrency 4
+
+Rate limiting
+-------------
+Requests are issued by --concurrency asyncio workers that share one token
+bucket: it refills at --rpm requests per minute and holds at most --burst
+tokens. A 429 RESOURCE_EXHAUSTED response pauses every worker for the
+server's retryDelay (or an exponential backoff) and halves the refill rate;
+each success after that raises it by a tenth of --rpm until it is back to
+--rpm. A per-day quota or a zero quota ("limit: 0") is not retried — the run
+stops and can be continued later with --resume.
+
+Prompt cache
+------------
+Every image is also stored in the shared prompt cache (prompt_cache.py,
+~/.cache/bk-generated-images) under a hash of model, prompt and aspect
+ratio. Rerunning with a prompt that was already rendered — in this story or
+any other book — writes the cached image without an API call; the usage log
+records it with cache_hit and saved_cost_usd. --refresh-cache regenerates
+and replaces the cached images; --no-cache bypasses the cache entirely.
+
 Environment
 -----------
     export GEMINI_API_KEY=...    (or GOOGLE_API_KEY)
+    export GEMINI_BASE_URL=...   (optional, same as --base-url)
 
 Get a free API key at https://aistudio.google.com/apikey. The free tier
 allows 500 requests per day and 10 requests per minute, which comfortably
@@ -47,30 +79,56 @@ covers two full 208-image textbooks per day at zero cost.
 Requires: pip install google-genai
 """
 import argparse
+import asyncio
+import hashlib
 import json
 import os
+import random
 import re
 import subprocess
 import sys
 import time
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 
 from google import genai
 from google.genai import types
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from prompt_cache import PromptImageCache
+
 # Gemini 2.5 Flash Image paid-tier pricing (USD) as of early 2026.
 # Source: https://ai.google.dev/gemini-api/docs/pricing
 PRICE_INPUT_PER_1M = 0.30    # text input tokens
 PRICE_OUTPUT_PER_1M = 30.00  # image output tokens
 
+MODEL = "gemini-2.5-flash-image"
+
 # Free-tier rate limit for gemini-2.5-flash-image. 10 RPM => one request
-# every 6 seconds at minimum. The script enforces this client-side so it
-# never trips a 429. Override with --rpm if you're on the paid tier with a
+# every 6 seconds on average. The script enforces this client-side so it
+# rarely trips a 429. Override with --rpm if you're on the paid tier with a
 # higher quota.
 # Source: https://ai.google.dev/gemini-api/docs/rate-limits
 DEFAULT_RPM_LIMIT = 10
 
+# Requests in flight at once. A generation takes ~8-15s, so at 10 RPM a
+# single worker cannot keep up with the limit; a few workers can.
+DEFAULT_CONCURRENCY = 4
+
+# Retries after a 429 or 5xx before an image is given up on. The wait
+# doubles from BACKOFF_BASE_SEC each attempt (with jitter) unless the
+# server says how long to wait.
+DEFAULT_MAX_RETRIES = 5
+BACKOFF_BASE_SEC = 4.0
+BACKOFF_MAX_SEC = 120.0
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# After a 429 the refill rate never drops below this fraction of --rpm,
+# and each success restores RATE_RECOVERY_STEP of it
+RATE_FLOOR_FRACTION = 0.1
+RATE_RECOVERY_STEP = 0.1
+
 # Supported aspect ratios from the Gemini 2.5 Flash Image production release.
 # Source: https://developers.googleblog.com/gemini-2-5-flash-image-now-ready-for-production-with-new-aspect-ratios/
 SUPPORTED_ASPECT_RATIOS = {
@@ -82,31 +140,90 @@ SUPPORTED_ASPECT_RATIOS = {
 # Hardcoded to logs/ at the project root per skill convention.
 USAGE_LOG = Path("logs/image-generation-usage.jsonl")
 
+# Prompt hash of every image written, per story, so --resume can tell a
+# finished panel from one whose prompt has since been edited
+STATE_DIR = Path(".cache/generate-images")
+STATE_VERSION = 1
+
 
-class RateLimiter:
+class TokenBucket:
     """
-    Enforces a minimum interval between API calls so we stay under the
-    Gemini free-tier 10 RPM cap. Uses wall-clock time, not a sliding window,
-    which is simpler and strictly more conservative. Also tracks total
-    cumulative sleep time for end-of-run reporting.
+    Token-bucket rate limiter shared by the concurrent workers. Holds at most
+    `burst` tokens and refills at rpm/60 tokens per second; every API call
+    takes one. The bucket starts with a single token so a fresh run never
+    opens with a burst the per-minute window has not paid for.
+
+    On a 429, throttle() pauses every worker for the given delay and halves
+    the refill rate (down to RATE_FLOOR_FRACTION of rpm); each success()
+    after that adds back RATE_RECOVERY_STEP of rpm. With rpm <= 0 there is no
+    client-side limit, but 429 pauses still apply. Also tracks total
+    cumulative wait time for end-of-run reporting.
     """
-    def __init__(self, rpm: int):
-        self.min_interval = 60.0 / rpm if rpm > 0 else 0.0
-        self.last_request_time: float | None = None
+    def __init__(self, rpm: int, burst: int = 1):
+        self.max_rate = rpm / 60.0 if rpm > 0 else 0.0
+        self.rate = self.max_rate
+        self.capacity = float(max(1, burst))
+        self.tokens = 1.0
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
         self.total_sleep_sec: float = 0.0
-
-    def wait(self) -> None:
-        if self.last_request_time is None or self.min_interval <= 0:
-            self.last_request_time = time.monotonic()
-            return
-        elapsed = time.monotonic() - self.last_request_time
-        remaining = self.min_interval - elapsed
-        if remaining > 0:
-            print(f"   rate-limit: sleeping {remaining:.1f}s to stay under "
-                  f"{60 / self.min_interval:.0f} RPM")
-            time.sleep(remaining)
-            self.total_sleep_sec += remaining
-        self.last_request_time = time.monotonic()
+        self.throttled = 0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    @property
+    def rpm(self) -> float:
+        return self.rate * 60
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent. Waiters are served in order."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                elif self.max_rate <= 0:
+                    return
+                else:
+                    self._refill(now)
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+                self.total_sleep_sec += wait
+                await asyncio.sleep(wait)
+
+    def throttle(self, delay: float) -> None:
+        """The server returned 429: pause everyone for delay and slow down."""
+        now = time.monotonic()
+        self.throttled += 1
+        self.paused_until = max(self.paused_until, now + delay)
+        if self.max_rate > 0:
+            self._refill(now)
+            self.rate = max(self.max_rate * RATE_FLOOR_FRACTION, self.rate / 2)
+            self.tokens = 0.0
+
+    def success(self) -> None:
+        """A request went through: recover toward the configured rate."""
+        if self.rate < self.max_rate:
+            self._refill(time.monotonic())
+            self.rate = min(self.max_rate, self.rate + self.max_rate * RATE_RECOVERY_STEP)
+
+
+class QuotaExhausted(Exception):
+    """A 429 that waiting will not fix: a daily quota or a zero quota."""
+
+
+@dataclass
+class StoryRun:
+    """State of one run shared by the concurrent workers."""
+    records: dict[int, dict] = field(default_factory=dict)   # prompt index -> record
+    failed: list[Path] = field(default_factory=list)
+    abort: str | None = None
+    cache: PromptImageCache | None = None
 
 
 # Match <details><summary>...Prompt...</summary>BODY</details> blocks.
@@ -145,6 +262,47 @@ def extract_prompts(index_md: Path):
     return prompts
 
 
+def prompt_digest(prompt: str, aspect_ratio: str) -> str:
+    """SHA-256 of everything that determines an image: model, aspect, prompt."""
+    return hashlib.sha256(f"{MODEL}\0{aspect_ratio}\0{prompt}".encode("utf-8")).hexdigest()
+
+
+def state_path(story_dir: Path) -> Path:
+    return STATE_DIR / f"{story_dir.resolve().name}.json"
+
+
+def load_state(path: Path) -> dict:
+    """{image file name: prompt digest} from earlier runs, or {} if unreadable."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("version") == STATE_VERSION:
+            return data["images"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+    return {}
+
+
+def save_state(path: Path, images: dict) -> None:
+    """Write the resume state atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps({"version": STATE_VERSION, "images": images},
+                                   indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def is_done(out_path: Path, digest: str, state: dict) -> bool:
+    """
+    --resume: the PNG exists and was generated from this prompt. A PNG with
+    no recorded prompt (made before resume tracking, or placed by hand)
+    counts as done; one whose prompt has since been edited does not.
+    """
+    if not out_path.exists():
+        return False
+    recorded = state.get(out_path.name)
+    return recorded is None or recorded == digest
+
+
 def log_usage(out_path: Path, response, aspect_ratio: str) -> dict:
     """
     Extract usage_metadata from the API response, estimate the paid-tier cost,
@@ -164,7 +322,7 @@ def log_usage(out_path: Path, response, aspect_ratio: str) -> dict:
     record = {
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "file": str(out_path),
-        "model": "gemini-2.5-flash-image",
+        "model": MODEL,
         "aspect_ratio": aspect_ratio,
         "input_tokens": input_tokens,
         "output_tokens": output_tokens,
@@ -172,42 +330,154 @@ def log_usage(out_path: Path, response, aspect_ratio: str) -> dict:
         "paid_tier_cost_usd": round(cost_usd, 6),
     }
 
+    append_usage(record)
+    return record
+
+
+def log_cache_hit(out_path: Path, meta: dict, aspect_ratio: str, key: str) -> dict:
+    """
+    Append the usage record for an image served from the prompt cache: no
+    tokens and no cost, plus cache_hit and the cost the original call had
+    (saved_cost_usd). Returns the record dict like log_usage.
+    """
+    record = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "file": str(out_path),
+        "model": MODEL,
+        "aspect_ratio": aspect_ratio,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "total_tokens": 0,
+        "paid_tier_cost_usd": 0.0,
+        "cache_hit": True,
+        "saved_cost_usd": round(float(meta.get("cost_usd") or 0.0), 6),
+        "cache_key": key,
+    }
+    append_usage(record)
+    return record
+
+
+def append_usage(record: dict) -> None:
     USAGE_LOG.parent.mkdir(parents=True, exist_ok=True)
     with USAGE_LOG.open("a", encoding="utf-8") as f:
         f.write(json.dumps(record) + "\n")
-    return record
 
 
-def generate_one(client: genai.Client, prompt: str, out_path: Path,
-                 limiter: RateLimiter, aspect_ratio: str) -> tuple[bool, dict | None]:
+def write_image(out_path: Path, data: bytes) -> None:
+    """
+    Write to a temp file and rename, so an interrupted run never leaves a
+    truncated PNG that --resume would take as finished.
+    """
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_name(f".{out_path.name}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, out_path)
+
+
+def server_retry_delay(error) -> float | None:
+    """The wait the server asked for: RetryInfo.retryDelay, else Retry-After."""
+    details = getattr(error, "details", None)
+    if isinstance(details, dict):
+        details = details.get("error", details).get("details")
+    for detail in details if isinstance(details, list) else []:
+        if isinstance(detail, dict) and "retryDelay" in detail:
+            m = re.match(r"([\d.]+)s$", str(detail["retryDelay"]))
+            if m:
+                return float(m.group(1))
+    try:
+        return float(error.response.headers["retry-after"])
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter so workers do not retry in lockstep."""
+    return min(BACKOFF_MAX_SEC, BACKOFF_BASE_SEC * 2 ** attempt) * random.uniform(1.0, 1.25)
+
+
+def is_quota_exhausted(error) -> bool:
+    """
+    A 429 that waiting will not fix: the daily quota is used up, or the
+    project has no quota for the model at all (free-tier image generation
+    returns RESOURCE_EXHAUSTED with "limit: 0").
+    """
+    text = str(error)
+    return "limit: 0" in text or "PerDay" in text
+
+
+async def generate_one(client: genai.Client, prompt: str, out_path: Path,
+                       limiter: TokenBucket, aspect_ratio: str,
+                       max_retries: int = DEFAULT_MAX_RETRIES,
+                       cache: PromptImageCache | None = None) -> tuple[bool, dict | None]:
     """
     Call Gemini 2.5 Flash Image with the requested aspect_ratio and write the
     first returned image to out_path. Returns (success, record) where record
     is a dict of metadata captured during the call (tokens, cost, wall-clock
-    time, byte size). Respects the provided RateLimiter before the API call.
+    time, byte size, retries). Waits on the shared TokenBucket before every
+    attempt; 429 and 5xx responses are retried up to max_retries times.
+    Raises QuotaExhausted when a 429 means the quota itself is gone.
+
+    If the prompt cache already holds an image for this model, prompt and
+    aspect ratio, it is written instead and no request is made.
     """
+    name = out_path.name
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.key(MODEL, prompt, {"aspect_ratio": aspect_ratio})
+        hit = cache.get(cache_key)
+        if hit is not None:
+            data, meta = hit
+            write_image(out_path, data)
+            rec = log_cache_hit(out_path, meta, aspect_ratio, cache_key)
+            rec["wall_clock_sec"] = 0.0
+            rec["file_size_bytes"] = len(data)
+            rec["retries"] = 0
+            rec["prompt_excerpt"] = " ".join(prompt.split())[:160]
+            print(f"-> {out_path} from prompt cache ({len(data):,} bytes, "
+                  f"saved ${rec['saved_cost_usd']:.4f})")
+            return True, rec
+
     print(f"-> generating {out_path}")
-    limiter.wait()
-    t0 = time.monotonic()
-    try:
-        response = client.models.generate_content(
-            model="gemini-2.5-flash-image",
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                response_modalities=["IMAGE"],
-                image_config=types.ImageConfig(aspect_ratio=aspect_ratio),
-            ),
-        )
-    except Exception as e:
-        print(f"   ERROR: API call failed: {type(e).__name__}: {e}")
-        return False, None
+    config = types.GenerateContentConfig(
+        response_modalities=["IMAGE"],
+        image_config=types.ImageConfig(aspect_ratio=aspect_ratio),
+    )
+    retries = 0
+    while True:
+        await limiter.acquire()
+        t0 = time.monotonic()
+        try:
+            response = await client.aio.models.generate_content(
+                model=MODEL, contents=prompt, config=config,
+            )
+            break
+        except Exception as e:
+            code = getattr(e, "code", None)
+            if code == 429 and is_quota_exhausted(e):
+                raise QuotaExhausted(f"{code} {getattr(e, 'status', '')}: "
+                                     f"{getattr(e, 'message', None) or e}") from e
+            if code not in RETRYABLE_STATUS_CODES or retries >= max_retries:
+                print(f"   {name}: ERROR: API call failed: {type(e).__name__}: {e}")
+                return False, None
+            delay = server_retry_delay(e) or backoff_delay(retries)
+            retries += 1
+            if code == 429:
+                limiter.throttle(delay)
+                rate = f", limit now {limiter.rpm:.1f} RPM" if limiter.max_rate > 0 else ""
+                print(f"   {name}: 429 rate-limited — all workers paused {delay:.1f}s{rate} "
+                      f"(retry {retries}/{max_retries})")
+            else:
+                print(f"   {name}: {code} {getattr(e, 'status', '')} — retrying in {delay:.1f}s "
+                      f"(retry {retries}/{max_retries})")
+                await asyncio.sleep(delay)
+    limiter.success()
     wall_clock_sec = time.monotonic() - t0
 
     # Gemini sometimes returns a candidate with no content (safety filter,
     # refusal, or empty response). Handle all of these gracefully.
     candidates = getattr(response, "candidates", None) or []
     if not candidates:
-        print(f"   ERROR: response has no candidates (likely blocked by safety filter)")
+        print(f"   {name}: ERROR: response has no candidates (likely blocked by safety filter)")
         prompt_feedback = getattr(response, "prompt_feedback", None)
         if prompt_feedback:
             print(f"   prompt_feedback: {prompt_feedback}")
@@ -217,7 +487,7 @@ def generate_one(client: genai.Client, prompt: str, out_path: Path,
     finish_reason = getattr(candidate, "finish_reason", None)
     content = getattr(candidate, "content", None)
     if content is None:
-        print(f"   ERROR: candidate has no content "
+        print(f"   {name}: ERROR: candidate has no content "
               f"(finish_reason={finish_reason}) — likely safety filter")
         safety = getattr(candidate, "safety_ratings", None)
         if safety:
@@ -228,23 +498,32 @@ def generate_one(client: genai.Client, prompt: str, out_path: Path,
     for part in parts:
         inline = getattr(part, "inline_data", None)
         if inline and inline.data:
-            out_path.parent.mkdir(parents=True, exist_ok=True)
-            out_path.write_bytes(inline.data)
+            write_image(out_path, inline.data)
             file_size = out_path.stat().st_size
-            print(f"   wrote {out_path} ({file_size:,} bytes, "
+            print(f"   {name}: wrote {out_path} ({file_size:,} bytes, "
                   f"{wall_clock_sec:.1f}s wall-clock)")
             rec = log_usage(out_path, response, aspect_ratio)
             rec["wall_clock_sec"] = round(wall_clock_sec, 2)
             rec["file_size_bytes"] = file_size
+            rec["retries"] = retries
             rec["prompt_excerpt"] = " ".join(prompt.split())[:160]
+            if cache is not None:
+                cache.put(cache_key, inline.data, {
+                    "model": MODEL,
+                    "params": {"aspect_ratio": aspect_ratio},
+                    "cost_usd": rec["paid_tier_cost_usd"],
+                    "input_tokens": rec["input_tokens"],
+                    "output_tokens": rec["output_tokens"],
+                    "prompt_excerpt": rec["prompt_excerpt"],
+                })
             print(
-                f"   tokens in/out: {rec['input_tokens']}/{rec['output_tokens']}  "
+                f"   {name}: tokens in/out: {rec['input_tokens']}/{rec['output_tokens']}  "
                 f"paid-tier cost: ${rec['paid_tier_cost_usd']:.4f}  "
                 f"(free on the free tier)"
             )
             return True, rec
 
-    print(f"   ERROR: no image data returned")
+    print(f"   {name}: ERROR: no image data returned")
     for part in parts:
         if getattr(part, "text", None):
             print(f"   text part: {part.text[:300]}")
@@ -262,6 +541,9 @@ def write_story_log(
     aspect_ratio: str,
     args_first_only: bool,
     args_skip_existing: bool,
+    args_resume: bool = False,
+    concurrency: int = 1,
+    throttled: int = 0,
 ) -> Path:
     """
     Write a per-story markdown log to logs/{story-name}-{YYYY-MM-DD}.md
@@ -272,7 +554,9 @@ def write_story_log(
     date_str = run_started_at.astimezone().strftime("%Y-%m-%d")
     log_path = Path("logs") / f"{story_name}-{date_str}.md"
 
-    total_images = len(records)
+    cache_hits = sum(1 for r in records if r.get("cache_hit"))
+    total_saved = sum(r.get("saved_cost_usd", 0.0) for r in records)
+    total_images = len(records) - cache_hits
     total_input = sum(r["input_tokens"] for r in records)
     total_output = sum(r["output_tokens"] for r in records)
     total_tokens = sum(r["total_tokens"] for r in records)
@@ -286,6 +570,8 @@ def write_story_log(
         flags.append("`--first-only`")
     if args_skip_existing:
         flags.append("`--skip-existing`")
+    if args_resume:
+        flags.append("`--resume`")
     flags_str = " ".join(flags) if flags else "(none)"
 
     lines: list[str] = []
@@ -298,15 +584,19 @@ def write_story_log(
                  f"({run_duration/60:.1f} minutes)  ")
     lines.append(f"**Story directory:** `{story_dir}`  ")
     lines.append(f"**Source index:** `{index_md}`  ")
-    lines.append(f"**Model:** `gemini-2.5-flash-image`  ")
+    lines.append(f"**Model:** `{MODEL}`  ")
     lines.append(f"**Aspect ratio:** `{aspect_ratio}` (native, no post-processing)  ")
     lines.append(f"**Rate limit:** {rpm_limit} RPM  ")
+    lines.append(f"**Concurrency:** {concurrency} requests in flight  ")
     lines.append(f"**Rate-limiter total sleep:** {limiter_sleep_sec:.1f} seconds  ")
+    lines.append(f"**429 responses:** {throttled}  ")
     lines.append(f"**CLI flags:** {flags_str}")
     lines.append("")
     lines.append("## Summary")
     lines.append("")
     lines.append(f"- **Images generated:** {total_images}")
+    lines.append(f"- **Served from prompt cache:** {cache_hits} "
+                 f"(${total_saved:.4f} paid-tier cost saved)")
     lines.append(f"- **Total input tokens:** {total_input:,}")
     lines.append(f"- **Total output tokens:** {total_output:,}")
     lines.append(f"- **Total tokens:** {total_tokens:,}")
@@ -399,10 +689,65 @@ def _finalize_run(story_dir, index_md, run_records, run_started_at, args, limite
         aspect_ratio=args.aspect_ratio,
         args_first_only=args.first_only,
         args_skip_existing=args.skip_existing,
+        args_resume=args.resume,
+        concurrency=args.concurrency,
+        throttled=limiter.throttled,
     )
     print(f"\nPer-story log written: {log_path}")
 
 
+async def generation_worker(client, queue: asyncio.Queue, run: StoryRun,
+                            limiter: TokenBucket, args, target_ratio: float,
+                            state: dict, state_file: Path) -> None:
+    """Generate and verify images from the queue until it is empty or the run aborts."""
+    while run.abort is None:
+        try:
+            index, out_path, prompt = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        try:
+            ok, rec = await generate_one(client, prompt, out_path, limiter,
+                                         args.aspect_ratio, args.max_retries, run.cache)
+        except QuotaExhausted as e:
+            run.abort = f"quota exhausted ({e}) — rerun later with --resume"
+            return
+        if not ok or rec is None:
+            print(f"   SKIPPING {out_path} — will continue with next image\n")
+            run.failed.append(out_path)
+            continue
+        state[out_path.name] = prompt_digest(prompt, args.aspect_ratio)
+        save_state(state_file, state)
+        dims = await asyncio.to_thread(verify_dimensions, out_path)
+        if dims:
+            w, h = dims
+            tag = f"OK {args.aspect_ratio}" if matches_aspect(w, h, target_ratio) \
+                else f"NOT {args.aspect_ratio}"
+            print(f"   {out_path.name}: dimensions: {w}x{h}  [{tag}]")
+            rec["dimensions"] = f"{w}x{h}"
+            if not matches_aspect(w, h, target_ratio):
+                run.abort = f"{out_path} does not match {args.aspect_ratio} — check ImageConfig"
+        run.records[index] = rec
+        print()
+
+
+async def run_generation(client: genai.Client, jobs: list, run: StoryRun,
+                         limiter: TokenBucket, args, target_ratio: float,
+                         state: dict, state_file: Path) -> None:
+    """Generate every (index, out_path, prompt) job with --concurrency workers."""
+    queue: asyncio.Queue = asyncio.Queue()
+    for job in jobs:
+        queue.put_nowait(job)
+    try:
+        workers = [
+            generation_worker(client, queue, run, limiter, args, target_ratio,
+                              state, state_file)
+            for _ in range(max(1, min(args.concurrency, len(jobs))))
+        ]
+        await asyncio.gather(*workers)
+    finally:
+        await client.aio.aclose()
+
+
 def main():
     ap = argparse.ArgumentParser(description=__doc__,
                                  formatter_class=argparse.RawDescriptionHelpFormatter)
@@ -411,9 +756,29 @@ def main():
                     help="Only generate the first (cover) image for testing")
     ap.add_argument("--skip-existing", action="store_true",
                     help="Skip images whose output file already exists")
+    ap.add_argument("--resume", action="store_true",
+                    help="Skip images already generated from their current prompt; "
+                         "regenerate any whose prompt was edited since")
     ap.add_argument("--rpm", type=int, default=DEFAULT_RPM_LIMIT,
                     help="Max requests per minute (default: 10, the free-tier cap). "
                          "Set higher on the paid tier, or 0 to disable throttling.")
+    ap.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                    help=f"Max requests in flight at once (default: {DEFAULT_CONCURRENCY})")
+    ap.add_argument("--burst", type=int, default=1,
+                    help="Requests that may be sent back-to-back after an idle "
+                         "period (token-bucket size, default: 1)")
+    ap.add_argument("--max-retries", type=int, default=DEFAULT_MAX_RETRIES,
+                    help=f"Retries per image after a 429 or 5xx (default: {DEFAULT_MAX_RETRIES})")
+    ap.add_argument("--base-url", default=os.environ.get("GEMINI_BASE_URL"),
+                    help="Gemini API endpoint, e.g. http://127.0.0.1:8765 for "
+                         "fake-gemini-server.py (default: $GEMINI_BASE_URL or Google's)")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="Neither read nor write the shared prompt-hash image cache")
+    ap.add_argument("--refresh-cache", action="store_true",
+                    help="Ignore cached images and regenerate, replacing the cache entries")
+    ap.add_argument("--cache-dir", default=None,
+                    help="Prompt cache directory (default: $BK_GENERATED_IMAGE_CACHE "
+                         "or ~/.cache/bk-generated-images)")
     ap.add_argument("--aspect-ratio", default="16:9",
                     choices=sorted(SUPPORTED_ASPECT_RATIOS),
                     help="Image aspect ratio passed to Gemini ImageConfig. "
@@ -433,58 +798,69 @@ def main():
 
     target_ratio = parse_aspect_ratio(args.aspect_ratio)
 
-    client = genai.Client(api_key=api_key)
-    limiter = RateLimiter(args.rpm)
+    http_options = types.HttpOptions(base_url=args.base_url) if args.base_url else None
+    client = genai.Client(api_key=api_key, http_options=http_options)
+    limiter = TokenBucket(args.rpm, args.burst)
     run_started_at = datetime.now(timezone.utc)
-    run_records: list[dict] = []
 
     prompts = extract_prompts(index_md)
     if not prompts:
         sys.exit(f"ERROR: no image prompts found in {index_md}")
 
     print(f"Found {len(prompts)} image prompts in {index_md}")
-    print(f"Aspect ratio: {args.aspect_ratio}  |  Rate limit: {args.rpm} RPM")
+    print(f"Aspect ratio: {args.aspect_ratio}  |  Rate limit: {args.rpm} RPM  |  "
+          f"Concurrency: {args.concurrency}")
+    if args.base_url:
+        print(f"Endpoint: {args.base_url}")
     if args.first_only:
         prompts = prompts[:1]
         print("--first-only: generating only the cover image for verification\n")
     else:
         print()
 
-    for out_path, prompt in prompts:
+    state_file = state_path(story_dir)
+    state = load_state(state_file)
+    jobs = []
+    for index, (out_path, prompt) in enumerate(prompts):
         if args.skip_existing and out_path.exists():
-            print(f"-> skipping {out_path} (already exists)\n")
+            print(f"-> skipping {out_path} (already exists)")
             continue
-        ok, rec = generate_one(client, prompt, out_path, limiter, args.aspect_ratio)
-        if not ok or rec is None:
-            print(f"   SKIPPING {out_path} — will continue with next image\n")
+        if args.resume and is_done(out_path, prompt_digest(prompt, args.aspect_ratio), state):
+            print(f"-> skipping {out_path} (already generated from this prompt)")
             continue
-        dims = verify_dimensions(out_path)
-        if dims:
-            w, h = dims
-            tag = f"OK {args.aspect_ratio}" if matches_aspect(w, h, target_ratio) \
-                else f"NOT {args.aspect_ratio}"
-            print(f"   dimensions: {w}x{h}  [{tag}]")
-            rec["dimensions"] = f"{w}x{h}"
-            if not matches_aspect(w, h, target_ratio):
-                run_records.append(rec)
-                _finalize_run(story_dir, index_md, run_records,
-                              run_started_at, args, limiter)
-                sys.exit(f"ABORT: {out_path} does not match {args.aspect_ratio} — "
-                         f"check ImageConfig")
-        run_records.append(rec)
+        jobs.append((index, out_path, prompt))
+    if len(jobs) < len(prompts):
         print()
 
+    run = StoryRun(cache=PromptImageCache(args.cache_dir, enabled=not args.no_cache,
+                                          refresh=args.refresh_cache))
+    if jobs:
+        try:
+            asyncio.run(run_generation(client, jobs, run, limiter, args, target_ratio,
+                                       state, state_file))
+        except KeyboardInterrupt:
+            run.abort = "interrupted — rerun with --resume to continue"
+
+    run_records = [run.records[i] for i in sorted(run.records)]
     _finalize_run(story_dir, index_md, run_records, run_started_at, args, limiter)
+    if jobs:
+        print(run.cache.summary())
+    if run.failed:
+        print(f"\n{len(run.failed)} image(s) failed: "
+              f"{', '.join(p.name for p in run.failed)} — rerun with --resume to retry")
+    if run.abort:
+        sys.exit(f"ABORT: {run.abort}")
 
     # Per-run cost summary from today's appended records
     if USAGE_LOG.exists():
         today = datetime.now(timezone.utc).date().isoformat()
         today_records = []
+        today_hits = []
         for line in USAGE_LOG.read_text(encoding="utf-8").splitlines():
             try:
                 r = json.loads(line)
                 if r.get("timestamp", "").startswith(today):
-                    today_records.append(r)
+                    (today_hits if r.get("cache_hit") else today_records).append(r)
             except json.JSONDecodeError:
                 pass
         if today_records:
@@ -494,6 +870,10 @@ def main():
                   f"{total_tokens:,} total tokens, "
                   f"${total_cost:.4f} paid-tier cost "
                   f"(free tier: {len(today_records)}/500 requests used)")
+        if today_hits:
+            saved = sum(r.get("saved_cost_usd", 0.0) for r in today_hits)
+            print(f"Today: {len(today_hits)} images from the prompt cache, "
+                  f"${saved:.4f} paid-tier cost saved")
 
     print("Done.")
 
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache of generated images, keyed by prompt.
+
+Every paid text-to-image call is stored under the SHA-256 of
+(model, prompt, request parameters such as aspect ratio or size, quality),
+so rerunning a generator with a prompt that was already rendered returns the
+stored bytes instantly instead of paying for the same image again. The cache
+is shared by every book and every generator — the Gemini story panels
+(generate-images.py) and the OpenAI covers and logos
+(generate-cover-openai.py, generate-logo-openai.py) — and lives in
+~/.cache/bk-generated-images (or $BK_GENERATED_IMAGE_CACHE, or
+$XDG_CACHE_HOME/bk-generated-images).
+
+Each entry is <key>.png plus <key>.json metadata recording the model,
+parameters, creation time and what the original call cost, which is what a
+hit reports as saved. Nothing is evicted automatically: these images were
+paid for. Delete the directory (or entries in it) to reclaim space.
+
+This is the only copy: the OpenAI generators in src/image-generation/
+import it from here through a sys.path entry.
+
+Usage:
+    from prompt_cache import PromptImageCache
+
+    cache = PromptImageCache(refresh=args.refresh_cache, enabled=not args.no_cache)
+    key = cache.key(model, prompt, {"aspect_ratio": "16:9"})
+    hit = cache.get(key)
+    if hit is None:
+        data = call_the_api(...)
+        cache.put(key, data, {"model": model, "cost_usd": cost})
+    else:
+        data, meta = hit
+    print(cache.summary())
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Bump to invalidate every entry when the key scheme changes
+CACHE_VERSION = 1
+
+
+def default_cache_dir():
+    """$BK_GENERATED_IMAGE_CACHE, else $XDG_CACHE_HOME/bk-generated-images, else ~/.cache/bk-generated-images"""
+    if os.environ.get("BK_GENERATED_IMAGE_CACHE"):
+        return Path(os.environ["BK_GENERATED_IMAGE_CACHE"]).expanduser()
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "bk-generated-images"
+
+
+class PromptImageCache:
+    """Store of generated image bytes keyed by model, prompt and parameters."""
+
+    def __init__(self, cache_dir=None, enabled=True, refresh=False):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.enabled = enabled
+        # refresh: never read, always overwrite (explicit invalidation)
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.saved_usd = 0.0
+
+    @staticmethod
+    def key(model, prompt, params):
+        """Cache key for this prompt sent to model with request params"""
+        payload = json.dumps([CACHE_VERSION, model, params, prompt],
+                             sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key, suffix):
+        return self.cache_dir / key[:2] / f"{key}{suffix}"
+
+    def get(self, key):
+        """Return (image bytes, metadata dict) or None on a miss"""
+        if not self.enabled:
+            return None
+        if self.refresh:
+            self.misses += 1
+            return None
+        try:
+            data = self._path(key, ".png").read_bytes()
+        except OSError:
+            self.misses += 1
+            return None
+        try:
+            meta = json.loads(self._path(key, ".json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            meta = {}
+        self.hits += 1
+        self.saved_usd += float(meta.get("cost_usd") or 0.0)
+        return data, meta
+
+    def put(self, key, data, meta=None):
+        """Store image bytes and their metadata under key (atomically)"""
+        if not self.enabled:
+            return
+        meta = dict(meta or {})
+        meta.setdefault("created", datetime.now(timezone.utc).isoformat())
+        meta["bytes"] = len(data)
+        try:
+            self._path(key, "").parent.mkdir(parents=True, exist_ok=True)
+            for suffix, content in ((".json", json.dumps(meta, indent=2).encode("utf-8")),
+                                    (".png", data)):
+                path = self._path(key, suffix)
+                tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+                tmp_path.write_bytes(content)
+                os.replace(tmp_path, path)
+            self.stored += 1
+        except OSError as e:
+            print(f"⚠️  Could not write generated-image cache entry: {e}")
+
+    def summary(self):
+        """One line of this run's hit/miss stats and the cost the hits saved"""
+        if not self.enabled:
+            return "🗄️  Generated-image cache: disabled (--no-cache)"
+        mode = " (--refresh-cache: lookups skipped)" if self.refresh else ""
+        return (f"🗄️  Generated-image cache: {self.hits} hits, {self.misses} misses, "
+                f"{self.stored} stored, ${self.saved_usd:.4f} saved{mode} — {self.cache_dir}")
@@ -7,9 +7,14 @@ based on concept labels and position in the concept hierarchy.
 """
 
 import csv
+import os
 import re
+import sys
 from typing import Dict, List
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from learning_graph import load_learning_graph
+
 
 def assign_taxonomy(concept_id: int, concept_label: str, taxonomy_config: dict = None) -> str:
     """
@@ -73,19 +78,19 @@ def add_taxonomy_to_csv(input_csv: str, output_csv: str, taxonomy_config: dict =
         Dictionary of taxonomy counts
     """
     rows = []
-    with open(input_csv, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            concept_id = int(row['ConceptID'])
-            concept_label = row['ConceptLabel']
-            taxonomy_id = assign_taxonomy(concept_id, concept_label, taxonomy_config)
-
-            rows.append({
-                'ConceptID': concept_id,
-                'ConceptLabel': concept_label,
-                'Dependencies': row['Dependencies'],
-                'TaxonomyID': taxonomy_id
-            })
+    graph = load_learning_graph(input_csv)
+    ids = graph.ids
+    for i in range(len(graph)):
+        concept_id = ids[i]
+        concept_label = graph.labels[i]
+        taxonomy_id = assign_taxonomy(concept_id, concept_label, taxonomy_config)
+
+        rows.append({
+            'ConceptID': concept_id,
+            'ConceptLabel': concept_label,
+            'Dependencies': '|'.join(str(ids[t]) for t in graph.prereqs(i)),
+            'TaxonomyID': taxonomy_id
+        })
 
     # Write updated CSV
     with open(output_csv, 'w', encoding='utf-8', newline='') as f:
@@ -111,7 +116,6 @@ def add_taxonomy_to_csv(input_csv: str, output_csv: str, taxonomy_config: dict =
 
 
 if __name__ == "__main__":
-    import sys
     import json
 
     # Parse command line arguments
@@ -11,27 +11,39 @@ Analyzes the concept dependency graph and generates quality metrics including:
 - Connected component analysis
 """
 
-import csv
+import os
+import sys
 from collections import defaultdict, deque
 from typing import Dict, List, Set, Tuple
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from learning_graph import LearningGraph, load_learning_graph
+from learning_graph import find_cycles as find_graph_cycles
+
 
 def load_graph(csv_path: str) -> Tuple[Dict[int, str], Dict[int, List[int]]]:
-    """Load the dependency graph from CSV file."""
-    concepts = {}  # id -> label
-    dependencies = defaultdict(list)  # id -> list of prerequisite ids
+    """Load the dependency graph from CSV file.
+
+    The CSV is compiled once by learning_graph.load_learning_graph() and
+    reused from its sidecar cache by the other learning-graph scripts.
+    """
+    graph = load_learning_graph(csv_path)
+    return graph.concepts(), graph.dependencies()
 
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            concept_id = int(row['ConceptID'])
-            concepts[concept_id] = row['ConceptLabel']
 
-            if row['Dependencies']:
-                deps = [int(d) for d in row['Dependencies'].split('|')]
-                dependencies[concept_id] = deps
+def build_dependents(concepts: Dict[int, str],
+                     dependencies: Dict[int, List[int]]) -> Dict[int, List[int]]:
+    """Build the reverse-adjacency index (prerequisite -> dependents) once.
 
-    return concepts, dependencies
+    Graph walks that follow edges from a prerequisite to the concepts that
+    depend on it use this index instead of scanning every dependency list,
+    which keeps them O(V+E).
+    """
+    dependents = {cid: [] for cid in concepts}
+    for concept_id, prereqs in dependencies.items():
+        for prereq in prereqs:
+            dependents.setdefault(prereq, []).append(concept_id)
+    return dependents
 
 
 def calculate_indegree(concepts: Dict[int, str],
@@ -74,14 +86,22 @@ def find_orphaned_nodes(concepts: Dict[int, str],
 
 
 def verify_dag(concepts: Dict[int, str],
-               dependencies: Dict[int, List[int]]) -> Tuple[bool, List[List[int]]]:
+               dependencies: Dict[int, List[int]],
+               dependents: Dict[int, List[int]] = None,
+               graph: LearningGraph = None) -> Tuple[bool, List[List[int]]]:
     """Verify the graph is a DAG using topological sort (Kahn's algorithm).
 
     Uses the reverse graph (prerequisite → dependent) so that:
     - in-degree = number of prerequisites each concept has
     - Start from foundational concepts (no prerequisites)
     - When a concept's prerequisites are all processed, it can be processed too
+
+    If it is not a DAG, the cycles come from find_cycles() on `graph` (the
+    compiled LearningGraph, rebuilt from the dicts when not given).
     """
+    if dependents is None:
+        dependents = build_dependents(concepts, dependencies)
+
     # In-degree in reverse graph = number of prerequisites each concept has
     prereq_count = {cid: len(dependencies.get(cid, [])) for cid in concepts}
 
@@ -93,92 +113,118 @@ def verify_dag(concepts: Dict[int, str],
         node = queue.popleft()
         processed.append(node)
 
-        # Find all concepts that depend on this node (this node is their prerequisite)
-        for concept_id, prereqs in dependencies.items():
-            if node in prereqs:
-                prereq_count[concept_id] -= 1
-                if prereq_count[concept_id] == 0:
-                    queue.append(concept_id)
+        # All concepts that depend on this node (this node is their prerequisite)
+        for concept_id in dependents.get(node, []):
+            prereq_count[concept_id] -= 1
+            if prereq_count[concept_id] == 0:
+                queue.append(concept_id)
 
     is_dag = len(processed) == len(concepts)
-    cycles = [] if is_dag else find_cycles(concepts, dependencies)
+    cycles = []
+    if not is_dag:
+        if graph is None:
+            graph = LearningGraph.from_rows(
+                [(cid, label, '', dependencies.get(cid, [])) for cid, label in concepts.items()])
+        cycles = find_cycles(graph)
 
     return is_dag, cycles
 
 
-def find_cycles(concepts: Dict[int, str],
-                dependencies: Dict[int, List[int]]) -> List[List[int]]:
-    """Find cycles in the graph using DFS."""
-    visited = set()
-    rec_stack = set()
+def find_cycles(graph: LearningGraph) -> List[List[int]]:
+    """Find one witness cycle per cyclic strongly connected component.
+
+    Runs learning_graph.find_cycles() (iterative Tarjan SCC, O(V+E)) and
+    rewrites each cycle as ConceptIDs written prerequisite -> dependent and
+    closed back on its first concept.
+    """
     cycles = []
+    for cycle in find_graph_cycles(graph):
+        ids = [graph.ids[i] for i in [cycle[0]] + cycle[:0:-1]]
+        cycles.append(ids + [ids[0]])
+    return cycles
 
-    def dfs(node, path):
-        visited.add(node)
-        rec_stack.add(node)
-        path.append(node)
-
-        # Check all nodes that this node depends on (reverse edges in dependency graph)
-        for next_node, prereqs in dependencies.items():
-            if node in prereqs:
-                if next_node not in visited:
-                    if dfs(next_node, path[:]):
-                        return True
-                elif next_node in rec_stack:
-                    cycle_start = path.index(next_node)
-                    cycles.append(path[cycle_start:] + [next_node])
-                    return True
-
-        rec_stack.remove(node)
-        return False
-
-    for node in concepts:
-        if node not in visited:
-            dfs(node, [])
 
-    return cycles
+def compute_depths(concepts: Dict[int, str],
+                   dependencies: Dict[int, List[int]],
+                   dependents: Dict[int, List[int]] = None) -> Tuple[Dict[int, int], Dict[int, int]]:
+    """Compute every concept's depth in one topological-order pass.
 
+    Depth is the number of concepts on the longest prerequisite chain ending
+    at a concept (foundational concepts have depth 1). Concepts are visited
+    in Kahn order, so all prerequisites of a concept are final before it is
+    reached; only one predecessor pointer is kept per concept and chains are
+    rebuilt on demand with chain_to(). Concepts on a cycle never become
+    ready and get no depth.
 
-def find_longest_chain(concepts: Dict[int, str],
-                       dependencies: Dict[int, List[int]]) -> Tuple[int, List[int]]:
-    """Find the longest dependency chain using DFS."""
-    memo = {}
+    Returns:
+        Tuple of (concept -> depth, concept -> deepest prerequisite or None)
+    """
+    if dependents is None:
+        dependents = build_dependents(concepts, dependencies)
+
+    prereq_count = {cid: len(dependencies.get(cid, [])) for cid in concepts}
+    queue = deque([cid for cid in concepts if prereq_count[cid] == 0])
+    depth = {}
+    predecessor = {}
 
-    def dfs(node):
-        if node in memo:
-            return memo[node]
+    while queue:
+        node = queue.popleft()
+        best_depth = 0
+        best_prereq = None
+        for prereq in dependencies.get(node, []):
+            if depth[prereq] > best_depth:
+                best_depth = depth[prereq]
+                best_prereq = prereq
+        depth[node] = best_depth + 1
+        predecessor[node] = best_prereq
 
-        if node not in dependencies or not dependencies[node]:
-            memo[node] = (1, [node])
-            return memo[node]
+        for concept_id in dependents.get(node, []):
+            prereq_count[concept_id] -= 1
+            if prereq_count[concept_id] == 0:
+                queue.append(concept_id)
 
-        max_length = 0
-        max_path = []
+    return depth, predecessor
 
-        for prereq in dependencies[node]:
-            length, path = dfs(prereq)
-            if length > max_length:
-                max_length = length
-                max_path = path
 
-        memo[node] = (max_length + 1, max_path + [node])
-        return memo[node]
+def chain_to(node: int, predecessor: Dict[int, int]) -> List[int]:
+    """Rebuild the longest prerequisite chain ending at node, foundation first."""
+    chain = []
+    while node is not None:
+        chain.append(node)
+        node = predecessor[node]
+    chain.reverse()
+    return chain
 
-    max_chain_length = 0
-    max_chain_path = []
 
+def find_longest_chain(concepts: Dict[int, str],
+                       dependencies: Dict[int, List[int]],
+                       dependents: Dict[int, List[int]] = None,
+                       depths: Tuple[Dict[int, int], Dict[int, int]] = None) -> Tuple[int, List[int]]:
+    """Find the longest dependency chain.
+
+    Uses the depths from compute_depths() (computed here if not passed in),
+    so the cost is O(V+E) with no recursion and no per-node path copies.
+    """
+    depth, predecessor = depths or compute_depths(concepts, dependencies, dependents)
+
+    max_chain_length = 0
+    max_chain_end = None
     for concept_id in concepts:
-        length, path = dfs(concept_id)
-        if length > max_chain_length:
-            max_chain_length = length
-            max_chain_path = path
+        if depth.get(concept_id, 0) > max_chain_length:
+            max_chain_length = depth[concept_id]
+            max_chain_end = concept_id
 
-    return max_chain_length, max_chain_path
+    if max_chain_end is None:
+        return 0, []
+    return max_chain_length, chain_to(max_chain_end, predecessor)
 
 
 def find_connected_components(concepts: Dict[int, str],
-                               dependencies: Dict[int, List[int]]) -> List[Set[int]]:
+                               dependencies: Dict[int, List[int]],
+                               dependents: Dict[int, List[int]] = None) -> List[Set[int]]:
     """Find connected components (treating graph as undirected)."""
+    if dependents is None:
+        dependents = build_dependents(concepts, dependencies)
     visited = set()
     components = []
 
@@ -199,8 +245,8 @@ def find_connected_components(concepts: Dict[int, str],
                         component.add(prereq)
                         queue.append(prereq)
 
-            for concept_id, prereqs in dependencies.items():
-                if node in prereqs and concept_id not in visited:
+            for concept_id in dependents.get(node, []):
+                if concept_id not in visited:
                     visited.add(concept_id)
                     component.add(concept_id)
                     queue.append(concept_id)
@@ -217,16 +263,22 @@ def find_connected_components(concepts: Dict[int, str],
 
 def generate_report(csv_path: str, output_path: str):
     """Generate comprehensive quality metrics report."""
-    concepts, dependencies = load_graph(csv_path)
+    graph = load_learning_graph(csv_path)
+    concepts, dependencies = graph.concepts(), graph.dependencies()
+
+    # Reverse-adjacency index shared by the graph walks below
+    dependents = build_dependents(concepts, dependencies)
 
     # Calculate metrics
     indegree = calculate_indegree(concepts, dependencies)
     outdegree = calculate_outdegree(concepts, dependencies)
     terminal = find_terminal_nodes(concepts, indegree, dependencies)
     orphaned = find_orphaned_nodes(concepts, indegree, dependencies)
-    is_dag, cycles = verify_dag(concepts, dependencies)
-    max_chain_length, max_chain_path = find_longest_chain(concepts, dependencies)
-    components = find_connected_components(concepts, dependencies)
+    is_dag, cycles = verify_dag(concepts, dependencies, dependents, graph)
+    depth, predecessor = compute_depths(concepts, dependencies, dependents)
+    max_chain_length, max_chain_path = find_longest_chain(
+        concepts, dependencies, dependents, (depth, predecessor))
+    components = find_connected_components(concepts, dependencies, dependents)
 
     # Foundational concepts (no prerequisites but other concepts depend on them)
     foundational = [(cid, label) for cid, label in concepts.items()
@@ -277,6 +329,19 @@ def generate_report(csv_path: str, output_path: str):
             f.write(f"{i}. **{concepts[cid]}** (ID: {cid})\n")
         f.write("\n")
 
+        f.write("### Depth Distribution\n\n")
+        f.write("Depth is the length of the longest prerequisite chain ending at a concept.\n\n")
+        depth_dist = defaultdict(int)
+        for d in depth.values():
+            depth_dist[d] += 1
+        f.write("| Depth | Number of Concepts |\n")
+        f.write("|-------|--------------------|\n")
+        for d in sorted(depth_dist.keys()):
+            f.write(f"| {d} | {depth_dist[d]} |\n")
+        if len(depth) < len(concepts):
+            f.write(f"| on a cycle | {len(concepts) - len(depth)} |\n")
+        f.write("\n")
+
         terminal_pct = len(terminal) / len(concepts) * 100 if concepts else 0
         f.write("## Terminal Nodes Analysis\n\n")
         f.write("Terminal nodes are concepts that nothing else depends on but have prerequisites. ")
@@ -364,8 +429,6 @@ def generate_report(csv_path: str, output_path: str):
 
 
 if __name__ == "__main__":
-    import sys
-
     # Parse command line arguments
     if len(sys.argv) < 3:
         print("Usage: python analyze-graph.py <input_csv> <output_report.md>")
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark longest-chain and depth computation in analyze-graph.py.
+
+Generates random prerequisite DAGs (10k and 50k concepts by default) and
+times:
+
+  recursive  - the previous find_longest_chain: memoized DFS that stores a
+               (length, path) tuple per concept and copies the path at
+               every node. It runs here with a raised recursion limit on a
+               large thread stack; at the default limit it fails on any
+               chain deeper than about 1,000 concepts
+  dp         - compute_depths + find_longest_chain: one topological-order
+               pass with a predecessor pointer per concept
+
+Each concept draws 1-3 prerequisites from the --window concepts before it,
+so a smaller window gives deeper chains.
+
+Usage:
+    python benchmark-longest-chain.py [--sizes 10000 50000] [--window 100]
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from importlib.util import spec_from_file_location, module_from_spec
+from pathlib import Path
+
+_this_dir = Path(__file__).resolve().parent
+_spec = spec_from_file_location("analyze_graph", _this_dir / "analyze-graph.py")
+analyze_graph = module_from_spec(_spec)
+_spec.loader.exec_module(analyze_graph)
+
+
+def build_random_dag(size: int, window: int, seed: int = 11):
+    """Return (concepts, dependencies) for a random prerequisite DAG."""
+    rng = random.Random(seed)
+    concepts = {}
+    dependencies = {}
+    for cid in range(1, size + 1):
+        concepts[cid] = f"Concept {cid}"
+        if cid > 1:
+            low = max(1, cid - window)
+            count = min(cid - low, rng.randint(1, 3))
+            dependencies[cid] = rng.sample(range(low, cid), count)
+    return concepts, dependencies
+
+
+def recursive_longest_chain(concepts, dependencies):
+    """The previous analyze-graph.find_longest_chain, verbatim."""
+    memo = {}
+
+    def dfs(node):
+        if node in memo:
+            return memo[node]
+
+        if node not in dependencies or not dependencies[node]:
+            memo[node] = (1, [node])
+            return memo[node]
+
+        max_length = 0
+        max_path = []
+
+        for prereq in dependencies[node]:
+            length, path = dfs(prereq)
+            if length > max_length:
+                max_length = length
+                max_path = path
+
+        memo[node] = (max_length + 1, max_path + [node])
+        return memo[node]
+
+    max_chain_length = 0
+    max_chain_path = []
+
+    for concept_id in concepts:
+        length, path = dfs(concept_id)
+        if length > max_chain_length:
+            max_chain_length = length
+            max_chain_path = path
+
+    return max_chain_length, max_chain_path
+
+
+def dp_longest_chain(concepts, dependencies):
+    """Depths for every concept plus the longest chain, iteratively."""
+    dependents = analyze_graph.build_dependents(concepts, dependencies)
+    depths = analyze_graph.compute_depths(concepts, dependencies, dependents)
+    return analyze_graph.find_longest_chain(concepts, dependencies, dependents, depths)
+
+
+def measure(func, concepts, dependencies):
+    """Return (seconds, peak MB, result or exception name)."""
+    outcome = {}
+
+    def run():
+        tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            outcome['result'] = func(concepts, dependencies)
+        except RecursionError:
+            outcome['result'] = 'RecursionError'
+        outcome['elapsed'] = time.perf_counter() - start
+        outcome['peak'] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+
+    # The recursive version needs a deep C stack as well as a high limit
+    old_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(old_limit, len(concepts) + 1000))
+    threading.stack_size(512 * 1024 * 1024)
+    worker = threading.Thread(target=run)
+    worker.start()
+    worker.join()
+    threading.stack_size(0)
+    sys.setrecursionlimit(old_limit)
+    return outcome['elapsed'], outcome['peak'], outcome['result']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--window", type=int, default=100)
+    args = parser.parse_args()
+
+    print("| Concepts | Strategy | Chain length | Time (s) | Peak memory (MB) |")
+    print("|---------:|----------|-------------:|---------:|-----------------:|")
+    for size in args.sizes:
+        concepts, dependencies = build_random_dag(size, args.window)
+        results = {}
+        for name, func in (("recursive", recursive_longest_chain),
+                           ("dp", dp_longest_chain)):
+            elapsed, peak, result = measure(func, concepts, dependencies)
+            results[name] = result
+            length = result if isinstance(result, str) else result[0]
+            print(f"| {size:,} | {name} | {length} | {elapsed:.3f} | {peak:.1f} |")
+        if not isinstance(results['recursive'], str):
+            same = results['recursive'] == results['dp']
+            print(f"| {size:,} | same chain | {'✅' if same else '❌'} | | |")
+
+
+if __name__ == "__main__":
+    main()
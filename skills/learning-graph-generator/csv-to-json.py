@@ -9,13 +9,17 @@ human-readable classifierName values in the output. Without this file,
 taxonomy IDs will be used as fallback (which is usually wrong).
 """
 
-VERSION = "0.04"
+VERSION = "0.05"
 
-import csv
 import json
+import os
+import sys
 from typing import Dict, List
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from learning_graph import load_learning_graph
+
 
 def csv_to_json(csv_path: str, json_path: str, color_config: dict = None,
                 metadata: dict = None, taxonomy_names: dict = None):
@@ -123,42 +127,40 @@ def csv_to_json(csv_path: str, json_path: str, color_config: dict = None,
     edges = []
     foundational_ids = []
 
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            concept_id = int(row['ConceptID'])
-            # Support both ConceptLabel and ConceptName column names
-            label = row.get('ConceptLabel') or row.get('ConceptName', '')
-            taxonomy = row['TaxonomyID']
-            dependencies_str = row['Dependencies']
-
-            # Determine if foundational (no dependencies)
-            is_foundational = (dependencies_str == '')
-            if is_foundational:
-                foundational_ids.append(concept_id)
-
-            # Create node - use taxonomy ID directly as group reference
-            node = {
-                'id': concept_id,
-                'label': label,
-                'group': taxonomy
+    # The CSV is compiled once (and cached) by learning_graph.py; ConceptLabel
+    # and ConceptName column names are both supported there.
+    graph = load_learning_graph(csv_path)
+    ids = graph.ids
+    for i in range(len(graph)):
+        concept_id = ids[i]
+        label = graph.labels[i]
+        taxonomy = graph.taxonomy_of(i)
+
+        # Determine if foundational (no dependencies)
+        is_foundational = graph.outdegree(i) == 0
+        if is_foundational:
+            foundational_ids.append(concept_id)
+
+        # Create node - use taxonomy ID directly as group reference
+        node = {
+            'id': concept_id,
+            'label': label,
+            'group': taxonomy
+        }
+
+        # Special styling for foundational concepts
+        if is_foundational:
+            node['shape'] = 'box'
+
+        nodes.append(node)
+
+        # Create edges (from concept to its prerequisites)
+        for prereq in graph.prereqs(i):
+            edge = {
+                'from': concept_id,
+                'to': ids[prereq]
             }
-
-            # Special styling for foundational concepts
-            if is_foundational:
-                node['shape'] = 'box'
-
-            nodes.append(node)
-
-            # Create edges (from concept to its prerequisites)
-            if dependencies_str:
-                prereq_ids = [int(pid) for pid in dependencies_str.split('|')]
-                for prereq_id in prereq_ids:
-                    edge = {
-                        'from': concept_id,
-                        'to': prereq_id
-                    }
-                    edges.append(edge)
+            edges.append(edge)
 
     # Create metadata section
     default_metadata = {
@@ -295,8 +297,6 @@ def create_taxonomy_legend(groups: dict = None):
 
 
 if __name__ == "__main__":
-    import sys
-
     # Parse command line arguments
     if len(sys.argv) < 3:
         print(f"csv-to-json.py v{VERSION}")
@@ -0,0 +1,470 @@
+"""
+Compiled learning-graph model shared by the learning-graph scripts.
+
+Parses a learning-graph.csv (or a vis-network learning-graph.json) once into
+a compact, array-backed graph:
+
+- integer node indexes 0..N-1 in file order, with the ConceptID of each node
+  in ``ids`` and an ``index`` dict mapping ConceptID -> node index
+- prerequisite edges in CSR form: the prerequisites of node i are
+  ``prereq_targets[prereq_offsets[i]:prereq_offsets[i + 1]]``
+- the reverse (prerequisite -> dependents) CSR, built on first use
+- taxonomy codes interned into ``taxonomy_codes`` with one small integer per
+  node in ``taxonomy``
+
+find_cycles() runs the iterative Tarjan cycle search over that CSR for both
+analyze-graph.py and src/learning-graph/check-loops.py.
+
+Dependencies that reference a ConceptID with no row of its own are kept as
+extra "unknown" nodes after the real ones (indexes num_concepts..len(ids)-1),
+so edge order and invalid references survive the round trip.
+
+load_learning_graph() caches the compiled graph in a pickle sidecar at
+<dir>/.cache/learning-graph/<file name>.pickle, keyed by the SHA-256 of the
+source file, so a validate + analyze + convert pipeline parses the CSV once.
+
+Standard library only, Python 3.7+.
+"""
+
+import csv
+import hashlib
+import io
+import json
+import os
+import pickle
+from array import array
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Bump when the compiled layout changes so stale sidecars are rebuilt
+FORMAT_VERSION = 1
+
+CACHE_DIR = Path(".cache") / "learning-graph"
+
+
+class LearningGraph:
+    """Array-backed concept dependency graph.
+
+    Build one with from_csv_text(), from_vis_json() or load_learning_graph()
+    rather than calling the constructor directly.
+    """
+
+    def __init__(self, ids: Sequence, labels: List[str], taxonomy_codes: List[str],
+                 taxonomy: array, prereq_offsets: array, prereq_targets: array,
+                 num_concepts: int):
+        self.ids = ids
+        self.labels = labels
+        self.taxonomy_codes = taxonomy_codes
+        self.taxonomy = taxonomy
+        self.prereq_offsets = prereq_offsets
+        self.prereq_targets = prereq_targets
+        self.num_concepts = num_concepts
+
+        # ConceptID -> index of its first row (unknown IDs map past num_concepts)
+        self.index = {}
+        for i, concept_id in enumerate(ids):
+            self.index.setdefault(concept_id, i)
+
+        self._dependent_offsets = None
+        self._dependent_targets = None
+
+    # ── Construction ─────────────────────────────────────────────────
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Tuple[int, str, str, List[int]]],
+                  unknown_prereqs: Dict[int, List[int]] = None) -> 'LearningGraph':
+        """Compile (concept_id, label, taxonomy, prerequisite_ids) rows.
+
+        Args:
+            rows: One tuple per concept, in file order
+            unknown_prereqs: Optional prerequisite IDs of ConceptIDs that
+                             have no row (edges from a missing node)
+
+        Returns:
+            The compiled LearningGraph
+        """
+        ids = []
+        labels = []
+        taxonomy_codes = []
+        code_index = {}
+        taxonomy = array('H')
+        index = {}
+
+        for concept_id, label, tax, _ in rows:
+            index.setdefault(concept_id, len(ids))
+            ids.append(concept_id)
+            labels.append(label)
+            if tax not in code_index:
+                code_index[tax] = len(taxonomy_codes)
+                taxonomy_codes.append(tax)
+            taxonomy.append(code_index[tax])
+        num_concepts = len(ids)
+
+        unknown_prereqs = dict(unknown_prereqs or {})
+        for concept_id in unknown_prereqs:
+            if concept_id not in index:
+                index[concept_id] = len(ids)
+                ids.append(concept_id)
+
+        prereq_offsets = array('l', [0])
+        prereq_targets = array('l')
+        i = 0
+        # ids grows while unknown prerequisites are discovered
+        while i < len(ids):
+            if i < num_concepts:
+                prereq_ids = rows[i][3]
+            else:
+                prereq_ids = unknown_prereqs.get(ids[i], [])
+            for prereq_id in prereq_ids:
+                target = index.get(prereq_id)
+                if target is None:
+                    target = index[prereq_id] = len(ids)
+                    ids.append(prereq_id)
+                prereq_targets.append(target)
+            prereq_offsets.append(len(prereq_targets))
+            i += 1
+
+        return cls(_compact_ids(ids), labels, taxonomy_codes, taxonomy,
+                   prereq_offsets, prereq_targets, num_concepts)
+
+    @classmethod
+    def from_csv_text(cls, text: str) -> 'LearningGraph':
+        """Compile a learning-graph CSV.
+
+        Expects ConceptID, ConceptLabel (or ConceptName) and Dependencies
+        columns, with pipe-separated prerequisite IDs. TaxonomyID is optional.
+
+        Args:
+            text: Full text of the CSV file
+
+        Returns:
+            The compiled LearningGraph
+        """
+        rows = []
+        for row in csv.DictReader(io.StringIO(text)):
+            deps = row['Dependencies']
+            rows.append((
+                int(row['ConceptID']),
+                row.get('ConceptLabel') or row.get('ConceptName', ''),
+                row.get('TaxonomyID') or '',
+                [int(d) for d in deps.split('|')] if deps else [],
+            ))
+        return cls.from_rows(rows)
+
+    @classmethod
+    def from_vis_json(cls, data: Dict[str, Any]) -> 'LearningGraph':
+        """Compile an already-parsed vis-network learning-graph JSON document.
+
+        Edges point from a concept to its prerequisite, as written by
+        csv-to-json.py.
+
+        Args:
+            data: Parsed JSON with 'nodes' and 'edges' lists
+
+        Returns:
+            The compiled LearningGraph
+        """
+        prereqs = {}
+        for edge in data.get('edges', []):
+            prereqs.setdefault(edge['from'], []).append(edge['to'])
+
+        rows = []
+        seen = set()
+        for node in data.get('nodes', []):
+            node_id = node['id']
+            # Each node ID owns its edges once, even if the node is duplicated
+            deps = prereqs.get(node_id, []) if node_id not in seen else []
+            seen.add(node_id)
+            rows.append((node_id, node.get('label', str(node_id)),
+                         str(node.get('group', '')), deps))
+        # Edges leaving an ID that has no node stay on its unknown node
+        unknown_prereqs = {source: targets for source, targets in prereqs.items()
+                           if source not in seen}
+        return cls.from_rows(rows, unknown_prereqs)
+
+    # ── Accessors ────────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return self.num_concepts
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.prereq_targets)
+
+    def prereqs(self, i: int) -> array:
+        """Node indexes of the prerequisites of node i."""
+        return self.prereq_targets[self.prereq_offsets[i]:self.prereq_offsets[i + 1]]
+
+    def dependents(self, i: int) -> array:
+        """Node indexes of the concepts that list node i as a prerequisite."""
+        if self._dependent_offsets is None:
+            self._build_dependents()
+        return self._dependent_targets[self._dependent_offsets[i]:self._dependent_offsets[i + 1]]
+
+    def _build_dependents(self) -> None:
+        """Build the reverse CSR with one counting pass and one fill pass."""
+        n = len(self.ids)
+        counts = array('l', [0]) * (n + 1)
+        for target in self.prereq_targets:
+            counts[target + 1] += 1
+        for i in range(n):
+            counts[i + 1] += counts[i]
+        fill = array('l', counts)
+        targets = array('l', [0]) * len(self.prereq_targets)
+        offsets = self.prereq_offsets
+        for source in range(n):
+            for k in range(offsets[source], offsets[source + 1]):
+                target = self.prereq_targets[k]
+                targets[fill[target]] = source
+                fill[target] += 1
+        self._dependent_offsets = counts
+        self._dependent_targets = targets
+
+    def outdegree(self, i: int) -> int:
+        """Number of prerequisites of node i."""
+        return self.prereq_offsets[i + 1] - self.prereq_offsets[i]
+
+    def indegree(self, i: int) -> int:
+        """Number of concepts that depend on node i."""
+        if self._dependent_offsets is None:
+            self._build_dependents()
+        return self._dependent_offsets[i + 1] - self._dependent_offsets[i]
+
+    def taxonomy_of(self, i: int) -> str:
+        """Taxonomy code of node i ('' when the CSV has none)."""
+        return self.taxonomy_codes[self.taxonomy[i]]
+
+    def edges(self) -> Iterator[Tuple[int, int]]:
+        """Yield (concept_id, prerequisite_id) pairs in file order."""
+        ids = self.ids
+        for i in range(len(ids)):
+            for target in self.prereqs(i):
+                yield ids[i], ids[target]
+
+    def unknown_ids(self) -> List[int]:
+        """ConceptIDs referenced by an edge but defined by no row."""
+        return list(self.ids[self.num_concepts:])
+
+    def duplicate_ids(self) -> List[int]:
+        """ConceptIDs that appear on more than one row."""
+        seen = set()
+        duplicates = []
+        for concept_id in self.ids[:self.num_concepts]:
+            if concept_id in seen and concept_id not in duplicates:
+                duplicates.append(concept_id)
+            seen.add(concept_id)
+        return duplicates
+
+    # ── Dict views for the original script APIs ──────────────────────
+
+    def concepts(self) -> Dict[int, str]:
+        """ConceptID -> label, as analyze-graph.load_graph() returned it."""
+        return {self.ids[i]: self.labels[i] for i in range(self.num_concepts)}
+
+    def dependencies(self) -> Dict[int, List[int]]:
+        """ConceptID -> prerequisite IDs for concepts that have any."""
+        ids = self.ids
+        deps = {}
+        for i in range(self.num_concepts):
+            if self.outdegree(i):
+                deps[ids[i]] = [ids[t] for t in self.prereqs(i)]
+        return deps
+
+    # ── Pickle sidecar state ─────────────────────────────────────────
+
+    def to_state(self) -> Dict[str, Any]:
+        """Plain dict of the compiled arrays, for pickling."""
+        return {
+            'ids': self.ids, 'labels': self.labels,
+            'taxonomy_codes': self.taxonomy_codes, 'taxonomy': self.taxonomy,
+            'prereq_offsets': self.prereq_offsets,
+            'prereq_targets': self.prereq_targets,
+            'num_concepts': self.num_concepts,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'LearningGraph':
+        """Rebuild a graph from to_state() output."""
+        return cls(**state)
+
+
+def _compact_ids(ids: List[Any]):
+    """Store integer ConceptIDs in an array; keep other ID types as a list."""
+    try:
+        return array('q', ids)
+    except (TypeError, OverflowError):
+        return ids
+
+
+# DFS colours for find_cycles
+WHITE = 0  # Not visited
+GRAY = 1   # On the current DFS path
+BLACK = 2  # Completely processed
+
+
+def find_cycles(graph: LearningGraph) -> List[List[int]]:
+    """Find one witness cycle per cyclic strongly connected component.
+
+    Iterative Tarjan SCC pass over the prerequisite CSR, so it runs in
+    O(V+E) and cannot hit Python's recursion limit on long chains. Edges are
+    walked in the file's direction (concept -> prerequisite); edges to
+    unknown nodes (IDs with no row) are ignored.
+
+    Returns:
+        One cycle per component with more than one concept (or a concept
+        that is its own prerequisite), as node indexes starting at the
+        component's first node in file order. Cycles are open: the last node
+        lists the first as a prerequisite. Sorted by that first node.
+    """
+    n = graph.num_concepts
+    offsets = graph.prereq_offsets
+    targets = graph.prereq_targets
+
+    color = bytearray(n)
+    on_stack = bytearray(n)
+    order = array('l', [0]) * n   # DFS discovery order
+    low = array('l', [0]) * n     # smallest order reachable from the subtree
+    stack = []
+    cycles = []
+    counter = 0
+
+    for root in range(n):
+        if color[root] != WHITE:
+            continue
+        color[root] = GRAY
+        order[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        work = [(root, offsets[root])]
+
+        while work:
+            node, k = work[-1]
+            end = offsets[node + 1]
+            while k < end:
+                next_node = targets[k]
+                k += 1
+                if next_node >= n:
+                    continue
+                if color[next_node] == WHITE:
+                    work[-1] = (node, k)
+                    color[next_node] = GRAY
+                    order[next_node] = low[next_node] = counter
+                    counter += 1
+                    stack.append(next_node)
+                    on_stack[next_node] = 1
+                    work.append((next_node, offsets[next_node]))
+                    break
+                if on_stack[next_node] and order[next_node] < low[node]:
+                    low[node] = order[next_node]
+            else:
+                # Every edge of node explored
+                work.pop()
+                color[node] = BLACK
+                if work:
+                    parent = work[-1][0]
+                    if low[node] < low[parent]:
+                        low[parent] = low[node]
+                if low[node] == order[node]:
+                    component = set()
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = 0
+                        component.add(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in graph.prereqs(node):
+                        cycles.append(_witness_cycle(graph, component))
+
+    cycles.sort(key=lambda cycle: cycle[0])
+    return cycles
+
+
+def _witness_cycle(graph: LearningGraph, component: set) -> List[int]:
+    """Return a shortest cycle through the first node of a component.
+
+    Breadth-first search from that node along prerequisite edges, staying
+    inside the component, until an edge leads back to it.
+    """
+    start = min(component)
+    parent = {start: None}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        for next_node in graph.prereqs(node):
+            if next_node == start:
+                path = [node]
+                while parent[path[-1]] is not None:
+                    path.append(parent[path[-1]])
+                path.reverse()
+                return path
+            if next_node in component and next_node not in parent:
+                parent[next_node] = node
+                queue.append(next_node)
+    return [start]
+
+
+def cache_path_for(path: Path) -> Path:
+    """Sidecar location for a graph source file."""
+    return path.parent / CACHE_DIR / (path.name + '.pickle')
+
+
+def load_learning_graph(path, use_cache: bool = True) -> LearningGraph:
+    """Load a learning-graph CSV or vis-network JSON file, compiled once.
+
+    The source file is always read and hashed; when the sidecar holds a
+    graph compiled from identical bytes it is returned without re-parsing.
+    An unreadable or unwritable sidecar just means parsing again.
+
+    Args:
+        path: learning-graph.csv or learning-graph.json
+        use_cache: False to skip the sidecar entirely
+
+    Returns:
+        The compiled LearningGraph
+    """
+    path = Path(path)
+    raw = path.read_bytes()
+    digest = hashlib.sha256(raw).hexdigest()
+    sidecar = cache_path_for(path)
+
+    if use_cache:
+        graph = _read_sidecar(sidecar, digest)
+        if graph is not None:
+            return graph
+
+    text = raw.decode('utf-8-sig')
+    if path.suffix.lower() == '.json':
+        graph = LearningGraph.from_vis_json(json.loads(text))
+    else:
+        graph = LearningGraph.from_csv_text(text)
+
+    if use_cache:
+        _write_sidecar(sidecar, digest, graph)
+    return graph
+
+
+def _read_sidecar(sidecar: Path, digest: str) -> Optional[LearningGraph]:
+    """Return the cached graph if the sidecar matches digest, else None."""
+    try:
+        with open(sidecar, 'rb') as f:
+            data = pickle.load(f)
+        if data.get('version') == FORMAT_VERSION and data.get('sha256') == digest:
+            return LearningGraph.from_state(data['graph'])
+    except Exception:
+        pass
+    return None
+
+
+def _write_sidecar(sidecar: Path, digest: str, graph: LearningGraph) -> None:
+    """Atomically write the compiled graph next to its source file."""
+    try:
+        sidecar.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = sidecar.with_suffix('.tmp')
+        with open(tmp_file, 'wb') as f:
+            pickle.dump({'version': FORMAT_VERSION, 'sha256': digest,
+                         'graph': graph.to_state()}, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, sidecar)
+    except OSError:
+        pass
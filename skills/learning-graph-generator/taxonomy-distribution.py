@@ -6,10 +6,14 @@ Analyzes the taxonomy distribution in the concept dependency CSV
 and generates a detailed distribution report with recommendations.
 """
 
-import csv
+import os
+import sys
 from collections import defaultdict
 from typing import Dict, List, Tuple
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from learning_graph import load_learning_graph
+
 
 def analyze_taxonomy_distribution(csv_path: str, output_path: str, taxonomy_names: dict = None):
     """
@@ -39,12 +43,11 @@ def analyze_taxonomy_distribution(csv_path: str, output_path: str, taxonomy_name
     taxonomy_counts = defaultdict(int)
     taxonomy_concepts = defaultdict(list)
 
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            tax = row['TaxonomyID']
-            taxonomy_counts[tax] += 1
-            taxonomy_concepts[tax].append((int(row['ConceptID']), row['ConceptLabel']))
+    graph = load_learning_graph(csv_path)
+    for i in range(len(graph)):
+        tax = graph.taxonomy_of(i)
+        taxonomy_counts[tax] += 1
+        taxonomy_concepts[tax].append((graph.ids[i], graph.labels[i]))
 
     total_concepts = sum(taxonomy_counts.values())
 
@@ -177,7 +180,6 @@ def analyze_taxonomy_distribution(csv_path: str, output_path: str, taxonomy_name
 
 
 if __name__ == "__main__":
-    import sys
     import json
 
     # Parse command line arguments
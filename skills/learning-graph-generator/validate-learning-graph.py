@@ -7,9 +7,13 @@ Usage: python3 validate-learning-graph.py <data-file> <schema-file>
 """
 
 import json
+import os
 import sys
 from pathlib import Path
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from learning_graph import LearningGraph
+
 # ANSI color codes
 GREEN = '\033[0;32m'
 RED = '\033[0;31m'
@@ -68,43 +72,43 @@ def validate_learning_graph(data_path, schema_path):
         print(f"  Nodes: {len(data.get('nodes', []))}")
         print(f"  Edges: {len(data.get('edges', []))}")
 
+        # Structural checks run on the compiled graph: one pass over the
+        # node and edge lists instead of one set/scan per check
+        graph = LearningGraph.from_vis_json(data)
+        ids = graph.ids
+        num_concepts = len(graph)
+
         # Check for orphan nodes
-        if 'nodes' in data and 'edges' in data:
-            node_ids = {node['id'] for node in data['nodes']}
-            connected_ids = set()
-            for edge in data['edges']:
-                connected_ids.add(edge['from'])
-                connected_ids.add(edge['to'])
-            orphans = node_ids - connected_ids
-            if orphans:
-                print(f"  {YELLOW}Orphaned nodes: {len(orphans)} (completely disconnected — no inbound or outbound edges){NC}")
-                if len(orphans) <= 10:
-                    orphan_labels = [node['label'] for node in data['nodes'] if node['id'] in orphans]
-                    print(f"    {', '.join(orphan_labels)}")
-            else:
-                print(f"  Orphaned nodes: 0")
+        connected_ids = {ids[i] for i in range(len(ids))
+                         if graph.outdegree(i) or graph.indegree(i)}
+        orphans = set(ids[:num_concepts]) - connected_ids
+        if orphans:
+            print(f"  {YELLOW}Orphaned nodes: {len(orphans)} (completely disconnected — no inbound or outbound edges){NC}")
+            if len(orphans) <= 10:
+                orphan_labels = [graph.labels[i] for i in range(num_concepts) if ids[i] in orphans]
+                print(f"    {', '.join(orphan_labels)}")
+        else:
+            print(f"  Orphaned nodes: 0")
 
         # Check for duplicate node IDs
-        node_ids_list = [node['id'] for node in data['nodes']]
-        if len(node_ids_list) != len(set(node_ids_list)):
-            duplicates = [id for id in node_ids_list if node_ids_list.count(id) > 1]
+        duplicates = graph.duplicate_ids()
+        if duplicates:
             print(f"  {RED}Warning: Duplicate node IDs found: {set(duplicates)}{NC}")
 
-        # Check for edges referencing non-existent nodes
-        if 'nodes' in data and 'edges' in data:
-            node_ids = {node['id'] for node in data['nodes']}
-            invalid_edges = []
-            for edge in data['edges']:
-                if edge['from'] not in node_ids:
-                    invalid_edges.append(f"Edge from {edge['from']} -> {edge['to']}: source node {edge['from']} doesn't exist")
-                if edge['to'] not in node_ids:
-                    invalid_edges.append(f"Edge from {edge['from']} -> {edge['to']}: target node {edge['to']} doesn't exist")
-            if invalid_edges:
-                print(f"  {RED}Warning: Invalid edges found:{NC}")
-                for invalid in invalid_edges[:5]:  # Show first 5
-                    print(f"    - {invalid}")
-                if len(invalid_edges) > 5:
-                    print(f"    ... and {len(invalid_edges) - 5} more")
+        # Check for edges referencing non-existent nodes (unknown IDs are
+        # compiled as extra nodes past num_concepts)
+        invalid_edges = []
+        for source, target in graph.edges():
+            if graph.index[source] >= num_concepts:
+                invalid_edges.append(f"Edge from {source} -> {target}: source node {source} doesn't exist")
+            if graph.index[target] >= num_concepts:
+                invalid_edges.append(f"Edge from {source} -> {target}: target node {target} doesn't exist")
+        if invalid_edges:
+            print(f"  {RED}Warning: Invalid edges found:{NC}")
+            for invalid in invalid_edges[:5]:  # Show first 5
+                print(f"    - {invalid}")
+            if len(invalid_edges) > 5:
+                print(f"    ... and {len(invalid_edges) - 5} more")
 
         return True
 
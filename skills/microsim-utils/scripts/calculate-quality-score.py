@@ -22,12 +22,14 @@ Scoring Rubric (100 points total):
 - Type-specific (p5.js editor link): 5 pts
 
 Usage:
-    python calculate_quality_scores.py [--dry-run] [--verbose]
+    python calculate_quality_scores.py [--dry-run] [--verbose] [--jobs N]
 """
 
 import json
+import os
 import re
 import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 import sys
 
@@ -347,6 +349,55 @@ def update_quality_score(index_md: Path, new_score: int, dry_run: bool = False)
         return False
 
 
+def score_microsim(sim_dir: Path, only_missing: bool = False, verbose: bool = False) -> dict:
+    """Score one MicroSim directory without modifying it.
+
+    Returns a dict with 'name' and 'status': 'no-index' when there is no
+    index.md, 'skipped' when only_missing is set and a score already exists,
+    else 'scored' plus 'old_score', 'new_score' and 'details'.
+    """
+    index_md = sim_dir / "index.md"
+    if not index_md.exists():
+        return {'name': sim_dir.name, 'status': 'no-index'}
+
+    # Read current content to check existing score
+    with open(index_md, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    existing_score = get_existing_quality_score(content)
+
+    # Skip if only processing missing scores
+    if only_missing and existing_score is not None:
+        return {'name': sim_dir.name, 'status': 'skipped'}
+
+    new_score, details = calculate_quality_score(sim_dir, verbose)
+    return {
+        'name': sim_dir.name,
+        'status': 'scored',
+        'old_score': existing_score,
+        'new_score': new_score,
+        'details': details,
+    }
+
+
+def iter_scores(microsim_dirs: list, only_missing: bool, verbose: bool, jobs: int = 1):
+    """Yield score_microsim() results for each directory.
+
+    With jobs > 1 the directories are scored on a process pool and results
+    are yielded as they complete, in no particular order.
+    """
+    if jobs <= 1 or len(microsim_dirs) <= 1:
+        for sim_dir in microsim_dirs:
+            yield score_microsim(sim_dir, only_missing, verbose)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(score_microsim, sim_dir, only_missing, verbose)
+                   for sim_dir in microsim_dirs]
+        for future in as_completed(futures):
+            yield future.result()
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Calculate and update quality scores for MicroSims."
@@ -385,8 +436,16 @@ def main():
         default=100,
         help="Only show MicroSims with score <= this value"
     )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Score MicroSims on N worker processes (0 = one per CPU)"
+    )
 
     args = parser.parse_args()
+    jobs = args.jobs or os.cpu_count() or 1
 
     if not args.sims_dir.exists():
         print(f"Error: Sims directory not found: {args.sims_dir}")
@@ -404,27 +463,24 @@ def main():
     updated_count = 0
     skipped_count = 0
 
-    for sim_dir in microsim_dirs:
-        index_md = sim_dir / "index.md"
+    outcomes = iter_scores(microsim_dirs, args.only_missing, args.verbose, jobs)
+    for done, outcome in enumerate(outcomes, 1):
+        if jobs > 1:
+            score = outcome.get('new_score', outcome['status'])
+            print(f"  [{done}/{len(microsim_dirs)}] {outcome['name']}: {score}", file=sys.stderr)
 
-        if not index_md.exists():
+        if outcome['status'] == 'no-index':
             if args.verbose:
-                print(f"⚠️  {sim_dir.name}: No index.md file")
+                print(f"⚠️  {outcome['name']}: No index.md file")
             continue
 
-        # Read current content to check existing score
-        with open(index_md, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        existing_score = get_existing_quality_score(content)
-
-        # Skip if only processing missing scores
-        if args.only_missing and existing_score is not None:
+        if outcome['status'] == 'skipped':
             skipped_count += 1
             continue
 
-        # Calculate new score
-        new_score, details = calculate_quality_score(sim_dir, args.verbose)
+        existing_score = outcome['old_score']
+        new_score = outcome['new_score']
+        details = outcome['details']
 
         # Filter by score range
         if new_score < args.min_score or new_score > args.max_score:
@@ -434,7 +490,7 @@ def main():
         score_changed = existing_score != new_score
 
         results.append({
-            'name': sim_dir.name,
+            'name': outcome['name'],
             'old_score': existing_score,
             'new_score': new_score,
             'changed': score_changed,
@@ -443,9 +499,12 @@ def main():
 
         # Update file if needed
         if score_changed and not args.dry_run:
-            if update_quality_score(index_md, new_score):
+            if update_quality_score(args.sims_dir / outcome['name'] / "index.md", new_score):
                 updated_count += 1
 
+    # Pool results arrive in completion order; print them by name
+    results.sort(key=lambda r: r['name'])
+
     # Print results
     print(f"{'MicroSim':<40} {'Old':>5} {'New':>5} {'Status':<10}")
     print("-" * 65)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Readiness check shared by the Playwright MicroSim tools.
+
+WAIT_READY_JS is evaluated in the page right after it loads and resolves
+once the sim can be measured or captured:
+
+- 'hook'    — the sim set window.microsimReady to true, or the Promise it
+              set there resolved
+- 'stable'  — the sim never set window.microsimReady, at least one element
+              matching `sel` has a non-zero size, the layout of those
+              elements was identical across two animation frames, and every
+              web font the page requested has loaded. A page with nothing
+              measurable yet (p5.js has not created its canvas) is never
+              'stable'.
+- 'timeout' — neither happened within `timeoutMs`, including a sim that
+              set window.microsimReady to false and never changed it
+
+Used by test-iframe-heights.py (next to this file) and by
+src/screen-capture/capture-screenshots.py, so both tools agree on when a
+sim is ready.
+
+Usage:
+    from microsim_ready import WAIT_READY_JS
+
+    signal = await page.evaluate(WAIT_READY_JS, {"sel": "canvas, button",
+                                                 "timeoutMs": 5000})
+"""
+
+WAIT_READY_JS = """
+async ({ sel, timeoutMs }) => {
+    const started = performance.now();
+    const nextFrame = () => new Promise(resolve => requestAnimationFrame(() => resolve()));
+    const layout = () => {
+        const parts = [];
+        for (const el of document.querySelectorAll(sel)) {
+            const r = el.getBoundingClientRect();
+            if (r.width === 0 || r.height === 0) continue;
+            parts.push(`${el.tagName}:${r.left},${r.top},${r.width},${r.height}`);
+        }
+        return parts.join('|');
+    };
+    let previous = null;
+    while (performance.now() - started < timeoutMs) {
+        const hook = window.microsimReady;
+        if (hook === true) return 'hook';
+        if (hook && typeof hook.then === 'function') {
+            const remaining = timeoutMs - (performance.now() - started);
+            const done = await Promise.race([
+                Promise.resolve(hook).then(() => true, () => true),
+                new Promise(resolve => setTimeout(() => resolve(false), remaining)),
+            ]);
+            return done ? 'hook' : 'timeout';
+        }
+        await nextFrame();
+        // A sim that declared the hook (e.g. microsimReady = false while it
+        // loads) is waited for; the layout heuristic is only for sims without it
+        if (hook !== undefined) {
+            previous = null;
+            continue;
+        }
+        const current = layout();
+        if (current !== '' && current === previous
+                && document.fonts.status === 'loaded') return 'stable';
+        previous = current;
+    }
+    return 'timeout';
+}
+"""
@@ -7,8 +7,18 @@ constrained to the iframe height declared in index.md, then checks
 whether all interactive controls (buttons, sliders, selects, etc.)
 are fully visible without clipping.
 
+Sims are tested concurrently on a pool of browser contexts (--jobs) that
+share one headless Chromium. Each page is loaded until the network is idle;
+then, instead of a fixed sleep, the sim is measured as soon as it signals
+readiness: either the page sets window.microsimReady (true, or a Promise
+that resolves), or, for sims that never set it, at least one canvas or
+control has been laid out and the layout is unchanged across two animation
+frames. A sim that sets microsimReady = false is waited for until it
+becomes true.
+
 Usage:
-    python test-iframe-heights.py --sims-dir docs/sims [--sim name] [--height N] [--report file.md]
+    python test-iframe-heights.py --sims-dir docs/sims [--sim name] [--height N]
+        [--report file.md] [--jobs N] [--ready-timeout MS]
 
 Prerequisites:
     pip install playwright
@@ -16,18 +26,25 @@ Prerequisites:
 """
 
 import argparse
+import asyncio
 import math
 import re
 import sys
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 
-from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from microsim_ready import WAIT_READY_JS
 
 TOLERANCE = 5        # px — controls within this margin still count as visible
 SAFETY_MARGIN = 10   # px — added to suggested height
 VIEWPORT_WIDTH = 700 # matches typical MkDocs Material content column width
+DEFAULT_JOBS = 4             # concurrent browser contexts
+DEFAULT_READY_TIMEOUT = 5000 # ms — measure anyway if a sim never settles
 
 CONTROL_SELECTORS = ", ".join([
     "button",
@@ -88,6 +105,8 @@ class SimResult:
     suggested_height: int | None
     clipped_elements: list[str] = field(default_factory=list)
     error: str | None = None
+    seconds: float | None = None    # load + ready wait + measurement
+    ready_signal: str | None = None # hook, stable, or timeout
 
 
 def extract_iframe_height(index_md: Path) -> int | None:
@@ -133,36 +152,48 @@ def round_up(value: int, step: int) -> int:
     return math.ceil(value / step) * step
 
 
-def test_sim(page, sim: dict, iframe_height: int) -> SimResult:
+async def test_sim(page, sim: dict, iframe_height: int,
+                   ready_timeout: int = DEFAULT_READY_TIMEOUT) -> SimResult:
     """Test a single MicroSim at the given iframe height."""
     html_path = sim["dir"] / "main.html"
     file_url = f"file://{html_path.resolve()}"
 
-    page.set_viewport_size({"width": VIEWPORT_WIDTH, "height": iframe_height})
+    await page.set_viewport_size({"width": VIEWPORT_WIDTH, "height": iframe_height})
 
-    try:
-        page.goto(file_url, wait_until="networkidle", timeout=15000)
-    except Exception as e:
+    def error_result(message: str) -> SimResult:
         return SimResult(
             sim=sim["name"],
             iframe_height=iframe_height,
             content_height=None,
             status="ERROR",
             suggested_height=None,
-            error=f"Failed to load: {e}",
+            error=message,
         )
 
-    # Wait for p5.js / vis-network / Chart.js to render controls
-    page.wait_for_timeout(2000)
+    try:
+        await page.goto(file_url, wait_until="networkidle", timeout=15000)
+    except Exception as e:
+        return error_result(f"Failed to load: {e}")
 
-    # Measure control positions
-    measurements = page.evaluate(
-        MEASURE_CONTROLS_JS,
-        {"sel": CONTROL_SELECTORS, "viewportHeight": iframe_height, "tolerance": TOLERANCE},
-    )
+    try:
+        # Wait for p5.js / vis-network / Chart.js to render controls
+        ready_signal = await page.evaluate(
+            WAIT_READY_JS, {"sel": CONTROL_SELECTORS, "timeoutMs": ready_timeout},
+        )
+    except Exception as e:
+        return error_result(f"Readiness check failed: {e}")
+
+    try:
+        # Measure control positions
+        measurements = await page.evaluate(
+            MEASURE_CONTROLS_JS,
+            {"sel": CONTROL_SELECTORS, "viewportHeight": iframe_height, "tolerance": TOLERANCE},
+        )
 
-    # Measure actual content height
-    content_height = page.evaluate(MEASURE_CONTENT_JS)
+        # Measure actual content height
+        content_height = await page.evaluate(MEASURE_CONTENT_JS)
+    except Exception as e:
+        return error_result(f"Measurement failed: {e}")
 
     # If the sim declares a CANVAS_HEIGHT, trust it over measured content
     declared_height = extract_canvas_height(sim["dir"])
@@ -182,11 +213,70 @@ def test_sim(page, sim: dict, iframe_height: int) -> SimResult:
             f"{c['tag']}{'[' + c['type'] + ']' if c['type'] else ''} \"{c['label']}\" bottom={c['bottom']}px"
             for c in clipped
         ],
+        ready_signal=ready_signal,
     )
 
 
-def write_report(path: Path, results: list[SimResult], sims_dir: str):
-    """Write a markdown report of the test results."""
+async def test_worker(browser, queue: asyncio.Queue, results: list, ready_timeout: int,
+                      counter: dict):
+    """Test sims from the queue in one isolated browser context."""
+    context = await browser.new_context()
+    page = await context.new_page()
+    try:
+        while True:
+            try:
+                sim, iframe_height = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            started = time.perf_counter()
+            result = await test_sim(page, sim, iframe_height, ready_timeout)
+            result.seconds = time.perf_counter() - started
+            results.append(result)
+            counter["done"] += 1
+            print_result(result, counter)
+    finally:
+        await context.close()
+
+
+def print_result(result: SimResult, counter: dict):
+    """Print one line (plus clipped elements) as soon as a sim finishes."""
+    prefix = f"  [{counter['done']}/{counter['total']}] {result.sim} ({result.iframe_height}px)"
+    timing = f" in {result.seconds:.2f}s ({result.ready_signal})" if result.ready_signal else ""
+    if result.status == "PASS":
+        print(f"{prefix} PASS{timing}")
+    elif result.status == "FAIL":
+        print(f"{prefix} FAIL \u2014 content {result.content_height}px, "
+              f"suggest {result.suggested_height}px{timing}")
+        for el in result.clipped_elements:
+            print(f"         Clipped: {el}")
+    else:
+        print(f"{prefix} ERROR \u2014 {result.error}")
+
+
+async def run_tests(pending: list, jobs: int, ready_timeout: int) -> list[SimResult]:
+    """Test (sim, iframe_height) pairs on a pool of browser contexts."""
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in pending:
+        queue.put_nowait(item)
+    results: list[SimResult] = []
+    counter = {"done": 0, "total": len(pending)}
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            workers = [
+                test_worker(browser, queue, results, ready_timeout, counter)
+                for _ in range(max(1, min(jobs, len(pending))))
+            ]
+            await asyncio.gather(*workers)
+        finally:
+            await browser.close()
+    return results
+
+
+def write_report(path: Path, results: list[SimResult], sims_dir: str,
+                 wall_seconds: float | None = None, jobs: int = 1):
+    """Write a markdown report of the test results, with per-sim timing."""
     passed = sum(1 for r in results if r.status == "PASS")
     failed = sum(1 for r in results if r.status == "FAIL")
     errors = sum(1 for r in results if r.status == "ERROR")
@@ -198,8 +288,8 @@ def write_report(path: Path, results: list[SimResult], sims_dir: str):
         f"Tested: {datetime.now(timezone.utc).isoformat()}",
         f"Sims directory: `{sims_dir}`",
         "",
-        "| MicroSim | Iframe Height | Content Height | Status | Suggested Height |",
-        "|----------|---------------|----------------|--------|------------------|",
+        "| MicroSim | Iframe Height | Content Height | Status | Suggested Height | Time (s) | Ready |",
+        "|----------|---------------|----------------|--------|------------------|----------|-------|",
     ]
 
     for r in results:
@@ -207,7 +297,9 @@ def write_report(path: Path, results: list[SimResult], sims_dir: str):
         ch = r.content_height or "\u2014"
         sh = r.suggested_height or "\u2014"
         st = "**FAIL**" if r.status == "FAIL" else r.status
-        lines.append(f"| {r.sim} | {ih} | {ch} | {st} | {sh} |")
+        secs = f"{r.seconds:.2f}" if r.seconds is not None else "\u2014"
+        ready = r.ready_signal or "\u2014"
+        lines.append(f"| {r.sim} | {ih} | {ch} | {st} | {sh} | {secs} | {ready} |")
 
     failures = [r for r in results if r.status == "FAIL"]
     if failures:
@@ -222,6 +314,18 @@ def write_report(path: Path, results: list[SimResult], sims_dir: str):
                 lines.append(f"  - {el}")
             lines.append("")
 
+    timed = [r for r in results if r.seconds is not None]
+    if timed:
+        slowest = sorted(timed, key=lambda r: r.seconds, reverse=True)[:5]
+        timeouts = sum(1 for r in timed if r.ready_signal == "timeout")
+        lines += ["", "## Timing", ""]
+        if wall_seconds is not None:
+            lines.append(f"- Wall time: {wall_seconds:.1f}s with {jobs} browser context(s)")
+        lines.append(f"- Sum of per-sim times: {sum(r.seconds for r in timed):.1f}s")
+        lines.append(f"- Average per sim: {sum(r.seconds for r in timed) / len(timed):.2f}s")
+        lines.append(f"- Ready-wait timeouts: {timeouts}")
+        lines.append("- Slowest: " + ", ".join(f"{r.sim} ({r.seconds:.2f}s)" for r in slowest))
+
     lines += ["", f"Summary: {passed} pass, {failed} fail, {errors} error, {skipped} skip out of {len(results)} total"]
     path.write_text("\n".join(lines))
     print(f"\nReport written to {path}")
@@ -233,6 +337,11 @@ def main():
     parser.add_argument("--sim", default=None, help="Test a single sim by name")
     parser.add_argument("--height", type=int, default=None, help="Override iframe height for all sims")
     parser.add_argument("--report", default=None, help="Write markdown report to this path")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS,
+                        help=f"Number of concurrent browser contexts (default {DEFAULT_JOBS})")
+    parser.add_argument("--ready-timeout", type=int, default=DEFAULT_READY_TIMEOUT,
+                        help="Max ms to wait for a sim to signal readiness before measuring "
+                             f"(default {DEFAULT_READY_TIMEOUT})")
     args = parser.parse_args()
 
     sims_dir = Path(args.sims_dir)
@@ -244,39 +353,29 @@ def main():
             print(f'MicroSim "{args.sim}" not found in {sims_dir}', file=sys.stderr)
             sys.exit(1)
 
-    print(f"Testing {len(sims)} MicroSim(s) in {sims_dir}\n")
+    print(f"Testing {len(sims)} MicroSim(s) in {sims_dir} with {args.jobs} browser context(s)\n")
 
     results: list[SimResult] = []
+    pending = []
+    for sim in sims:
+        iframe_height = args.height or extract_iframe_height(sim["dir"] / "index.md")
+
+        if not iframe_height:
+            print(f"  SKIP  {sim['name']} \u2014 no iframe height found in index.md")
+            results.append(SimResult(
+                sim=sim["name"], iframe_height=None, content_height=None,
+                status="SKIP", suggested_height=None, error="No iframe height in index.md",
+            ))
+            continue
+        pending.append((sim, iframe_height))
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-
-        for sim in sims:
-            iframe_height = args.height or extract_iframe_height(sim["dir"] / "index.md")
-
-            if not iframe_height:
-                print(f"  SKIP  {sim['name']} \u2014 no iframe height found in index.md")
-                results.append(SimResult(
-                    sim=sim["name"], iframe_height=None, content_height=None,
-                    status="SKIP", suggested_height=None, error="No iframe height in index.md",
-                ))
-                continue
-
-            print(f"  Testing {sim['name']} ({iframe_height}px)...", end="", flush=True)
-            result = test_sim(page, sim, iframe_height)
-            results.append(result)
-
-            if result.status == "PASS":
-                print(" PASS")
-            elif result.status == "FAIL":
-                print(f" FAIL \u2014 content {result.content_height}px, suggest {result.suggested_height}px")
-                for el in result.clipped_elements:
-                    print(f"         Clipped: {el}")
-            else:
-                print(f" ERROR \u2014 {result.error}")
+    started = time.perf_counter()
+    if pending:
+        results += asyncio.run(run_tests(pending, args.jobs, args.ready_timeout))
+    wall_seconds = time.perf_counter() - started
 
-        browser.close()
+    # Results arrive in completion order; report them by sim name
+    results.sort(key=lambda r: r.sim)
 
     passed = sum(1 for r in results if r.status == "PASS")
     failed = sum(1 for r in results if r.status == "FAIL")
@@ -285,9 +384,10 @@ def main():
 
     print(f"\n--- Summary ---")
     print(f"  PASS: {passed}  FAIL: {failed}  ERROR: {errors}  SKIP: {skipped}  Total: {len(results)}")
+    print(f"  Wall time: {wall_seconds:.1f}s")
 
     if args.report:
-        write_report(Path(args.report), results, str(sims_dir))
+        write_report(Path(args.report), results, str(sims_dir), wall_seconds, args.jobs)
 
     if failed > 0 or errors > 0:
         sys.exit(1)
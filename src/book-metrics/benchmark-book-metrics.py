@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Benchmark the single-pass document scanner in book-metrics.py.
+
+Builds a synthetic textbook in a temporary directory and compares two ways of
+producing the book-metrics.md / chapter-metrics.md / book-metrics.json numbers:
+
+  legacy   - the pre-v0.09 call pattern: one rglob('*.md') walk and one read of
+             every file PER METRIC, repeated for each report that needs it
+  scanned  - BookMetricsGenerator's single-pass scan: one tree walk, one read
+             per file, every counter run on that one buffer
+
+File opens and directory walks are counted by wrapping builtins.open and
+Path.rglob while each strategy runs.
+
+Usage:
+    python benchmark-book-metrics.py [--chapters 30] [--files-per-chapter 5]
+"""
+
+import argparse
+import builtins
+import random
+import tempfile
+import time
+from importlib.util import spec_from_file_location, module_from_spec
+from pathlib import Path
+
+_this_dir = Path(__file__).resolve().parent
+_spec = spec_from_file_location("book_metrics", _this_dir / "book-metrics.py")
+book_metrics = module_from_spec(_spec)
+_spec.loader.exec_module(book_metrics)
+BookMetricsGenerator = book_metrics.BookMetricsGenerator
+count_markdown = book_metrics.count_markdown
+
+WORDS = ("learning graph concept chapter textbook student simulation "
+         "equation diagram reference quiz glossary").split()
+
+
+def build_synthetic_book(root: Path, chapters: int, files_per_chapter: int) -> Path:
+    """Write a synthetic docs/ tree and return its path."""
+    rng = random.Random(42)
+    docs = root / "docs"
+    for c in range(1, chapters + 1):
+        chapter_dir = docs / "chapters" / f"{c:02d}-chapter-{c}"
+        chapter_dir.mkdir(parents=True)
+        for n in range(files_per_chapter):
+            name = "index.md" if n == 0 else f"section-{n}.md"
+            body = [f"# Chapter {c} Part {n}\n"]
+            for s in range(20):
+                body.append(f"## Section {s}\n")
+                body.append(" ".join(rng.choice(WORDS) for _ in range(120)))
+                body.append(f"\nSee [the glossary](../../glossary.md) and $x_{s} + y$.\n")
+                body.append("```python\nprint('code is not counted')\n```\n")
+                if s % 5 == 0:
+                    body.append(f"#### Diagram: Example {s}\n")
+                    body.append("$$\\int_0^1 f(x)\\,dx$$\n")
+            (chapter_dir / name).write_text("\n".join(body), encoding="utf-8")
+    (docs / "glossary.md").write_text("#### Term\n\nA definition.\n", encoding="utf-8")
+    (docs / "faq.md").write_text("### Question?\n\nAn answer.\n", encoding="utf-8")
+    return docs
+
+
+class IOCounter:
+    """Context manager counting markdown opens and rglob walks."""
+
+    def __enter__(self):
+        self.opens = 0
+        self.walks = 0
+        self._open = builtins.open
+        self._rglob = Path.rglob
+        counter = self
+
+        def counting_open(file, *args, **kwargs):
+            if str(file).endswith(".md"):
+                counter.opens += 1
+            return counter._open(file, *args, **kwargs)
+
+        def counting_rglob(path, pattern):
+            counter.walks += 1
+            return counter._rglob(path, pattern)
+
+        builtins.open = counting_open
+        Path.rglob = counting_rglob
+        return self
+
+    def __exit__(self, *exc):
+        builtins.open = self._open
+        Path.rglob = self._rglob
+        return False
+
+
+def legacy_run(docs: Path) -> None:
+    """Replay the pre-v0.09 pattern: one walk and one read per metric per report."""
+    gen = BookMetricsGenerator(str(docs))
+    counters = {
+        key: (lambda text, key=key: count_markdown(text)[key])
+        for key in ('words', 'links', 'diagrams', 'equations')
+    }
+
+    def read(md_file):
+        with open(md_file, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def book_totals():
+        for count in counters.values():
+            for md_file in docs.rglob('*.md'):
+                if not gen._is_excluded_path(md_file):
+                    count(read(md_file))
+
+    def chapter_tables():
+        for chapter_dir in sorted(gen.chapters_dir.iterdir()):
+            read(chapter_dir / "index.md")                      # title
+            count_markdown(read(chapter_dir / "index.md"))['sections']
+            for md_file in chapter_dir.rglob('*.md'):
+                for count in counters.values():
+                    count(read(md_file))
+
+    # generate_book_metrics_md: totals + aggregated chapter metrics
+    book_totals()
+    chapter_tables()
+    # generate_chapter_metrics_md: per-chapter rows
+    chapter_tables()
+    # build_metrics_payload -> collect_book_totals
+    book_totals()
+
+
+def scanned_run(docs: Path) -> BookMetricsGenerator:
+    """Produce the same reports with the single-pass scanner."""
+    gen = BookMetricsGenerator(str(docs))
+    gen.generate_book_metrics_md()
+    gen.generate_chapter_metrics_md()
+    gen.collect_book_totals()
+    return gen
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chapters", type=int, default=30)
+    parser.add_argument("--files-per-chapter", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        docs = build_synthetic_book(Path(tmp), args.chapters, args.files_per_chapter)
+        md_files = sum(1 for _ in docs.rglob('*.md'))
+
+        with IOCounter() as legacy_io:
+            start = time.perf_counter()
+            legacy_run(docs)
+            legacy_time = time.perf_counter() - start
+
+        with IOCounter() as scanned_io:
+            start = time.perf_counter()
+            gen = scanned_run(docs)
+            scanned_time = time.perf_counter() - start
+
+    print(f"Synthetic book: {args.chapters} chapters, {md_files} markdown files\n")
+    print("| Strategy | Tree walks | File reads | Reads/file | Time (s) |")
+    print("|----------|-----------:|-----------:|-----------:|---------:|")
+    for name, io, elapsed in (("legacy", legacy_io, legacy_time),
+                              ("scanned", scanned_io, scanned_time)):
+        print(f"| {name} | {io.walks} | {io.opens} | "
+              f"{io.opens / md_files:.1f} | {elapsed:.3f} |")
+    print(f"\nScanner read {gen.files_read} files; saved "
+          f"{legacy_io.opens - scanned_io.opens} reads "
+          f"({legacy_time / scanned_time:.1f}x faster).")
+
+
+if __name__ == "__main__":
+    main()
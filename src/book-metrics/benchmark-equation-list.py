@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: equation extraction in generate-equation-list.py.
+
+Writes a synthetic chapter with 20,000 equations by default (a mix of
+display $$...$$ blocks, inline $...$ spans, dollar amounts and prose) to a
+temporary docs tree, then times extract_equations_from_file against the
+previous implementation:
+
+  prefix scan - the previous loop: content[:start].count('\\n') for every
+                line number and a scan of every display interval for every
+                inline match (quadratic in equations per file)
+  bisect      - extract_equations_from_file: newline-offset array and
+                sorted display intervals, one bisect per lookup
+
+Both must return the same equations. (Fewer are found than written: as in
+real chapters, an inline match can start at the closing $ of a display block
+or a dollar amount and swallow the next span.) The generate-equation-list.py command
+is then timed over --files copies of the chapter, with --jobs 1 and with
+--jobs N, and the two reports compared.
+
+Usage:
+    python benchmark-equation-list.py [--equations 20000] [--files 8] [--jobs 4]
+"""
+
+import argparse
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from importlib.util import spec_from_file_location, module_from_spec
+from pathlib import Path
+
+_this_dir = Path(__file__).resolve().parent
+_script = _this_dir / "generate-equation-list.py"
+_spec = spec_from_file_location("generate_equation_list", _script)
+generate_equation_list = module_from_spec(_spec)
+_spec.loader.exec_module(generate_equation_list)
+
+Equation = generate_equation_list.Equation
+
+INLINE = [r"x^2 + y^2 = r^2", r"\alpha + \beta", r"E = mc^2", r"\frac{a}{b}",
+          r"v_{t}", r"\sqrt{2}", r"f(x)", r"\sum_{i=1}^{n} i"]
+DISPLAY = [r"\int_0^1 x\,dx = \frac{1}{2}", r"F = ma",
+           "\\begin{aligned}\na &= b + c \\\\\nd &= e\n\\end{aligned}"]
+WORDS = "the learning graph concept chapter student simulation cost of tokens".split()
+
+
+def build_synthetic_chapter(equations: int) -> str:
+    """Return a markdown chapter containing roughly `equations` equations."""
+    rng = random.Random(11)
+    parts = ["# Synthetic Chapter\n\n"]
+    for n in range(equations):
+        prose = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 15)))
+        kind = rng.random()
+        if kind < 0.15:
+            parts.append(f"{prose}\n\n$${rng.choice(DISPLAY)}$$\n\n")
+        elif kind < 0.2:
+            parts.append(f"{prose} costs ${rng.randint(1, 99)} per month. ")
+        else:
+            parts.append(f"{prose} ${rng.choice(INLINE)}$ ")
+        if n % 7 == 0:
+            parts.append("\n")
+    return "".join(parts)
+
+
+def prefix_scan_extract(generator, markdown_file):
+    """The extraction loop extract_equations_from_file replaced."""
+    content = markdown_file.read_text(encoding='utf-8')
+    chapter_num, chapter_name = generator._get_chapter_info(markdown_file)
+    equations = []
+    display_positions = set()
+    for match in re.finditer(r'\$\$([^$]+?)\$\$', content, re.DOTALL):
+        start_pos = match.start()
+        inner_content = match.group(1).strip()
+        line_number = content[:start_pos].count('\n') + 1
+        display_positions.add((start_pos, match.end()))
+        if generator._is_valid_equation(inner_content):
+            equations.append(Equation(inner_content, 'display', markdown_file,
+                                      line_number, chapter_name, chapter_num))
+    for match in re.finditer(r'\$(?!\d)([^\$]+?)\$', content):
+        start_pos = match.start()
+        if any(disp_start <= start_pos < disp_end for disp_start, disp_end in display_positions):
+            continue
+        inner_content = match.group(1).strip()
+        if not generator._is_valid_equation(inner_content):
+            continue
+        line_number = content[:start_pos].count('\n') + 1
+        equations.append(Equation(inner_content, 'inline', markdown_file,
+                                  line_number, chapter_name, chapter_num))
+    return equations
+
+
+def timed(func, *args):
+    """Return (seconds, result)."""
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def run_command(docs_dir, output_file, jobs):
+    """Run generate-equation-list.py and return its report without the timestamp line."""
+    subprocess.run([sys.executable, str(_script), str(docs_dir), str(output_file), "--jobs", str(jobs)],
+                   check=True, stdout=subprocess.DEVNULL)
+    lines = output_file.read_text(encoding='utf-8').splitlines()
+    return [line for line in lines if not line.startswith("**Generated on**")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--equations", type=int, default=20_000)
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--jobs", type=int, default=4)
+    args = parser.parse_args()
+
+    content = build_synthetic_chapter(args.equations)
+    with tempfile.TemporaryDirectory() as tmp:
+        docs_dir = Path(tmp) / "docs"
+        for n in range(1, args.files + 1):
+            chapter_dir = docs_dir / "chapters" / f"{n:02d}-synthetic"
+            chapter_dir.mkdir(parents=True)
+            (chapter_dir / "index.md").write_text(content, encoding='utf-8')
+        chapter_file = docs_dir / "chapters" / "01-synthetic" / "index.md"
+        generator = generate_equation_list.EquationListGenerator(str(docs_dir))
+
+        print(f"Synthetic chapter: {len(content) / 1024:.0f}KB, "
+              f"{content.count(chr(10)):,} lines\n")
+        print("| Step | Strategy | Equations | Time (s) |")
+        print("|------|----------|----------:|---------:|")
+        old_time, old = timed(prefix_scan_extract, generator, chapter_file)
+        new_time, new = timed(generator.extract_equations_from_file, chapter_file)
+        print(f"| 1 chapter | prefix scan | {len(old):,} | {old_time:.3f} |")
+        print(f"| 1 chapter | bisect | {len(new):,} | {new_time:.3f} |")
+        if old != new:
+            print("| 1 chapter | ❌ equations differ | | |")
+
+        total = len(new) * args.files
+        output_file = Path(tmp) / "list-equations.md"
+        serial_time, serial = timed(run_command, docs_dir, output_file, 1)
+        parallel_time, parallel = timed(run_command, docs_dir, output_file, args.jobs)
+        print(f"| {args.files} chapters, command | --jobs 1 | {total:,} | {serial_time:.3f} |")
+        print(f"| {args.files} chapters, command | --jobs {args.jobs} | {total:,} | {parallel_time:.3f} |")
+        if serial != parallel:
+            print(f"| {args.files} chapters | ❌ parallel report differs | | |")
+
+
+if __name__ == "__main__":
+    main()
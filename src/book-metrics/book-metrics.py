@@ -7,18 +7,41 @@ Generates comprehensive metrics for intelligent textbooks, including:
 - Chapter-level metrics (per-chapter statistics)
 
 Usage:
-    python book-metrics.py [docs_directory]
+    python book-metrics.py [docs_directory] [--no-cache | --rebuild] [--jobs N]
+                           [--since GIT_REF]
+
+Per-file counts are cached in .cache/book-metrics/file-metrics.json under the
+project root (keyed by path, mtime and size) so unchanged files are never
+re-parsed. Use --rebuild to discard the cache or --no-cache to bypass it.
+
+--jobs N fans per-file and per-chapter analysis out over N worker processes.
+Partial counts are merged in sorted path order, so the reports are identical
+to a serial run.
+
+--since GIT_REF recomputes counts only for markdown files changed since the
+commit the previous book-metrics.json was counted at (its metricsGitCommit)
+and merges them into that payload; chapter rows for untouched chapters are
+reused verbatim from the previous chapter-metrics.md.
 """
 
+import os
 import re
+import sys
 import csv
 import json
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from typing import Dict, List, Tuple, Any
 from datetime import datetime
 
+# Allow running from any directory
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from markdown_lexer import count_markdown
+
 # Version of the Book Metrics Generator
-VERSION = "0.08"
+VERSION = "0.10"
 
 # Version of the book-metrics.json file format (see book-metrics.schema.json).
 # Bump only on a breaking change to the JSON structure, not on every code change.
@@ -31,11 +54,21 @@ class BookMetricsGenerator:
     # Directories to exclude from student-facing content metrics
     EXCLUDED_DIRS = {'prompts', 'learning-graph'}
 
-    def __init__(self, docs_dir: str = "docs"):
+    # Per-file metrics cache, relative to the project root (parent of docs/)
+    CACHE_FILE = Path(".cache") / "book-metrics" / "file-metrics.json"
+
+    def __init__(self, docs_dir: str = "docs", use_cache: bool = False,
+                 rebuild_cache: bool = False, jobs: int = 1):
         """Initialize the metrics generator.
 
         Args:
             docs_dir: Path to the docs directory (default: "docs")
+            use_cache: If True, reuse per-file counts from the on-disk cache
+                       for files whose mtime and size are unchanged
+            rebuild_cache: If True, ignore any existing cache entries and
+                           rebuild the cache from scratch (implies use_cache)
+            jobs: Number of worker processes for per-file analysis
+                  (1 = serial, 0 = one per CPU)
         """
         self.docs_dir = Path(docs_dir)
         self.chapters_dir = self.docs_dir / "chapters"
@@ -48,6 +81,7 @@ class BookMetricsGenerator:
         self.course_description_file = self.docs_dir / "course-description.md"
         # mkdocs.yml lives in the project root, one level above docs/
         self.mkdocs_file = self.docs_dir.parent / "mkdocs.yml"
+        self.jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
 
         # Appendices directory - accept the correct spelling and the common
         # "appendicies" misspelling found in some textbook repos.
@@ -58,6 +92,30 @@ class BookMetricsGenerator:
                 self.appendices_dir = candidate_dir
                 break
 
+        # Single-pass document scan state. The docs tree is walked once and
+        # each markdown file is read once; every per-file counter runs on
+        # that one buffer and the results are shared by the book totals and
+        # the per-chapter tables (see _file_record).
+        self._markdown_files: List[Path] = None
+        self._file_records: Dict[Path, Dict[str, Any]] = {}
+        self.files_read = 0
+
+        # Persistent per-file cache (see load_cache / save_cache)
+        self.use_cache = use_cache or rebuild_cache
+        self.cache_file = self.docs_dir.parent / self.CACHE_FILE
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._cache_stats: Dict[str, Dict[str, int]] = {}
+        self.cache_hits = 0
+        if self.use_cache and not rebuild_cache:
+            self.load_cache()
+
+        # Incremental (--since) state, set by load_previous_run
+        self.since_ref: str = None
+        self._changed_files: set = set()
+        self._previous_payload: Dict[str, Any] = None
+        self._previous_rows: Dict[str, Dict[str, Any]] = {}
+        self._ref_records: Dict[Path, Dict[str, Any]] = {}
+
     def _is_excluded_path(self, path: Path) -> bool:
         """Check if a path is in an excluded directory.
 
@@ -75,6 +133,427 @@ class BookMetricsGenerator:
             # Path is not relative to docs_dir
             return False
 
+    def _iter_markdown_files(self, exclude_non_content: bool = True) -> List[Path]:
+        """List markdown files under docs/, walking the tree only once.
+
+        Args:
+            exclude_non_content: If True, exclude prompts/ and learning-graph/ directories
+
+        Returns:
+            Sorted list of markdown file paths
+        """
+        if self._markdown_files is None:
+            self._markdown_files = sorted(self.docs_dir.rglob('*.md'))
+        if not exclude_non_content:
+            return self._markdown_files
+        return [f for f in self._markdown_files if not self._is_excluded_path(f)]
+
+    def _iter_chapter_files(self, chapter_dir: Path) -> List[Path]:
+        """List the markdown files inside one chapter directory.
+
+        Served from the cached docs/ walk, so no extra directory traversal.
+
+        Args:
+            chapter_dir: Path to the chapter directory
+
+        Returns:
+            Sorted list of markdown file paths in the chapter
+        """
+        return [f for f in self._iter_markdown_files(exclude_non_content=False)
+                if chapter_dir in f.parents]
+
+    @staticmethod
+    def _scan_text(content: str) -> Dict[str, Any]:
+        """Run every per-file counter over one markdown buffer.
+
+        Args:
+            content: Full text of a markdown file
+
+        Returns:
+            Dict with title, sections, diagrams, equations, words and links
+        """
+        # One lexer pass classifies code, math, links, URLs and headings
+        counts = count_markdown(content)
+
+        title = None
+        for line in content.splitlines():
+            match = re.match(r'^#\s+(.+)$', line.strip())
+            if match:
+                title = match.group(1)
+                break
+
+        return {
+            'title': title,
+            'sections': counts['sections'],
+            'diagrams': counts['diagrams'],
+            'equations': counts['equations'],
+            'words': counts['words'],
+            'links': counts['links'],
+        }
+
+    def _file_record(self, markdown_file: Path) -> Dict[str, Any]:
+        """Return the scanned counts for a markdown file, reading it at most once.
+
+        Args:
+            markdown_file: Path to markdown file
+
+        Returns:
+            Dict of per-file counts (see _scan_text). All counts are zero if
+            the file cannot be read.
+        """
+        record = self._file_records.get(markdown_file)
+        if record is not None:
+            return record
+
+        if self.use_cache:
+            record = self._cached_record(markdown_file)
+            if record is not None:
+                self._file_records[markdown_file] = record
+                return record
+
+        record, error = _scan_markdown_file(markdown_file)
+        return self._store_record(markdown_file, record, error)
+
+    def _store_record(self, markdown_file: Path, record: Dict[str, Any],
+                      error: str = None) -> Dict[str, Any]:
+        """Remember a freshly scanned record (and cache it if enabled).
+
+        Args:
+            markdown_file: Path to markdown file
+            record: Per-file counts from _scan_markdown_file, or None on error
+            error: Read error message, if the file could not be read
+
+        Returns:
+            The stored record (all zeros if the file could not be read)
+        """
+        if error is not None:
+            print(f"Warning: Could not read {markdown_file}: {error}")
+            record = {'title': None, 'sections': 0, 'diagrams': 0,
+                      'equations': 0, 'words': 0, 'links': 0}
+            self._file_records[markdown_file] = record
+            return record
+
+        self.files_read += 1
+        if self.use_cache:
+            key = self._cache_key(markdown_file)
+            if key in self._cache_stats:
+                self._cache[key] = {'stat': self._cache_stats[key], 'record': record}
+        self._file_records[markdown_file] = record
+        return record
+
+    def _git(self, *args: str) -> str:
+        """Run a git command in the docs directory and return its stdout."""
+        result = subprocess.run(["git", *args], cwd=self.docs_dir,
+                                capture_output=True, text=True, check=True)
+        return result.stdout
+
+    def docs_commit(self) -> str:
+        """Return HEAD if the student-facing markdown matches it exactly.
+
+        The commit is recorded in the payload (metricsGitCommit) so a later
+        --since run knows which tree the totals were counted from. If any
+        counted markdown file has uncommitted or untracked changes, the
+        counts match no commit and None is returned.
+
+        Returns:
+            Full commit hash, or None (dirty tree, or docs/ not in git)
+        """
+        try:
+            head = self._git("rev-parse", "--verify", "HEAD").strip()
+            changed = self._git("diff", "--name-only", "--relative", "--no-renames",
+                                "HEAD", "--", ".")
+            untracked = self._git("ls-files", "--others", "--exclude-standard", "--", ".")
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        for name in (changed + untracked).splitlines():
+            if name.endswith('.md') and not self._is_excluded_path(self.docs_dir / name):
+                return None
+        return head
+
+    def load_previous_run(self, since: str, output_dir: Path = None) -> bool:
+        """Prepare an incremental run against the files changed since a git ref.
+
+        Reads the previous book-metrics.json payload and chapter-metrics.md
+        rows from output_dir and asks git which markdown files under docs/
+        changed (committed, staged, unstaged, or untracked) since the commit
+        the previous outputs were counted at (metricsGitCommit in the
+        payload). That commit, not `since`, is the diff base: diffing from
+        an older ref would count edits already in the previous totals twice.
+        If the payload records no commit (older version, or generated from
+        a dirty tree) the caller falls back to a full run.
+
+        Args:
+            since: Git ref (commit, tag, branch) the previous outputs are
+                   expected to match; a mismatch is reported
+            output_dir: Directory holding the previous outputs
+                        (defaults to the learning-graph directory)
+
+        Returns:
+            True if the incremental run is ready; False (with a warning) if
+            the caller should fall back to a full run
+        """
+        if output_dir is None:
+            output_dir = self.learning_graph_dir
+        metrics_file = output_dir / "book-metrics.json"
+        chapter_file = output_dir / "chapter-metrics.md"
+        generated_by = f"Book Metrics Python Program v{VERSION}"
+
+        try:
+            with open(metrics_file, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+            with open(chapter_file, 'r', encoding='utf-8') as f:
+                chapter_md = f.read()
+        except Exception as e:
+            print(f"⚠️  --since needs the previous book-metrics.json and "
+                  f"chapter-metrics.md ({e}); running a full scan.")
+            return False
+        if previous.get("metricsGeneratedBy") != generated_by or generated_by not in chapter_md:
+            print(f"⚠️  Previous metrics were not generated by v{VERSION}; "
+                  f"running a full scan.")
+            return False
+
+        base = previous.get("metricsGitCommit")
+        if not base:
+            print("⚠️  Previous metrics do not record the commit they were counted at "
+                  "(generated from uncommitted docs?); running a full scan.")
+            return False
+
+        try:
+            since_commit = self._git("rev-parse", "--verify", f"{since}^{{commit}}").strip()
+            changed = self._git("diff", "--name-only", "--relative", "--no-renames",
+                                base, "--", ".")
+            untracked = self._git("ls-files", "--others", "--exclude-standard", "--", ".")
+        except (OSError, subprocess.CalledProcessError) as e:
+            detail = getattr(e, 'stderr', '') or e
+            print(f"⚠️  Could not diff against {since!r} ({str(detail).strip()}); "
+                  f"running a full scan.")
+            return False
+        if since_commit != base:
+            print(f"ℹ️  Previous metrics were counted at {base[:12]}, not {since} "
+                  f"({since_commit[:12]}); diffing against {base[:12]}.")
+
+        self.since_ref = base
+        self._previous_payload = previous
+        self._changed_files = {self.docs_dir / name
+                               for name in (changed + untracked).splitlines()
+                               if name.endswith('.md')}
+        row_pattern = re.compile(
+            r'^\| (\d+) \| \[(.*)\]\(\.\./chapters/([^/]+)/index\.md\) '
+            r'\| (\d+) \| (\d+) \| (\d+) \| ([\d,]+) \| (\d+) \| (\d+) \| (\d+) \|$',
+            re.MULTILINE)
+        for match in row_pattern.finditer(chapter_md):
+            self._previous_rows[match.group(3)] = {
+                'number': int(match.group(1)),
+                'name': match.group(2),
+                'sections': int(match.group(4)),
+                'diagrams': int(match.group(5)),
+                'equations': int(match.group(6)),
+                'words': int(match.group(7).replace(',', '')),
+                'links': int(match.group(8)),
+                'quiz_questions': int(match.group(9)),
+                'references': int(match.group(10)),
+                'row': match.group(0),
+            }
+
+        reused = sum(1 for name in self._previous_rows
+                     if self._reusable_row(self.chapters_dir / name) is not None)
+        print(f"Incremental run since {base[:12]}: {len(self._changed_files)} changed "
+              f"markdown files, {reused} chapter rows reused")
+        return True
+
+    def _reusable_row(self, chapter_dir: Path) -> Dict[str, Any]:
+        """Return the previous chapter-metrics row if the chapter is untouched.
+
+        Args:
+            chapter_dir: Path to the chapter directory
+
+        Returns:
+            The previous row as a metrics dict (with the raw 'row' line), or
+            None when not in an incremental run or the chapter changed
+        """
+        if self.since_ref is None:
+            return None
+        previous = self._previous_rows.get(chapter_dir.name)
+        if previous is None:
+            return None
+        if any(chapter_dir in f.parents for f in self._changed_files):
+            return None
+        return previous
+
+    def _merged_total(self, key: str) -> int:
+        """Merge one scanned total into the previous run's value.
+
+        Adds the new count and subtracts the count at the git ref for every
+        changed student-facing markdown file (deleted files count as zero
+        now; added files count as zero at the ref).
+
+        Args:
+            key: Per-file count name ('words', 'links', 'diagrams' or 'equations')
+
+        Returns:
+            Updated book-wide total
+        """
+        total = self._previous_payload.get("metrics", {}).get(key, 0)
+        for md_file in sorted(self._changed_files):
+            if self._is_excluded_path(md_file):
+                continue
+            if md_file.exists():
+                total += self._file_record(md_file)[key]
+            total -= self._ref_record(md_file)[key]
+        return total
+
+    def _ref_record(self, markdown_file: Path) -> Dict[str, Any]:
+        """Return the per-file counts for a file as it was at the diff base commit."""
+        record = self._ref_records.get(markdown_file)
+        if record is None:
+            relative = markdown_file.relative_to(self.docs_dir).as_posix()
+            try:
+                content = self._git("show", f"{self.since_ref}:./{relative}")
+                record = self._scan_text(content)
+            except subprocess.CalledProcessError:
+                # File did not exist at the ref
+                record = {'title': None, 'sections': 0, 'diagrams': 0,
+                          'equations': 0, 'words': 0, 'links': 0}
+            self._ref_records[markdown_file] = record
+        return record
+
+    def _parallel_map(self, func, items: List[Any]) -> List[Any]:
+        """Apply func to items, on a process pool when jobs > 1.
+
+        Results are returned in input order, so merging them is deterministic
+        regardless of which worker finishes first.
+
+        Args:
+            func: Picklable module-level function
+            items: Inputs to map over
+
+        Returns:
+            List of results in the same order as items
+        """
+        if self.jobs <= 1 or len(items) < 2:
+            return [func(item) for item in items]
+        workers = min(self.jobs, len(items))
+        chunksize = max(1, len(items) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(func, items, chunksize=chunksize))
+
+    def prefetch_documents(self) -> None:
+        """Scan every markdown file the reports need, in parallel when jobs > 1.
+
+        Covers student-facing files plus everything under chapters/. Files
+        already scanned or served from the cache are skipped; the rest are
+        analyzed on the worker pool and stored in sorted path order.
+        """
+        files = sorted(set(self._iter_markdown_files()) |
+                       {f for f in self._iter_markdown_files(exclude_non_content=False)
+                        if self.chapters_dir in f.parents})
+        if self.since_ref is not None:
+            # Incremental run: only changed files are ever read
+            files = [f for f in files if f in self._changed_files]
+        pending = []
+        for md_file in files:
+            if md_file in self._file_records:
+                continue
+            if self.use_cache:
+                record = self._cached_record(md_file)
+                if record is not None:
+                    self._file_records[md_file] = record
+                    continue
+            pending.append(md_file)
+
+        for md_file, (record, error) in zip(pending,
+                                            self._parallel_map(_scan_markdown_file, pending)):
+            self._store_record(md_file, record, error)
+
+    def _cache_key(self, markdown_file: Path) -> str:
+        """Return the cache key for a file (its path relative to docs/)."""
+        try:
+            return markdown_file.relative_to(self.docs_dir).as_posix()
+        except ValueError:
+            return str(markdown_file)
+
+    def _cached_record(self, markdown_file: Path) -> Dict[str, Any]:
+        """Look up a file in the on-disk cache.
+
+        Records the file's current mtime and size (taken before any read) so
+        freshly parsed counts can be cached against them.
+
+        Args:
+            markdown_file: Path to markdown file
+
+        Returns:
+            The cached per-file record, or None if the file changed or is
+            not cached
+        """
+        key = self._cache_key(markdown_file)
+        try:
+            stat = markdown_file.stat()
+        except OSError:
+            return None
+        self._cache_stats[key] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+        entry = self._cache.get(key)
+        if entry is None or entry.get('stat') != self._cache_stats[key]:
+            return None
+        self.cache_hits += 1
+        return entry['record']
+
+    def load_cache(self) -> None:
+        """Load the per-file metrics cache from disk.
+
+        A missing, unreadable, or stale-version cache is treated as empty.
+        """
+        if not self.cache_file.exists():
+            return
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable metrics cache {self.cache_file}: {e}")
+            return
+        # Counting rules can change between versions, so never reuse counts
+        # produced by a different generator version.
+        if not isinstance(data, dict) or data.get('version') != VERSION:
+            return
+        self._cache = {key: entry for key, entry in data.get('files', {}).items()
+                       if isinstance(entry, dict) and 'record' in entry}
+
+    def save_cache(self) -> int:
+        """Write the per-file metrics cache back to disk.
+
+        Entries for markdown files that no longer exist under docs/ are
+        evicted.
+
+        Returns:
+            Number of evicted entries
+        """
+        if not self.use_cache:
+            return 0
+
+        live = {self._cache_key(f) for f in self._iter_markdown_files(exclude_non_content=False)}
+        files = {key: entry for key, entry in self._cache.items() if key in live}
+        evicted = len(self._cache) - len(files)
+
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': VERSION, 'files': files}, f,
+                      ensure_ascii=False, sort_keys=True)
+        os.replace(tmp_file, self.cache_file)
+        return evicted
+
+    def _sum_files(self, key: str, files: List[Path]) -> int:
+        """Sum one scanned count over a list of markdown files.
+
+        Args:
+            key: Count name from the per-file record (e.g. 'words')
+            files: Markdown files to include
+
+        Returns:
+            Total of that count across the files
+        """
+        return sum(self._file_record(f)[key] for f in files)
+
     def count_chapters(self) -> Tuple[int, List[Dict[str, Any]]]:
         """Count number of chapter directories and collect chapter info.
 
@@ -95,8 +574,10 @@ class BookMetricsGenerator:
                     chapter_num = int(match.group(1))
                     index_file = item / "index.md"
 
-                    # Read chapter title from index.md
-                    title = self._extract_title(index_file)
+                    # Read chapter title from index.md (or reuse it from the
+                    # previous run when the chapter is untouched)
+                    previous = self._reusable_row(item)
+                    title = previous['name'] if previous else self._extract_title(index_file)
 
                     chapters.append({
                         'number': chapter_num,
@@ -116,16 +597,7 @@ class BookMetricsGenerator:
         Returns:
             The title string, or the filename if no title found
         """
-        try:
-            with open(markdown_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    match = re.match(r'^#\s+(.+)$', line.strip())
-                    if match:
-                        return match.group(1)
-        except Exception as e:
-            print(f"Warning: Could not read {markdown_file}: {e}")
-
-        return markdown_file.parent.name
+        return self._file_record(markdown_file)['title'] or markdown_file.parent.name
 
     def count_concepts(self) -> int:
         """Count concepts from learning-graph.csv.
@@ -234,13 +706,7 @@ class BookMetricsGenerator:
         Returns:
             Number of diagrams (H4 headers starting with "#### Diagram:")
         """
-        try:
-            with open(markdown_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                return len(re.findall(r'^####\s+Diagram:', content, re.MULTILINE))
-        except Exception as e:
-            print(f"Warning: Could not read {markdown_file}: {e}")
-            return 0
+        return self._file_record(markdown_file)['diagrams']
 
     def count_all_diagrams(self, exclude_non_content: bool = True) -> int:
         """Count all diagrams in all markdown files.
@@ -251,15 +717,9 @@ class BookMetricsGenerator:
         Returns:
             Total number of diagrams
         """
-        total = 0
-
-        # Search all markdown files in docs directory
-        for md_file in self.docs_dir.rglob('*.md'):
-            if exclude_non_content and self._is_excluded_path(md_file):
-                continue
-            total += self.count_diagrams_in_file(md_file)
-
-        return total
+        if self._previous_payload is not None and exclude_non_content:
+            return self._merged_total('diagrams')
+        return self._sum_files('diagrams', self._iter_markdown_files(exclude_non_content))
 
     def count_equations_in_file(self, markdown_file: Path) -> int:
         """Count LaTeX equations in a single markdown file.
@@ -267,6 +727,8 @@ class BookMetricsGenerator:
         Fixed to:
         1. Remove display math before counting inline math (avoids double-counting)
         2. Exclude dollar amounts like $500 from being counted as equations
+        3. Ignore dollar signs inside code blocks and inline code
+           (see markdown_lexer.py)
 
         Args:
             markdown_file: Path to markdown file
@@ -274,26 +736,7 @@ class BookMetricsGenerator:
         Returns:
             Number of equations (LaTeX expressions)
         """
-        try:
-            with open(markdown_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-                # Count display math: $$...$$ (must come first)
-                display_matches = re.findall(r'\$\$[^$]+?\$\$', content, re.DOTALL)
-                display = len(display_matches)
-
-                # Remove all display math blocks to avoid double-counting
-                content_no_display = re.sub(r'\$\$[^$]+?\$\$', '', content, flags=re.DOTALL)
-
-                # Count inline math: $...$
-                # Negative lookahead (?!\d) ensures we don't match dollar amounts like $500
-                inline_matches = re.findall(r'\$(?!\d)([^\$]+?)\$', content_no_display)
-                inline = len(inline_matches)
-
-                return inline + display
-        except Exception as e:
-            print(f"Warning: Could not read {markdown_file}: {e}")
-            return 0
+        return self._file_record(markdown_file)['equations']
 
     def count_all_equations(self, exclude_non_content: bool = True) -> int:
         """Count all equations in all markdown files.
@@ -304,15 +747,9 @@ class BookMetricsGenerator:
         Returns:
             Total number of equations
         """
-        total = 0
-
-        # Search all markdown files in docs directory
-        for md_file in self.docs_dir.rglob('*.md'):
-            if exclude_non_content and self._is_excluded_path(md_file):
-                continue
-            total += self.count_equations_in_file(md_file)
-
-        return total
+        if self._previous_payload is not None and exclude_non_content:
+            return self._merged_total('equations')
+        return self._sum_files('equations', self._iter_markdown_files(exclude_non_content))
 
     def count_microsims(self) -> int:
         """Count MicroSim directories in docs/sims.
@@ -353,44 +790,13 @@ class BookMetricsGenerator:
         if not plants_dir.exists():
             return result
 
-        for card in plants_dir.iterdir():
-            if not (card.is_file() and card.suffix == ".md"
-                    and card.name != "index.md"):
-                continue
-            result["total"] += 1
-            slug = card.stem
-            try:
-                text = card.read_text(encoding="utf-8")
-            except Exception:
-                continue
-            if (img_dir / f"{slug}-illustration.png").exists():
-                result["with_illustration"] += 1
-            # Photo references in the card body, e.g. ![alt](img/<slug>-1.jpg)
-            if f"{slug}-1.jpg" in text or f"{slug}-1.JPG" in text:
-                result["with_photos"] += 1
-            # Quick Facts populated: at least one DATA row (Family, Height,
-            # Bloom time, Sun, Moisture, Soil, Wildlife value) has content
-            # other than "—". The Scientific name row is auto-populated
-            # and doesn't count.
-            in_facts = False
-            data_keys = {"family", "height", "bloom time", "sun",
-                         "moisture", "soil", "wildlife value",
-                         "hardiness zone", "native range"}
-            for line in text.splitlines():
-                if line.strip().startswith("## Quick Facts"):
-                    in_facts = True
-                    continue
-                if in_facts:
-                    if line.strip().startswith("## "):
-                        break
-                    if "|" in line and "---" not in line:
-                        cells = [c.strip().strip("*").lower()
-                                 for c in line.split("|")[1:-1]]
-                        if len(cells) >= 2 and cells[0] in data_keys:
-                            value = cells[1].strip("*")
-                            if value and value != "—":
-                                result["with_quick_facts"] += 1
-                                break
+        cards = sorted(card for card in plants_dir.iterdir()
+                       if card.is_file() and card.suffix == ".md"
+                       and card.name != "index.md")
+        for coverage in self._parallel_map(partial(_analyze_species_card, img_dir=img_dir),
+                                           cards):
+            for key, value in coverage.items():
+                result[key] += value
         return result
 
     def count_host_plant_relationships(self) -> int:
@@ -404,20 +810,9 @@ class BookMetricsGenerator:
         in structured data, which most textbooks don't have."""
         if not self.chapters_dir.exists():
             return 0
-        count = 0
-        for chapter in self.chapters_dir.iterdir():
-            if not chapter.is_dir():
-                continue
-            index = chapter / "index.md"
-            if not index.exists():
-                continue
-            try:
-                text = index.read_text(encoding="utf-8").lower()
-            except Exception:
-                continue
-            count += text.count("host plant")
-            count += text.count("larval host")
-        return count
+        indexes = sorted(chapter / "index.md" for chapter in self.chapters_dir.iterdir()
+                         if chapter.is_dir() and (chapter / "index.md").exists())
+        return sum(self._parallel_map(_count_host_plant_mentions, indexes))
 
     def count_stories(self) -> int:
         """Count stories in docs/stories.
@@ -572,21 +967,7 @@ class BookMetricsGenerator:
         Returns:
             Number of words
         """
-        try:
-            with open(markdown_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                # Remove code blocks
-                content = re.sub(r'```.*?```', '', content, flags=re.DOTALL)
-                # Remove inline code
-                content = re.sub(r'`[^`]+`', '', content)
-                # Remove URLs
-                content = re.sub(r'https?://\S+', '', content)
-                # Count words
-                words = re.findall(r'\b\w+\b', content)
-                return len(words)
-        except Exception as e:
-            print(f"Warning: Could not read {markdown_file}: {e}")
-            return 0
+        return self._file_record(markdown_file)['words']
 
     def count_total_words(self, exclude_non_content: bool = True) -> int:
         """Count total words in all markdown files.
@@ -597,15 +978,9 @@ class BookMetricsGenerator:
         Returns:
             Total word count
         """
-        total = 0
-
-        # Search all markdown files in docs directory
-        for md_file in self.docs_dir.rglob('*.md'):
-            if exclude_non_content and self._is_excluded_path(md_file):
-                continue
-            total += self.count_words_in_file(md_file)
-
-        return total
+        if self._previous_payload is not None and exclude_non_content:
+            return self._merged_total('words')
+        return self._sum_files('words', self._iter_markdown_files(exclude_non_content))
 
     def count_links_in_file(self, markdown_file: Path) -> int:
         """Count markdown links in a single file.
@@ -616,14 +991,7 @@ class BookMetricsGenerator:
         Returns:
             Number of links
         """
-        try:
-            with open(markdown_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                # Count markdown links [text](url)
-                return len(re.findall(r'\[([^\]]+)\]\(([^)]+)\)', content))
-        except Exception as e:
-            print(f"Warning: Could not read {markdown_file}: {e}")
-            return 0
+        return self._file_record(markdown_file)['links']
 
     def count_all_links(self, exclude_non_content: bool = True) -> int:
         """Count all links in all markdown files.
@@ -634,15 +1002,9 @@ class BookMetricsGenerator:
         Returns:
             Total number of links
         """
-        total = 0
-
-        # Search all markdown files in docs directory
-        for md_file in self.docs_dir.rglob('*.md'):
-            if exclude_non_content and self._is_excluded_path(md_file):
-                continue
-            total += self.count_links_in_file(md_file)
-
-        return total
+        if self._previous_payload is not None and exclude_non_content:
+            return self._merged_total('links')
+        return self._sum_files('links', self._iter_markdown_files(exclude_non_content))
 
     def calculate_equivalent_pages(self, total_words: int, diagrams: int, microsims: int) -> int:
         """Calculate equivalent pages based on words, diagrams, and MicroSims.
@@ -676,15 +1038,7 @@ class BookMetricsGenerator:
         Returns:
             Number of sections
         """
-        try:
-            with open(markdown_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                h2_count = len(re.findall(r'^##\s+', content, re.MULTILINE))
-                h3_count = len(re.findall(r'^###\s+', content, re.MULTILINE))
-                return h2_count + h3_count
-        except Exception as e:
-            print(f"Warning: Could not read {markdown_file}: {e}")
-            return 0
+        return self._file_record(markdown_file)['sections']
 
     def get_chapter_metrics(self, chapter: Dict[str, Any]) -> Dict[str, Any]:
         """Get metrics for a single chapter.
@@ -698,19 +1052,21 @@ class BookMetricsGenerator:
         index_file = chapter['index_file']
         chapter_dir = chapter['path']
 
+        # Incremental run: reuse the previous row for untouched chapters
+        previous = self._reusable_row(chapter_dir)
+        if previous is not None:
+            return previous
+
         # Count sections in index.md
         sections = self.count_sections_in_file(index_file)
 
-        # Count diagrams, equations, words, and links in all markdown files in chapter directory
-        diagrams = 0
-        equations = 0
-        words = 0
-        links = 0
-        for md_file in chapter_dir.rglob('*.md'):
-            diagrams += self.count_diagrams_in_file(md_file)
-            equations += self.count_equations_in_file(md_file)
-            words += self.count_words_in_file(md_file)
-            links += self.count_links_in_file(md_file)
+        # Count diagrams, equations, words, and links in all markdown files in
+        # chapter directory (served from the single-pass scan records)
+        chapter_files = self._iter_chapter_files(chapter_dir)
+        diagrams = self._sum_files('diagrams', chapter_files)
+        equations = self._sum_files('equations', chapter_files)
+        words = self._sum_files('words', chapter_files)
+        links = self._sum_files('links', chapter_files)
 
         # Quiz questions and references for this chapter
         quiz_file = chapter_dir / "quiz.md"
@@ -932,6 +1288,10 @@ class BookMetricsGenerator:
         # Add rows for each chapter
         for chapter in chapters:
             metrics = self.get_chapter_metrics(chapter)
+            if 'row' in metrics:
+                # Untouched chapter in an incremental run - reuse verbatim
+                md += metrics['row'] + "\n"
+                continue
             # Create link to chapter index.md (relative to learning-graph directory)
             chapter_dir_name = chapter['path'].name
             chapter_link = f"[{metrics['name']}](../chapters/{chapter_dir_name}/index.md)"
@@ -1012,7 +1372,7 @@ class BookMetricsGenerator:
         Returns:
             Dict conforming to book-metrics.schema.json.
         """
-        return {
+        payload = {
             "$schema": (
                 "https://raw.githubusercontent.com/dmccreary/ibook-skills/"
                 "main/src/book-metrics/book-metrics.schema.json"
@@ -1023,6 +1383,17 @@ class BookMetricsGenerator:
             "metricsGeneratedOnISO": datetime.now().replace(microsecond=0).isoformat(),
             "metrics": self.collect_book_totals(),
         }
+        commit = self.docs_commit()
+        if commit:
+            payload["metricsGitCommit"] = commit
+        if self._previous_payload is not None:
+            # Incremental run: merge into the previous payload so any keys
+            # it carries survive, with fresh provenance and totals on top
+            merged = dict(self._previous_payload)
+            merged.pop("metricsGitCommit", None)
+            merged.update(payload)
+            payload = merged
+        return payload
 
     def write_book_metrics_json(self, output_dir: Path = None,
                                 payload: Dict[str, Any] = None) -> None:
@@ -1132,6 +1503,10 @@ class BookMetricsGenerator:
         # Create output directory if it doesn't exist
         output_dir.mkdir(parents=True, exist_ok=True)
 
+        # Read and analyze every markdown file up front (on the worker pool
+        # when --jobs > 1); the reports below are then served from memory.
+        self.prefetch_documents()
+
         # Generate book metrics
         book_metrics_content = self.generate_book_metrics_md()
         book_metrics_file = output_dir / "book-metrics.md"
@@ -1157,13 +1532,115 @@ class BookMetricsGenerator:
         # Backward-compatible mirror inside author metadata
         self.update_book_metadata(output_dir, payload)
 
+        # Persist per-file counts so the next run skips unchanged files
+        if self.use_cache:
+            evicted = self.save_cache()
+            print(f"✅ Metrics cache: {self.cache_hits} unchanged, "
+                  f"{self.files_read} parsed, {evicted} evicted ({self.cache_file})")
+
+
+# Per-file workers. These live at module level so ProcessPoolExecutor can
+# pickle them when BookMetricsGenerator fans work out with --jobs.
+
+def _scan_markdown_file(markdown_file: Path) -> Tuple[Dict[str, Any], str]:
+    """Read one markdown file and run every per-file counter on it.
+
+    Args:
+        markdown_file: Path to markdown file
+
+    Returns:
+        Tuple of (per-file record, None) or (None, error message)
+    """
+    try:
+        with open(markdown_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except Exception as e:
+        return None, str(e)
+    return BookMetricsGenerator._scan_text(content), None
+
+
+def _analyze_species_card(card: Path, img_dir: Path) -> Dict[str, int]:
+    """Report the asset coverage of one species card as 0/1 counts.
+
+    Args:
+        card: Path to docs/plants/<slug>.md
+        img_dir: Path to docs/plants/img
+
+    Returns:
+        Dict with total, with_illustration, with_photos and with_quick_facts
+    """
+    result = {
+        "total": 1,
+        "with_illustration": 0,
+        "with_photos": 0,
+        "with_quick_facts": 0,
+    }
+    slug = card.stem
+    try:
+        text = card.read_text(encoding="utf-8")
+    except Exception:
+        return result
+    if (img_dir / f"{slug}-illustration.png").exists():
+        result["with_illustration"] = 1
+    # Photo references in the card body, e.g. ![alt](img/<slug>-1.jpg)
+    if f"{slug}-1.jpg" in text or f"{slug}-1.JPG" in text:
+        result["with_photos"] = 1
+    # Quick Facts populated: at least one DATA row (Family, Height,
+    # Bloom time, Sun, Moisture, Soil, Wildlife value) has content
+    # other than "—". The Scientific name row is auto-populated
+    # and doesn't count.
+    in_facts = False
+    data_keys = {"family", "height", "bloom time", "sun",
+                 "moisture", "soil", "wildlife value",
+                 "hardiness zone", "native range"}
+    for line in text.splitlines():
+        if line.strip().startswith("## Quick Facts"):
+            in_facts = True
+            continue
+        if in_facts:
+            if line.strip().startswith("## "):
+                break
+            if "|" in line and "---" not in line:
+                cells = [c.strip().strip("*").lower()
+                         for c in line.split("|")[1:-1]]
+                if len(cells) >= 2 and cells[0] in data_keys:
+                    value = cells[1].strip("*")
+                    if value and value != "—":
+                        result["with_quick_facts"] = 1
+                        break
+    return result
+
+
+def _count_host_plant_mentions(index: Path) -> int:
+    """Count 'host plant' / 'larval host' mentions in one chapter index.md."""
+    try:
+        text = index.read_text(encoding="utf-8").lower()
+    except Exception:
+        return 0
+    return text.count("host plant") + text.count("larval host")
+
 
 def main():
     """Main entry point."""
-    import sys
-
-    # Get docs directory from command line or use default
-    docs_dir = sys.argv[1] if len(sys.argv) > 1 else "docs"
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Generate book and chapter metrics for an intelligent textbook.")
+    parser.add_argument("docs_dir", nargs="?", default="docs",
+                        help="Path to the docs directory (default: docs)")
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument("--no-cache", action="store_true",
+                             help="Do not read or write the per-file metrics cache")
+    cache_group.add_argument("--rebuild", action="store_true",
+                             help="Discard the per-file metrics cache and rebuild it")
+    parser.add_argument("--jobs", "-j", type=int, default=1, metavar="N",
+                        help="Worker processes for per-file analysis "
+                             "(default: 1, 0 = one per CPU)")
+    parser.add_argument("--since", metavar="GIT_REF",
+                        help="Only recompute markdown files changed since GIT_REF and "
+                             "merge into the previous book-metrics.json")
+    args = parser.parse_args()
+    docs_dir = args.docs_dir
 
     # Check if docs directory exists
     if not Path(docs_dir).exists():
@@ -1171,11 +1648,36 @@ def main():
         sys.exit(1)
 
     # Generate metrics
-    generator = BookMetricsGenerator(docs_dir)
+    generator = BookMetricsGenerator(docs_dir, use_cache=not args.no_cache,
+                                     rebuild_cache=args.rebuild, jobs=args.jobs)
+    if args.since:
+        generator.load_previous_run(args.since)
     generator.generate_metrics()
 
     print(f"\n✅ Book metrics generation version {VERSION} complete!")
-    print("\nUpdates in v0.08:")
+    print("\nUpdates in v0.10:")
+    print("  - Words, links, equations, diagrams and sections now come from a")
+    print("    single-pass markdown lexer (markdown_lexer.py) instead of chained")
+    print("    re.sub/re.findall passes. Code blocks and inline code are classified")
+    print("    first, so $VARS, [brackets] and headings inside code are no longer")
+    print("    counted as equations, links, diagrams or sections")
+    print("  - Totals shift once versus v0.09 (on this repo's docs: equations")
+    print("    131 -> 1, words 171,712 -> 174,636, links 1,167 -> 1,154); see")
+    print("    README.md 'Markdown lexer' for why")
+    print("\nPrevious updates (v0.09):")
+    print("  - Single-pass document scan: docs/ is walked once and each markdown")
+    print("    file is read once; words, links, diagrams, equations, sections and")
+    print("    titles all come from that one buffer and feed both the book totals")
+    print("    and the per-chapter tables (see benchmark-book-metrics.py)")
+    print("  - Per-file counts are cached in .cache/book-metrics/file-metrics.json")
+    print("    (keyed by path, mtime and size); unchanged files are never re-parsed")
+    print("    and deleted files are evicted. Use --rebuild or --no-cache to bypass.")
+    print("  - --jobs N analyzes files on N worker processes; results are merged in")
+    print("    sorted path order so the output matches a serial run exactly")
+    print("  - --since GIT_REF recomputes only markdown files changed since a git")
+    print("    ref and merges them into the previous book-metrics.json; rows for")
+    print("    untouched chapters are reused verbatim from chapter-metrics.md")
+    print("\nPrevious updates (v0.08):")
     print("  - NEW canonical docs/learning-graph/book-metrics.json - the single")
     print("    source of truth for book-wide totals. Fully machine-owned and")
     print("    overwritten each run; validates against book-metrics.schema.json.")
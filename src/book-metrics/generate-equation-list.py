@@ -7,14 +7,33 @@ with links to their source locations. This report is useful for verifying that
 all equations render correctly.
 
 Usage:
-    python generate-equation-list.py [docs_directory] [output_file]
+    python generate-equation-list.py [docs_directory] [output_file] [--jobs N]
 
 Examples:
     python generate-equation-list.py docs docs/learning-graph/list-equations.md
     python generate-equation-list.py  # Uses defaults: docs and docs/learning-graph/list-equations.md
+
+Alongside the markdown list, a deduplicated equation index is written to
+<docs>/learning-graph/equation-index.json (or SQLite with --index *.db): each
+distinct equation, canonicalized with whitespace collapsed and identified by
+its hash, with the list of places it occurs. Site search and "where else is
+this formula used" lookups (--lookup LATEX) read that index instead of
+re-scanning the chapters.
+
+Line numbers come from a precomputed newline-offset array (bisect per
+equation), and inline matches inside display math are rejected with a bisect
+over the sorted display intervals, so extraction is linear in file size.
+Files are extracted in parallel with --jobs (default: CPU count).
 """
 
+import argparse
+import hashlib
+import json
+import os
 import re
+import sqlite3
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Tuple, Any
 from datetime import datetime
@@ -23,6 +42,23 @@ from dataclasses import dataclass
 # Version of the Equation List Generator
 VERSION = "1.0.0"
 
+# Version of the equation index layout
+INDEX_VERSION = 1
+# Order of the fields in each index occurrence
+OCCURRENCE_FIELDS = ["file", "line", "type", "chapter"]
+# Index file suffixes written as SQLite instead of JSON
+SQLITE_SUFFIXES = {'.db', '.sqlite', '.sqlite3'}
+
+
+def canonicalize_latex(latex: str) -> str:
+    """Canonical form of an equation for deduplication: whitespace runs collapsed."""
+    return ' '.join(latex.split())
+
+
+def equation_id(canonical: str) -> str:
+    """Stable short id of a canonical equation (first 16 hex digits of its SHA-256)."""
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
 
 @dataclass
 class Equation:
@@ -41,6 +77,19 @@ class EquationListGenerator:
     # Directories to exclude from scanning
     EXCLUDED_DIRS = {'prompts', 'learning-graph', '.git', '__pycache__', 'site'}
 
+    DISPLAY_MATH_PATTERN = re.compile(r'\$\$([^$]+?)\$\$', re.DOTALL)
+    # Excludes dollar amounts like $5
+    INLINE_MATH_PATTERN = re.compile(r'\$(?!\d)([^\$]+?)\$')
+    NEWLINE_PATTERN = re.compile(r'\n')
+
+    # Common false positives that are just text fragments
+    FALSE_POSITIVE_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+        r'^,?\s*(and|or|where|with|for|if|is|are|the|to|in|of|a|an)\s*,?$',  # Just connective words
+        r'^[a-z]+\s*-\s*$',  # Word followed by dash
+        r'^\s*-\s*$',  # Just a dash
+        r'^[A-Za-z\s,]+$',  # Just letters, spaces, and commas (no math symbols)
+    )]
+
     def __init__(self, docs_dir: str = "docs"):
         """Initialize the equation list generator.
 
@@ -151,15 +200,8 @@ class EquationListGenerator:
             return False
 
         # Filter out common false positives that are just text fragments
-        false_positive_patterns = [
-            r'^,?\s*(and|or|where|with|for|if|is|are|the|to|in|of|a|an)\s*,?$',  # Just connective words
-            r'^[a-z]+\s*-\s*$',  # Word followed by dash
-            r'^\s*-\s*$',  # Just a dash
-            r'^[A-Za-z\s,]+$',  # Just letters, spaces, and commas (no math symbols)
-        ]
-
-        for pattern in false_positive_patterns:
-            if re.match(pattern, content, re.IGNORECASE):
+        for pattern in self.FALSE_POSITIVE_PATTERNS:
+            if pattern.match(content):
                 return False
 
         # If content is mostly text (more than 80% letters/spaces), it's probably not an equation
@@ -185,7 +227,6 @@ class EquationListGenerator:
         try:
             with open(markdown_file, 'r', encoding='utf-8') as f:
                 content = f.read()
-                lines = content.split('\n')
         except Exception as e:
             print(f"Warning: Could not read {markdown_file}: {e}")
             return equations
@@ -193,20 +234,22 @@ class EquationListGenerator:
         # Get chapter info
         chapter_num, chapter_name = self._get_chapter_info(markdown_file)
 
-        # Track positions of display math to avoid double-counting
-        display_positions = set()
+        # Offsets of every newline; the line of position p is the number of
+        # newlines before it plus one
+        newline_offsets = [match.start() for match in self.NEWLINE_PATTERN.finditer(content)]
+
+        # Sorted, non-overlapping display math intervals, to avoid double-counting
+        display_starts = []
+        display_ends = []
 
         # Find display math: $$...$$
-        for match in re.finditer(r'\$\$([^$]+?)\$\$', content, re.DOTALL):
+        for match in self.DISPLAY_MATH_PATTERN.finditer(content):
             start_pos = match.start()
-            equation_content = match.group(0)
             inner_content = match.group(1).strip()
 
-            # Calculate line number
-            line_number = content[:start_pos].count('\n') + 1
-
-            # Track this position
-            display_positions.add((start_pos, match.end()))
+            # Track this interval
+            display_starts.append(start_pos)
+            display_ends.append(match.end())
 
             # Display math is usually valid, but still check
             if self._is_valid_equation(inner_content):
@@ -214,25 +257,20 @@ class EquationListGenerator:
                     content=inner_content,
                     equation_type='display',
                     file_path=markdown_file,
-                    line_number=line_number,
+                    line_number=bisect_left(newline_offsets, start_pos) + 1,
                     chapter_name=chapter_name,
                     chapter_number=chapter_num
                 ))
 
         # Find inline math: $...$
         # Need to exclude display math positions and dollar amounts
-        for match in re.finditer(r'\$(?!\d)([^\$]+?)\$', content):
+        for match in self.INLINE_MATH_PATTERN.finditer(content):
             start_pos = match.start()
-            end_pos = match.end()
-
-            # Skip if this is part of a display math block
-            is_in_display = False
-            for disp_start, disp_end in display_positions:
-                if disp_start <= start_pos < disp_end:
-                    is_in_display = True
-                    break
 
-            if is_in_display:
+            # Skip if this starts inside a display math block: the last
+            # interval starting at or before it is the only candidate
+            i = bisect_right(display_starts, start_pos) - 1
+            if i >= 0 and start_pos < display_ends[i]:
                 continue
 
             inner_content = match.group(1).strip()
@@ -241,47 +279,58 @@ class EquationListGenerator:
             if not self._is_valid_equation(inner_content):
                 continue
 
-            # Calculate line number
-            line_number = content[:start_pos].count('\n') + 1
-
             equations.append(Equation(
                 content=inner_content,
                 equation_type='inline',
                 file_path=markdown_file,
-                line_number=line_number,
+                line_number=bisect_left(newline_offsets, start_pos) + 1,
                 chapter_name=chapter_name,
                 chapter_number=chapter_num
             ))
 
         return equations
 
-    def extract_all_equations(self) -> List[Equation]:
+    def extract_all_equations(self, jobs: int = 1) -> List[Equation]:
         """Extract all equations from all markdown files in docs.
 
+        Args:
+            jobs: Number of worker processes to extract files with
+
         Returns:
             List of all Equation objects, sorted by chapter then line number
         """
         all_equations = []
 
         # Search all markdown files in docs directory
-        for md_file in self.docs_dir.rglob('*.md'):
-            if self._is_excluded_path(md_file):
-                continue
-            equations = self.extract_equations_from_file(md_file)
-            all_equations.extend(equations)
+        md_files = [md_file for md_file in self.docs_dir.rglob('*.md')
+                    if not self._is_excluded_path(md_file)]
+
+        if jobs <= 1 or len(md_files) <= 1:
+            for md_file in md_files:
+                all_equations.extend(self.extract_equations_from_file(md_file))
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                chunksize = max(1, len(md_files) // (jobs * 4))
+                for equations in pool.map(_extract_file_worker, [str(self.docs_dir)] * len(md_files),
+                                          md_files, chunksize=chunksize):
+                    all_equations.extend(equations)
 
         # Sort by chapter number, then by file path, then by line number
         all_equations.sort(key=lambda e: (e.chapter_number, str(e.file_path), e.line_number))
 
         return all_equations
 
-    def generate_equation_list_md(self) -> str:
+    def generate_equation_list_md(self, equations: List[Equation] = None) -> str:
         """Generate the list-equations.md content.
 
+        Args:
+            equations: Equations to list (default: extract them from docs)
+
         Returns:
             Markdown content as string
         """
-        equations = self.extract_all_equations()
+        if equations is None:
+            equations = self.extract_all_equations()
 
         # Get current timestamp
         timestamp = datetime.now().strftime("%B %d, %Y at %I:%M %p")
@@ -381,11 +430,15 @@ class EquationListGenerator:
 
         return md
 
-    def generate_report(self, output_file: Path = None):
-        """Generate the equation list report.
+    def generate_report(self, output_file: Path = None, jobs: int = 1, index_file: Path = None,
+                        write_index: bool = True):
+        """Generate the equation list report and the equation index.
 
         Args:
             output_file: Path to write the report (defaults to learning-graph/list-equations.md)
+            jobs: Number of worker processes to extract files with
+            index_file: Path to write the index (defaults to learning-graph/equation-index.json)
+            write_index: Whether to write the equation index at all
         """
         if output_file is None:
             output_file = self.learning_graph_dir / "list-equations.md"
@@ -394,7 +447,8 @@ class EquationListGenerator:
         output_file.parent.mkdir(parents=True, exist_ok=True)
 
         # Generate content
-        content = self.generate_equation_list_md()
+        equations = self.extract_all_equations(jobs)
+        content = self.generate_equation_list_md(equations)
 
         # Write file
         with open(output_file, 'w', encoding='utf-8') as f:
@@ -402,33 +456,168 @@ class EquationListGenerator:
 
         print(f"✅ Generated {output_file}")
 
+        if write_index:
+            if index_file is None:
+                index_file = self.learning_graph_dir / "equation-index.json"
+            index = self.build_equation_index(equations)
+            self.write_equation_index(index, index_file)
+            print(f"✅ Generated {index_file} ({index['equation_count']} distinct equations)")
+
         # Print summary
-        equations = self.extract_all_equations()
         print(f"\n📊 Found {len(equations)} equations:")
         print(f"   - Display equations: {sum(1 for e in equations if e.equation_type == 'display')}")
         print(f"   - Inline equations: {sum(1 for e in equations if e.equation_type == 'inline')}")
 
 
+    def build_equation_index(self, equations: List[Equation]) -> Dict[str, Any]:
+        """Deduplicate equations across chapters into an index with occurrence lists.
+
+        Args:
+            equations: Equations as returned by extract_all_equations
+
+        Returns:
+            Index dict; equations appear in order of first occurrence
+        """
+        entries: Dict[str, Dict[str, Any]] = {}
+        for eq in equations:
+            canonical = canonicalize_latex(eq.content)
+            eq_id = equation_id(canonical)
+            entry = entries.get(eq_id)
+            if entry is None:
+                entry = entries[eq_id] = {'id': eq_id, 'latex': canonical, 'occurrences': []}
+            try:
+                file_name = str(eq.file_path.relative_to(self.docs_dir)).replace('\\', '/')
+            except ValueError:
+                file_name = str(eq.file_path)
+            entry['occurrences'].append([file_name, eq.line_number, eq.equation_type, eq.chapter_number])
+
+        return {
+            'version': INDEX_VERSION,
+            'generator': VERSION,
+            'occurrence_fields': OCCURRENCE_FIELDS,
+            'equation_count': len(entries),
+            'occurrence_count': len(equations),
+            'equations': list(entries.values()),
+        }
+
+    def write_equation_index(self, index: Dict[str, Any], index_file: Path):
+        """Write the index as compact JSON, or as SQLite if index_file ends in .db/.sqlite.
+
+        Args:
+            index: Index dict from build_equation_index
+            index_file: Output path
+        """
+        index_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = index_file.with_name(index_file.name + '.tmp')
+        if tmp_file.exists():
+            tmp_file.unlink()
+
+        if index_file.suffix in SQLITE_SUFFIXES:
+            conn = sqlite3.connect(tmp_file)
+            with conn:
+                conn.executescript("""
+                    CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+                    CREATE TABLE equations (id TEXT PRIMARY KEY, latex TEXT NOT NULL,
+                                            occurrences INTEGER NOT NULL);
+                    CREATE TABLE occurrences (equation_id TEXT NOT NULL REFERENCES equations(id),
+                                              file TEXT NOT NULL, line INTEGER NOT NULL,
+                                              type TEXT NOT NULL, chapter INTEGER NOT NULL);
+                    CREATE INDEX occurrences_equation ON occurrences (equation_id);
+                """)
+                conn.executemany("INSERT INTO meta VALUES (?, ?)",
+                                 [('version', str(index['version'])), ('generator', index['generator'])])
+                conn.executemany("INSERT INTO equations VALUES (?, ?, ?)",
+                                 [(e['id'], e['latex'], len(e['occurrences'])) for e in index['equations']])
+                conn.executemany("INSERT INTO occurrences VALUES (?, ?, ?, ?, ?)",
+                                 [(e['id'], *occurrence) for e in index['equations']
+                                  for occurrence in e['occurrences']])
+            conn.close()
+        else:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+
+        os.replace(tmp_file, index_file)
+
+
+def lookup_equation(index_file: Path, latex: str) -> List[List[Any]]:
+    """Occurrences of an equation in a prebuilt index, matched on its canonical form.
+
+    Args:
+        index_file: JSON or SQLite index written by write_equation_index
+        latex: Equation content, with or without extra whitespace
+
+    Returns:
+        List of [file, line, type, chapter] occurrences (empty if not indexed)
+    """
+    eq_id = equation_id(canonicalize_latex(latex))
+    if index_file.suffix in SQLITE_SUFFIXES:
+        conn = sqlite3.connect(f"file:{index_file}?mode=ro", uri=True)
+        try:
+            rows = conn.execute("SELECT file, line, type, chapter FROM occurrences "
+                                "WHERE equation_id = ? ORDER BY rowid", (eq_id,)).fetchall()
+        finally:
+            conn.close()
+        return [list(row) for row in rows]
+
+    with open(index_file, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    for entry in index['equations']:
+        if entry['id'] == eq_id:
+            return entry['occurrences']
+    return []
+
+
+def _extract_file_worker(docs_dir: str, markdown_file: Path) -> List[Equation]:
+    """Extract one file's equations in a worker process."""
+    return EquationListGenerator(docs_dir).extract_equations_from_file(markdown_file)
+
+
 def main():
     """Main entry point."""
     import sys
 
-    # Get docs directory from command line or use default
-    docs_dir = sys.argv[1] if len(sys.argv) > 1 else "docs"
-
-    # Get output file from command line or use default
-    output_file = None
-    if len(sys.argv) > 2:
-        output_file = Path(sys.argv[2])
+    parser = argparse.ArgumentParser(description="Generate a list of all LaTeX equations in a textbook.")
+    parser.add_argument("docs_dir", nargs="?", default="docs",
+                        help="Docs directory (default: docs)")
+    parser.add_argument("output_file", nargs="?", type=Path, default=None,
+                        help="Output file (default: <docs>/learning-graph/list-equations.md)")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                        help="Number of files to extract in parallel (default: CPU count)")
+    parser.add_argument("--index", type=Path, default=None,
+                        help="Equation index file; .db/.sqlite writes SQLite, anything else JSON "
+                             "(default: <docs>/learning-graph/equation-index.json)")
+    parser.add_argument("--no-index", action="store_true",
+                        help="Only write the markdown list")
+    parser.add_argument("--lookup", metavar="LATEX",
+                        help="Print where an equation occurs, from the existing index, and exit")
+    args = parser.parse_args()
+
+    # Get docs directory and output file from command line or use defaults
+    docs_dir = args.docs_dir
+    output_file = args.output_file
 
     # Check if docs directory exists
     if not Path(docs_dir).exists():
         print(f"❌ Error: Directory '{docs_dir}' does not exist")
         sys.exit(1)
 
-    # Generate report
     generator = EquationListGenerator(docs_dir)
-    generator.generate_report(output_file)
+
+    # Answer "where else is this formula used" from the prebuilt index
+    if args.lookup:
+        index_file = args.index or generator.learning_graph_dir / "equation-index.json"
+        if not index_file.exists():
+            print(f"❌ Error: Index '{index_file}' does not exist; run without --lookup first")
+            sys.exit(1)
+        occurrences = lookup_equation(index_file, args.lookup)
+        print(f"🔎 {canonicalize_latex(args.lookup)}: {len(occurrences)} occurrence(s)")
+        for file_name, line, eq_type, chapter in occurrences:
+            print(f"   - {file_name}:{line} ({eq_type}, chapter {chapter})")
+        return
+
+    # Generate report
+    generator.generate_report(output_file, jobs=args.jobs, index_file=args.index,
+                              write_index=not args.no_index)
 
     print(f"\n✅ Equation list generation v{VERSION} complete!")
 
@@ -0,0 +1,113 @@
+"""
+Single-pass markdown lexer for the book-metrics tools.
+
+Classifies a markdown buffer into spans (fenced code, inline code, display
+math, inline math, links, bare URLs, metric headings and prose) with ONE
+compiled master pattern, and derives every per-file count from that single
+classification:
+
+- words      - word runs in prose, math and link text (not code or URLs)
+- links      - markdown links [text](url), including image links
+- equations  - display ($$...$$) plus inline ($...$) math
+- diagrams   - '#### Diagram:' headings
+- sections   - H2 and H3 headings
+
+Because code is classified first, dollar signs, brackets and headings inside
+code blocks no longer count as equations, links, diagrams or sections. A
+fence closes only on a backtick run of its own length, so a ```` fence may
+contain ``` lines. Math never spans a backtick or a blank line, so a bare
+$HOME in prose cannot pair with a dollar sign inside later code.
+
+Standard library only, Python 3.7+.
+"""
+
+import re
+from typing import Dict, Iterator, Tuple
+
+# Alternation order is the precedence when two spans start at the same
+# position: code beats math, display math beats inline math. The leading
+# lookahead lets the regex engine skip plain prose without trying every
+# branch, and an inline code span may not close on the first backtick of a
+# ``` fence, so a stray backtick in prose cannot swallow a code block. Math
+# excludes backticks (and inline math blank lines) for the same reason.
+TOKEN_RE = re.compile(r"""
+    (?=[`$\[h\#])
+    (?:
+          (?P<fence>(?P<ticks>`{3,}).*?(?<!`)(?P=ticks)(?!`))
+        | (?P<code>`[^`]+`(?!``))
+        | (?P<display>\$\$[^$`]+\$\$)
+        | (?P<inline>\$(?!\d)(?:[^$`\n]|\n(?![ \t]*\n))+\$)
+        | (?P<link>\[[^\]]+\]\([^)]+\))
+        | (?P<url>https?://\S+)
+        | (?P<diagram>^\#\#\#\#\s+(?=Diagram:))
+        | (?P<section>^\#\#\#?(?=\s))
+    )
+""", re.VERBOSE | re.DOTALL | re.MULTILINE)
+
+WORD_RE = re.compile(r'\w+')
+URL_RE = re.compile(r'https?://\S+')
+
+# Span kinds whose text still contributes words
+_WORDY_SPANS = {'display', 'inline', 'link'}
+
+
+def iter_spans(content: str) -> Iterator[Tuple[str, int, int]]:
+    """Yield (kind, start, end) for every span in a markdown buffer.
+
+    Kinds are the TOKEN_RE group names plus 'prose' for the text between
+    classified spans. Spans are contiguous and cover the whole buffer.
+
+    Args:
+        content: Full text of a markdown file
+    """
+    pos = 0
+    for match in TOKEN_RE.finditer(content):
+        start, end = match.span()
+        if start > pos:
+            yield 'prose', pos, start
+        yield match.lastgroup, start, end
+        pos = end
+    if pos < len(content):
+        yield 'prose', pos, len(content)
+
+
+def count_markdown(content: str) -> Dict[str, int]:
+    """Count words, links, equations, diagrams and sections in one pass.
+
+    Args:
+        content: Full text of a markdown file
+
+    Returns:
+        Dict with words, links, equations, display_equations,
+        inline_equations, diagrams and sections
+    """
+    counts = {
+        'fence': 0, 'code': 0, 'display': 0, 'inline': 0,
+        'link': 0, 'url': 0, 'diagram': 0, 'section': 0,
+    }
+    count_words = WORD_RE.findall
+    words = 0
+    pos = 0
+    for match in TOKEN_RE.finditer(content):
+        start = match.start()
+        kind = match.lastgroup
+        counts[kind] += 1
+        if start > pos:
+            words += len(count_words(content, pos, start))
+        if kind in _WORDY_SPANS:
+            span = match.group()
+            if kind == 'link':
+                span = URL_RE.sub('', span)
+            words += len(count_words(span))
+        pos = match.end()
+    words += len(count_words(content, pos))
+
+    return {
+        'words': words,
+        'links': counts['link'],
+        'equations': counts['display'] + counts['inline'],
+        'display_equations': counts['display'],
+        'inline_equations': counts['inline'],
+        'diagrams': counts['diagram'],
+        'sections': counts['section'],
+    }
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark diagram block parsing and UI keyword counting in diagram-report.py.
+
+Reads every docs/chapters/NN-*/index.md of a book and times both steps over
+all chapters, with each chapter's text repeated --copies times (doubling
+from 1) to stand in for a much larger book:
+
+  regex    - the previous approach: the whole-chapter lazy DOTALL pattern
+             ####...(.*?)<details...>(.*?)</details> for blocks, and one
+             uncompiled re.findall per UI keyword for each spec
+  scanner  - DiagramAnalyzer.iter_diagram_blocks (one pass over the lines)
+             and count_ui_elements (one compiled keyword alternation)
+
+Each size is run twice: on the chapters as written ("specs"), and with
+every <details> block removed ("built"), as in a book whose diagrams have all
+been implemented. There every heading makes the lazy pattern scan to the end
+of the chapter before failing, so its time grows with headings x length.
+
+Both must find the same blocks and counts; a mismatch is reported in the
+table.
+
+Usage:
+    python benchmark-diagram-report.py [--chapters-dir docs/chapters] [--max-copies 32]
+"""
+
+import argparse
+import re
+import time
+from importlib.util import spec_from_file_location, module_from_spec
+from pathlib import Path
+
+_this_dir = Path(__file__).resolve().parent
+_spec = spec_from_file_location("diagram_report", _this_dir / "diagram-report.py")
+diagram_report = module_from_spec(_spec)
+_spec.loader.exec_module(diagram_report)
+
+Analyzer = diagram_report.DiagramAnalyzer
+
+LEGACY_HEADER_DETAILS_PATTERN = re.compile(
+    r'####\s+Diagram:\s*([^\n]+)\n(.*?)<details[^>]*>(.*?)</details>', re.DOTALL)
+DETAILS_BLOCK = re.compile(r'<details[^>]*>.*?</details>', re.DOTALL)
+
+
+def regex_blocks(content):
+    """The whole-chapter pattern iter_diagram_blocks replaced."""
+    return [(m.group(1).strip(), m.group(3))
+            for m in LEGACY_HEADER_DETAILS_PATTERN.finditer(content)]
+
+
+def regex_count(content):
+    """The per-keyword findall loop count_ui_elements replaced."""
+    content_lower = content.lower()
+    return sum(len(re.findall(rf'\b{keyword}s?\b', content_lower))
+               for keyword in Analyzer.UI_KEYWORDS)
+
+
+def load_chapters(chapters_dir):
+    """Text of every numbered chapter's index.md."""
+    return [(d / 'index.md').read_text(encoding='utf-8')
+            for d in sorted(chapters_dir.iterdir())
+            if d.is_dir() and re.match(r'^\d{2}-', d.name) and (d / 'index.md').exists()]
+
+
+def run(chapters, find_blocks, count):
+    """Return (block seconds, count seconds, blocks, counts) over all chapters."""
+    start = time.perf_counter()
+    blocks = [block for content in chapters for block in find_blocks(content)]
+    block_time = time.perf_counter() - start
+    start = time.perf_counter()
+    counts = [count(details) for _, details in blocks]
+    return block_time, time.perf_counter() - start, blocks, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chapters-dir", type=Path, default=Path("docs/chapters"))
+    parser.add_argument("--max-copies", type=int, default=32)
+    args = parser.parse_args()
+
+    base = load_chapters(args.chapters_dir)
+    built = [DETAILS_BLOCK.sub('', content) for content in base]
+    analyzer = Analyzer(args.chapters_dir)
+    scanner_blocks = lambda content: list(analyzer.iter_diagram_blocks(content))
+
+    print(f"{len(base)} chapters, {sum(len(c) for c in base) / 1024:.0f}KB\n")
+    print("| Copies | Chapters | Book (MB) | Diagrams | Strategy | Blocks (s) | UI count (s) |")
+    print("|-------:|----------|----------:|---------:|----------|-----------:|-------------:|")
+    copies = 1
+    while copies <= args.max_copies:
+        for label, source in (("specs", base), ("built", built)):
+            chapters = [content * copies for content in source]
+            size_mb = sum(len(c) for c in chapters) / (1024 * 1024)
+            old = run(chapters, regex_blocks, regex_count)
+            new = run(chapters, scanner_blocks, analyzer.count_ui_elements)
+            for name, (block_time, count_time, blocks, _) in (("regex", old), ("scanner", new)):
+                print(f"| {copies} | {label} | {size_mb:.1f} | {len(blocks):,} | {name} "
+                      f"| {block_time:.3f} | {count_time:.3f} |")
+            if old[2] != new[2] or old[3] != new[3]:
+                print(f"| {copies} | {label} | | | ❌ blocks or counts differ | | |")
+        copies *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -27,16 +27,32 @@ Usage:
 
     # Enable verbose output for debugging
     python diagram-report.py -v
+
+    # Write all four outputs (table, details, CSV, HTML) at once
+    python diagram-report.py --format all
+
+Chapters are analyzed on a worker pool (--jobs), and each chapter's extracted
+elements are cached in .cache/diagram-reports/elements.json keyed by the
+SHA-256 of its index.md, so a rerun only re-parses chapters that changed
+(--no-cache to re-parse everything).
 """
 
 import os
 import re
 import csv
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
 from typing import List, Dict, Tuple
 import argparse
 
+DEFAULT_CACHE_FILE = Path('.cache') / 'diagram-reports' / 'elements.json'
+# Bump when extraction changes so cached elements are re-parsed
+CACHE_VERSION = 1
+DIFFICULTIES = ['Easy', 'Medium', 'Hard', 'Very Hard']
+
 
 @dataclass
 class VisualElement:
@@ -70,13 +86,21 @@ class VisualElement:
             'MicroSim Recommendations': '; '.join([f"{name} ({score})" for name, score in self.microsim_recommendations])
         }
 
+    @classmethod
+    def from_cache(cls, data: Dict) -> 'VisualElement':
+        """Rebuild an element stored with dataclasses.asdict in the chapter cache"""
+        data = dict(data)
+        data['microsim_recommendations'] = [tuple(r) for r in data['microsim_recommendations']]
+        return cls(**data)
+
 
 class DiagramAnalyzer:
     """Analyzes markdown files to extract diagram and MicroSim information"""
 
     # Patterns to match - made more flexible
-    # Match #### Diagram: Title followed by <details> block (with optional content in between)
-    HEADER_DETAILS_PATTERN = re.compile(r'####\s+Diagram:\s*([^\n]+)\n(.*?)<details[^>]*>(.*?)</details>', re.DOTALL)
+    # A "#### Diagram: Title" heading line; the <details> block that follows it
+    # (with optional content in between) is found by iter_diagram_blocks
+    HEADER_LINE_PATTERN = re.compile(r'####\s+Diagram:\s*(.*)')
     DETAILS_PATTERN = re.compile(r'<details[^>]*>(.*?)</details>', re.DOTALL)
     SUMMARY_PATTERN = re.compile(r'<summary>(.*?)</summary>', re.DOTALL)
     TYPE_PATTERN = re.compile(r'\*\*Type:\*\*\s*(.*?)(?:\n|\r|\*\*)', re.IGNORECASE)
@@ -91,14 +115,20 @@ class DiagramAnalyzer:
         'slider', 'button', 'dropdown', 'checkbox', 'input', 'toggle',
         'menu', 'control', 'panel', 'display', 'text box', 'selector'
     ]
+    # All keywords (and their plurals) in one alternation, so a spec is scanned once
+    UI_KEYWORD_PATTERN = re.compile(r'\b(?:%s)s?\b' % '|'.join(map(re.escape, UI_KEYWORDS)))
 
     def __init__(self, chapters_dir: str, verbose: bool = False):
         self.chapters_dir = Path(chapters_dir)
         self.elements: List[VisualElement] = []
         self.verbose = verbose
 
-    def analyze_all_chapters(self):
-        """Analyze all chapter directories"""
+    def analyze_all_chapters(self, jobs: int = 1, cache_file: Path = None):
+        """Analyze all chapter directories
+
+        Chapters whose index.md hashes the same as in cache_file reuse their
+        cached elements; the rest are analyzed on a pool of `jobs` processes.
+        """
         # Get all numbered chapter directories (01-*, 02-*, etc.)
         chapter_dirs = sorted([d for d in self.chapters_dir.iterdir()
                               if d.is_dir() and re.match(r'^\d{2}-', d.name)])
@@ -108,15 +138,82 @@ class DiagramAnalyzer:
             for d in chapter_dirs:
                 print(f"  - {d.name}")
 
+        index_files = []
         for chapter_dir in chapter_dirs:
             index_file = chapter_dir / 'index.md'
             if index_file.exists():
-                self.analyze_chapter_file(index_file)
+                index_files.append(index_file)
             elif self.verbose:
                 print(f"  Warning: No index.md in {chapter_dir.name}")
 
-    def analyze_chapter_file(self, file_path: Path):
-        """Analyze a single chapter markdown file"""
+        cache = self.load_cache(cache_file) if cache_file else {}
+        chapter_elements = {}
+        digests = {}
+        pending = []
+        for index_file in index_files:
+            name = index_file.parent.name
+            digests[name] = hashlib.sha256(index_file.read_bytes()).hexdigest()
+            entry = cache.get(name)
+            if entry and entry['sha256'] == digests[name]:
+                chapter_elements[name] = [VisualElement.from_cache(e) for e in entry['elements']]
+                if self.verbose:
+                    print(f"\n  Reusing {len(chapter_elements[name])} cached elements for {name}/index.md")
+            else:
+                pending.append(index_file)
+
+        self.chapters_reused = len(index_files) - len(pending)
+        self.chapters_parsed = len(pending)
+
+        for index_file, (elements, ok) in zip(pending, self.iter_analyzed(pending, jobs)):
+            name = index_file.parent.name
+            chapter_elements[name] = elements
+            if ok:
+                cache[name] = {'sha256': digests[name], 'elements': [asdict(e) for e in elements]}
+            else:
+                cache.pop(name, None)
+
+        # Keep chapter order regardless of which chapters came from the cache
+        for index_file in index_files:
+            self.elements.extend(chapter_elements[index_file.parent.name])
+
+        if cache_file:
+            self.save_cache(cache_file, {name: cache[name] for name in digests if name in cache})
+
+    def iter_analyzed(self, index_files: List[Path], jobs: int):
+        """Yield (elements, ok) for each chapter file, in order, using up to `jobs` processes"""
+        args = [(str(self.chapters_dir), index_file, self.verbose) for index_file in index_files]
+        if jobs <= 1 or len(index_files) <= 1:
+            for arg in args:
+                yield _analyze_chapter_worker(*arg)
+            return
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            yield from pool.map(_analyze_chapter_worker, *zip(*args))
+
+    def load_cache(self, cache_file: Path) -> Dict:
+        """{chapter dir name: {'sha256', 'elements'}} for this chapters dir, or {}"""
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION and data.get('chapters_dir') == str(self.chapters_dir.resolve()):
+                return data['chapters']
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+        return {}
+
+    def save_cache(self, cache_file: Path, chapters: Dict):
+        """Write the chapter cache atomically"""
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'chapters_dir': str(self.chapters_dir.resolve()),
+                           'chapters': chapters}, f)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            print(f"Warning: Could not write cache {cache_file}: {e}")
+
+    def analyze_chapter_file(self, file_path: Path) -> bool:
+        """Analyze a single chapter markdown file; False if it could not be analyzed"""
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
@@ -132,17 +229,14 @@ class DiagramAnalyzer:
                 chapter_name = chapter_dir_name
 
             # Find all header + <details> blocks first (preferred method)
-            header_details_blocks = list(self.HEADER_DETAILS_PATTERN.finditer(content))
+            header_details_blocks = list(self.iter_diagram_blocks(content))
 
             if self.verbose:
                 print(f"\n  Analyzing {file_path.parent.name}/index.md:")
                 print(f"    Found {len(header_details_blocks)} header+details blocks")
 
             elements_found = 0
-            for match in header_details_blocks:
-                header_title = match.group(1).strip()
-                # group(2) is now the content between header and details (iframe, etc.)
-                details_content = match.group(3)  # The actual details content
+            for header_title, details_content in header_details_blocks:
                 element = self.parse_details_block(details_content, chapter_num, chapter_name, chapter_dir_name, header_title)
                 if element:
                     self.elements.append(element)
@@ -152,12 +246,52 @@ class DiagramAnalyzer:
 
             if self.verbose:
                 print(f"    Added {elements_found} elements")
+            return True
 
         except Exception as e:
             print(f"Error analyzing {file_path}: {e}")
             if self.verbose:
                 import traceback
                 traceback.print_exc()
+            return False
+
+    def iter_diagram_blocks(self, content: str):
+        """Yield (header title, details content) for each diagram in one pass over the lines
+
+        Each "#### Diagram:" heading owns the first <details> block after it;
+        anything in between (iframe, etc.) is skipped. A new heading seen
+        before that block opens replaces the pending one.
+        """
+        title = None  # Heading waiting for its <details> block
+        body = None   # Lines of the open <details> block
+        for line in content.splitlines(keepends=True):
+            if body is not None:
+                end = line.find('</details>')
+                if end < 0:
+                    body.append(line)
+                    continue
+                body.append(line[:end])
+                yield title, ''.join(body)
+                title = body = None
+                continue
+
+            if '####' in line:
+                header_match = self.HEADER_LINE_PATTERN.search(line)
+                if header_match:
+                    title = header_match.group(1).strip()
+                    continue
+
+            if title is not None:
+                start = line.find('<details')
+                if start < 0:
+                    continue
+                rest = line[line.find('>', start) + 1:]
+                end = rest.find('</details>')
+                if end >= 0:
+                    yield title, rest[:end]
+                    title = None
+                else:
+                    body = [rest]
 
     def parse_details_block(self, content: str, chapter_num: str, chapter_name: str, chapter_dir: str, header_title: str = None) -> VisualElement:
         """Parse a single <details> block to extract element information"""
@@ -289,14 +423,7 @@ class DiagramAnalyzer:
 
     def count_ui_elements(self, content: str) -> int:
         """Count the number of UI elements mentioned in specifications"""
-        content_lower = content.lower()
-        count = 0
-
-        for keyword in self.UI_KEYWORDS:
-            # Count occurrences of each keyword
-            count += len(re.findall(rf'\b{keyword}s?\b', content_lower))
-
-        return count
+        return len(self.UI_KEYWORD_PATTERN.findall(content.lower()))
 
     def estimate_difficulty(self, content: str, ui_count: int, element_type: str) -> str:
         """Estimate implementation difficulty based on various factors"""
@@ -349,12 +476,48 @@ class DiagramAnalyzer:
             return 'Very Hard'
 
 
+def _analyze_chapter_worker(chapters_dir: str, file_path: Path, verbose: bool):
+    """Analyze one chapter file in a fresh analyzer (process pool entry point)"""
+    analyzer = DiagramAnalyzer(chapters_dir, verbose=verbose)
+    ok = analyzer.analyze_chapter_file(file_path)
+    return analyzer.elements, ok
+
+
 class ReportGenerator:
     """Generates reports in various formats"""
 
     def __init__(self, elements: List[VisualElement]):
         self.elements = elements
 
+        # One pass over the elements for the counts and groupings every format shares
+        self.type_counts = {}
+        self.difficulty_counts = {}
+        self.chapter_counts = {}
+        self.by_chapter = {}
+        for element in elements:
+            self.type_counts[element.element_type] = self.type_counts.get(element.element_type, 0) + 1
+            self.difficulty_counts[element.estimated_difficulty] = self.difficulty_counts.get(element.estimated_difficulty, 0) + 1
+            self.chapter_counts[element.chapter_num] = self.chapter_counts.get(element.chapter_num, 0) + 1
+            key = (element.chapter_num, element.chapter_name, element.chapter_dir)
+            self.by_chapter.setdefault(key, []).append(element)
+        self.sorted_elements = sorted(elements, key=lambda e: (e.chapter_num, e.element_title))
+
+    @staticmethod
+    def chapter_link(element: VisualElement) -> str:
+        """Link to the element's "Diagram:" heading in its chapter"""
+        # MkDocs anchor: lowercase, spaces to hyphens, remove most punctuation except hyphens
+        anchor_text = f"diagram-{element.element_title}"
+        anchor = anchor_text.lower().replace(' ', '-').replace('/', '-').replace('(', '').replace(')', '').replace(',', '').replace('.', '').replace(':', '').replace("'", '')
+        # Clean up multiple consecutive hyphens
+        while '--' in anchor:
+            anchor = anchor.replace('--', '-')
+        return f"../chapters/{element.chapter_dir}/index.md#{anchor}"
+
+    @staticmethod
+    def microsim_cell(element: VisualElement) -> str:
+        """MicroSim recommendations with generator name and score on different lines"""
+        return '<br>'.join([f"{name}<br>({score})" for name, score in element.microsim_recommendations])
+
     def generate_markdown_table(self) -> str:
         """Generate Markdown table report"""
         lines = [
@@ -366,20 +529,15 @@ class ReportGenerator:
             "# Diagram and MicroSim Table",
             "",
             f"**Total Visual Elements:** {len(self.elements)}",
-            f"**Diagrams:** {sum(1 for e in self.elements if e.element_type == 'diagram')}",
-            f"**MicroSims:** {sum(1 for e in self.elements if e.element_type == 'microsim')}",
+            f"**Diagrams:** {self.type_counts.get('diagram', 0)}",
+            f"**MicroSims:** {self.type_counts.get('microsim', 0)}",
             "",
             "## Summary by Difficulty",
             "",
         ]
 
-        # Count by difficulty
-        difficulty_counts = {}
-        for element in self.elements:
-            difficulty_counts[element.estimated_difficulty] = difficulty_counts.get(element.estimated_difficulty, 0) + 1
-
-        for difficulty in ['Easy', 'Medium', 'Hard', 'Very Hard']:
-            count = difficulty_counts.get(difficulty, 0)
+        for difficulty in DIFFICULTIES:
+            count = self.difficulty_counts.get(difficulty, 0)
             lines.append(f"- **{difficulty}:** {count}")
 
         lines.extend([
@@ -390,24 +548,12 @@ class ReportGenerator:
             "|---------|---------------|--------|------|--------------|-------------|------------|-----------------------|"
         ])
 
-        for element in sorted(self.elements, key=lambda e: (e.chapter_num, e.element_title)):
+        for element in self.sorted_elements:
             bloom_str = ', '.join(element.bloom_levels)
             # Create link to chapter section with "Diagram:" prefix
-            # MkDocs anchor: lowercase, spaces to hyphens, remove most punctuation except hyphens
-            anchor_text = f"diagram-{element.element_title}"
-            anchor = anchor_text.lower().replace(' ', '-').replace('/', '-').replace('(', '').replace(')', '').replace(',', '').replace('.', '').replace(':', '').replace("'", '')
-            # Clean up multiple consecutive hyphens
-            while '--' in anchor:
-                anchor = anchor.replace('--', '-')
-            chapter_link = f"../chapters/{element.chapter_dir}/index.md#{anchor}"
-            element_link = f"[{element.element_title}]({chapter_link})"
+            element_link = f"[{element.element_title}]({self.chapter_link(element)})"
             status_display = element.status if element.status else ""
-
-            # Format MicroSim recommendations with generator name and score on different lines
-            if element.microsim_recommendations:
-                microsim_str = '<br>'.join([f"{name}<br>({score})" for name, score in element.microsim_recommendations])
-            else:
-                microsim_str = ""
+            microsim_str = self.microsim_cell(element)
 
             lines.append(
                 f"| {int(element.chapter_num)} | {element_link} | "
@@ -423,23 +569,15 @@ class ReportGenerator:
             "# Diagram and MicroSim Details",
             "",
             f"**Total Visual Elements:** {len(self.elements)}",
-            f"**Diagrams:** {sum(1 for e in self.elements if e.element_type == 'diagram')}",
-            f"**MicroSims:** {sum(1 for e in self.elements if e.element_type == 'microsim')}",
+            f"**Diagrams:** {self.type_counts.get('diagram', 0)}",
+            f"**MicroSims:** {self.type_counts.get('microsim', 0)}",
             ""
         ]
 
-        # Group by chapter
-        by_chapter = {}
-        for element in self.elements:
-            key = (element.chapter_num, element.chapter_name, element.chapter_dir)
-            if key not in by_chapter:
-                by_chapter[key] = []
-            by_chapter[key].append(element)
-
         # Sort chapters by chapter number
-        for chapter_key in sorted(by_chapter.keys(), key=lambda x: x[0]):
+        for chapter_key in sorted(self.by_chapter.keys(), key=lambda x: x[0]):
             chapter_num, chapter_name, chapter_dir = chapter_key
-            elements = by_chapter[chapter_key]
+            elements = self.by_chapter[chapter_key]
 
             lines.extend([
                 f"## Chapter {int(chapter_num)}: {chapter_name}",
@@ -450,14 +588,7 @@ class ReportGenerator:
 
             for element in sorted(elements, key=lambda e: e.element_title):
                 # Create link to chapter section
-                # MkDocs anchor: lowercase, spaces to hyphens, remove most punctuation except hyphens
-                anchor_text = f"diagram-{element.element_title}"
-                anchor = anchor_text.lower().replace(' ', '-').replace('/', '-').replace('(', '').replace(')', '').replace(',', '').replace('.', '').replace(':', '').replace("'", '')
-                # Clean up multiple consecutive hyphens
-                while '--' in anchor:
-                    anchor = anchor.replace('--', '-')
-                chapter_link = f"../chapters/{element.chapter_dir}/index.md#{anchor}"
-                lines.append(f"### [{element.element_title}]({chapter_link})")
+                lines.append(f"### [{element.element_title}]({self.chapter_link(element)})")
                 if element.status:
                     lines.append(f"- **Status:** {element.status}")
                 lines.append(f"- **Type:** {element.element_type.title()}")
@@ -483,7 +614,7 @@ class ReportGenerator:
             writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
 
             writer.writeheader()
-            for element in sorted(self.elements, key=lambda e: (e.chapter_num, e.element_title)):
+            for element in self.sorted_elements:
                 writer.writerow(element.to_dict())
 
     def generate_html(self) -> str:
@@ -580,12 +711,9 @@ class ReportGenerator:
 
         # Calculate statistics
         total = len(self.elements)
-        diagrams = sum(1 for e in self.elements if e.element_type == 'diagram')
-        microsims = sum(1 for e in self.elements if e.element_type == 'microsim')
-
-        difficulty_counts = {}
-        for element in self.elements:
-            difficulty_counts[element.estimated_difficulty] = difficulty_counts.get(element.estimated_difficulty, 0) + 1
+        diagrams = self.type_counts.get('diagram', 0)
+        microsims = self.type_counts.get('microsim', 0)
+        difficulty_counts = self.difficulty_counts
 
         html += f"""
             <div class="stat-card">
@@ -635,16 +763,11 @@ class ReportGenerator:
         <tbody>
 """
 
-        for element in sorted(self.elements, key=lambda e: (e.chapter_num, e.element_title)):
+        for element in self.sorted_elements:
             bloom_str = ', '.join(element.bloom_levels)
             difficulty_class = f"difficulty-{element.estimated_difficulty.lower().replace(' ', '-')}"
             type_class = f"type-{element.element_type}"
-
-            # Format MicroSim recommendations for HTML
-            if element.microsim_recommendations:
-                microsim_html = '<br>'.join([f"{name}<br>({score})" for name, score in element.microsim_recommendations])
-            else:
-                microsim_html = ""
+            microsim_html = self.microsim_cell(element)
 
             html += f"""
             <tr class="{type_class}">
@@ -680,9 +803,9 @@ def main():
     )
     parser.add_argument(
         '--format',
-        choices=['markdown', 'csv', 'html'],
+        choices=['markdown', 'csv', 'html', 'all'],
         default='markdown',
-        help='Output format (default: markdown)'
+        help='Output format; all writes the markdown table and details, CSV, and HTML (default: markdown)'
     )
     parser.add_argument(
         '--chapters-dir',
@@ -694,6 +817,17 @@ def main():
         action='store_true',
         help='Enable verbose output for debugging'
     )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Number of chapters to analyze in parallel (default: CPU count)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help=f'Re-parse every chapter instead of reusing {DEFAULT_CACHE_FILE}'
+    )
 
     args = parser.parse_args()
 
@@ -744,14 +878,16 @@ def main():
 
     # Analyze chapters
     analyzer = DiagramAnalyzer(str(chapters_dir), verbose=args.verbose)
-    analyzer.analyze_all_chapters()
+    cache_file = None if args.no_cache else cwd / DEFAULT_CACHE_FILE
+    analyzer.analyze_all_chapters(jobs=args.jobs, cache_file=cache_file)
 
-    print(f"Found {len(analyzer.elements)} visual elements")
+    print(f"Found {len(analyzer.elements)} visual elements "
+          f"({analyzer.chapters_parsed} chapters parsed, {analyzer.chapters_reused} reused from cache)")
 
     # Generate report
     generator = ReportGenerator(analyzer.elements)
 
-    if args.format == 'markdown':
+    if args.format in ('markdown', 'all'):
         # Generate table report
         table_content = generator.generate_markdown_table()
         table_output = output_dir / 'diagram-table.md'
@@ -766,12 +902,12 @@ def main():
             f.write(details_content)
         print(f"Details report saved to: {details_output}")
 
-    elif args.format == 'csv':
+    if args.format in ('csv', 'all'):
         csv_output = output_dir / 'diagrams.csv'
         generator.generate_csv(str(csv_output))
         print(f"CSV report saved to: {csv_output}")
 
-    elif args.format == 'html':
+    if args.format in ('html', 'all'):
         html_output = output_dir / 'diagrams.html'
         content = generator.generate_html()
         with open(html_output, 'w', encoding='utf-8') as f:
@@ -781,26 +917,17 @@ def main():
     # Print summary to console
     print("\n=== SUMMARY ===")
     print(f"Total visual elements: {len(analyzer.elements)}")
-    print(f"Diagrams: {sum(1 for e in analyzer.elements if e.element_type == 'diagram')}")
-    print(f"MicroSims: {sum(1 for e in analyzer.elements if e.element_type == 'microsim')}")
+    print(f"Diagrams: {generator.type_counts.get('diagram', 0)}")
+    print(f"MicroSims: {generator.type_counts.get('microsim', 0)}")
 
     print("\nBy Difficulty:")
-    difficulty_counts = {}
-    for element in analyzer.elements:
-        difficulty_counts[element.estimated_difficulty] = difficulty_counts.get(element.estimated_difficulty, 0) + 1
-
-    for difficulty in ['Easy', 'Medium', 'Hard', 'Very Hard']:
-        count = difficulty_counts.get(difficulty, 0)
+    for difficulty in DIFFICULTIES:
+        count = generator.difficulty_counts.get(difficulty, 0)
         print(f"  {difficulty}: {count}")
 
     print("\nBy Chapter:")
-    by_chapter = {}
-    for element in analyzer.elements:
-        key = element.chapter_num
-        by_chapter[key] = by_chapter.get(key, 0) + 1
-
-    for chapter_num in sorted(by_chapter.keys()):
-        print(f"  Chapter {chapter_num}: {by_chapter[chapter_num]} elements")
+    for chapter_num in sorted(generator.chapter_counts.keys()):
+        print(f"  Chapter {chapter_num}: {generator.chapter_counts[chapter_num]} elements")
 
     return 0
 
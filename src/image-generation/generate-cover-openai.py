@@ -27,21 +27,43 @@ Optional:
   --text-model gpt-4o-mini
   --image-model gpt-image-1.5
   --prompt-only  (output the image prompt without generating the image)
+  --no-cache / --refresh-cache / --cache-dir  (shared prompt-hash image cache,
+      see skills/book-media-generator/scripts/story/prompt_cache.py; hits are
+      logged to logs/image-generation-usage.jsonl)
+  --refresh-plan / --plan-cache-dir  (cover plans are cached in
+      .cache/generate-cover/plans/, keyed by title, description and text model)
+  --offline  (use only cached plans and images; fail fast on a miss)
 """
 
 from __future__ import annotations
 
 import argparse
-import base64
+import hashlib
 import json
 import os
 import re
+import sys
 from dataclasses import dataclass
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
 from openai import OpenAI
 from PIL import Image
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# The prompt cache lives with the story image generator in the book-media skill
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir,
+                                "skills", "book-media-generator", "scripts", "story"))
+from openai_images import cached_base_image_png
+from prompt_cache import PromptImageCache
+
+
+# Art-direction plans from build_cover_plan, one JSON file per hash of the
+# inputs (title, description, text model, instructions). Project-local, like
+# the other .cache/ tool caches: the inputs are this book's own files.
+PLAN_CACHE_DIR = os.path.join(".cache", "generate-cover", "plans")
+PLAN_CACHE_VERSION = 1
+
 
 # ----------------------------
 # Helpers
@@ -106,6 +128,30 @@ def center_crop_to_aspect(img: Image.Image, target_aspect: float) -> Image.Image
 # Prompting (Responses API)
 # ----------------------------
 
+COVER_PLAN_SCHEMA = {
+    "title": "string",
+    "theme_keywords": ["string"],
+    "motifs": ["string"],
+    "color_palette": ["string"],
+    "composition_notes": "string",
+    "image_prompt": "string",
+}
+
+COVER_PLAN_INSTRUCTIONS = (
+    "You are a senior book-cover designer and prompt engineer.\n"
+    "Given a course description, produce a strong art direction plan AND a final image prompt.\n"
+    "Hard constraints:\n"
+    "- The cover is a wide-landscape social preview image.\n"
+    "- The TITLE text must be centered, large, crisp, high-contrast, readable.\n"
+    "- Surround the title with a montage/collage of relevant visual elements derived from the description.\n"
+    "- Avoid any other readable text besides the title.\n"
+    "- No logos, no watermarks, no trademarks.\n"
+    "- Keep it tasteful, modern, and not cluttered.\n"
+    "Return ONLY valid JSON with keys exactly matching this schema:\n"
+    f"{json.dumps(COVER_PLAN_SCHEMA, indent=2)}\n"
+)
+
+
 @dataclass
 class CoverPlan:
     title: str
@@ -129,29 +175,6 @@ def build_cover_plan(
       - composition notes
       - final, production-ready image prompt
     """
-    schema_hint = {
-        "title": "string",
-        "theme_keywords": ["string"],
-        "motifs": ["string"],
-        "color_palette": ["string"],
-        "composition_notes": "string",
-        "image_prompt": "string",
-    }
-
-    instructions = (
-        "You are a senior book-cover designer and prompt engineer.\n"
-        "Given a course description, produce a strong art direction plan AND a final image prompt.\n"
-        "Hard constraints:\n"
-        "- The cover is a wide-landscape social preview image.\n"
-        "- The TITLE text must be centered, large, crisp, high-contrast, readable.\n"
-        "- Surround the title with a montage/collage of relevant visual elements derived from the description.\n"
-        "- Avoid any other readable text besides the title.\n"
-        "- No logos, no watermarks, no trademarks.\n"
-        "- Keep it tasteful, modern, and not cluttered.\n"
-        "Return ONLY valid JSON with keys exactly matching this schema:\n"
-        f"{json.dumps(schema_hint, indent=2)}\n"
-    )
-
     user_input = (
         f"TITLE:\n{title}\n\n"
         "COURSE DESCRIPTION:\n"
@@ -160,7 +183,7 @@ def build_cover_plan(
 
     resp = client.responses.create(
         model=text_model,
-        instructions=instructions,
+        instructions=COVER_PLAN_INSTRUCTIONS,
         input=user_input,
     )
 
@@ -193,6 +216,42 @@ def build_cover_plan(
     )
 
 
+def cover_plan_key(description_text: str, title: str, text_model: str) -> str:
+    """Hash of everything build_cover_plan's output depends on."""
+    payload = json.dumps(
+        [PLAN_CACHE_VERSION, text_model, COVER_PLAN_INSTRUCTIONS, title, description_text],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_cached_cover_plan(cache_dir: str, key: str) -> Optional[CoverPlan]:
+    """The CoverPlan stored under key, or None if missing or unreadable."""
+    try:
+        with open(os.path.join(cache_dir, f"{key}.json"), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != PLAN_CACHE_VERSION:
+            return None
+        return CoverPlan(**data["plan"])
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def save_cover_plan(cache_dir: str, key: str, plan: CoverPlan, text_model: str) -> None:
+    """Store plan under key (atomically)."""
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"{key}.json")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "version": PLAN_CACHE_VERSION,
+            "text_model": text_model,
+            "created": datetime.now(timezone.utc).isoformat(),
+            "plan": plan.__dict__,
+        }, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
 # ----------------------------
 # Local Prompt Generation (No API)
 # ----------------------------
@@ -269,35 +328,6 @@ def build_local_cover_plan(
     )
 
 
-# ----------------------------
-# Image Generation (Images API)
-# ----------------------------
-
-def generate_base_image_png(
-    client: OpenAI,
-    image_model: str,
-    prompt: str,
-    size: str = "1536x1024",  # GPT Image landscape option
-    quality: str = "high",
-) -> bytes:
-    """
-    Generate an image via Images API (GPT Image). Returns PNG bytes.
-    Note: GPT Image models return base64-encoded image bytes in b64_json.
-    """
-    img = client.images.generate(
-        model=image_model,
-        prompt=prompt,
-        size=size,
-        quality=quality,
-        # For GPT Image, output_format is supported (png/jpeg/webp). Default is png.
-        output_format="png",
-        n=1,
-    )
-
-    b64 = img.data[0].b64_json
-    return base64.b64decode(b64)
-
-
 def postprocess_to_og(
     png_bytes: bytes,
     out_path: str,
@@ -340,6 +370,20 @@ def main() -> None:
     parser.add_argument("--open-browser", action="store_true",
                         help="Open ChatGPT in browser and paste the prompt automatically. "
                              "Implies --local-prompt.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Neither read nor write the shared prompt-hash image cache.")
+    parser.add_argument("--refresh-cache", action="store_true",
+                        help="Regenerate even if this prompt is cached, replacing the cache entry.")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Prompt cache directory (default: $BK_GENERATED_IMAGE_CACHE "
+                             "or ~/.cache/bk-generated-images).")
+    parser.add_argument("--offline", action="store_true",
+                        help="Make no network calls: use the cached cover plan and cached image, "
+                             "and fail immediately if either is missing.")
+    parser.add_argument("--refresh-plan", action="store_true",
+                        help="Ask the text model for a new cover plan even if one is cached.")
+    parser.add_argument("--plan-cache-dir", default=PLAN_CACHE_DIR,
+                        help=f"Cover plan cache directory (default: {PLAN_CACHE_DIR}).")
     args = parser.parse_args()
 
     description_text = read_text_file(args.desc)
@@ -349,6 +393,8 @@ def main() -> None:
     if not out_path:
         out_path = f"{safe_filename(title)}_og_1200x630.png"
 
+    client = None
+
     # Handle --open-browser (implies --local-prompt)
     if args.open_browser:
         args.local_prompt = True
@@ -363,13 +409,24 @@ def main() -> None:
         # Force prompt-only mode when using local prompt
         args.prompt_only = True
     else:
-        client = OpenAI()  # reads OPENAI_API_KEY from environment
-        plan = build_cover_plan(
-            client=client,
-            description_text=description_text,
-            title=title,
-            text_model=args.text_model,
-        )
+        # Reuse the plan from an earlier run with the same title, description
+        # and text model, so re-renders skip the planning round-trip
+        plan_key = cover_plan_key(description_text, title, args.text_model)
+        plan = None if args.refresh_plan else load_cached_cover_plan(args.plan_cache_dir, plan_key)
+        if plan is not None:
+            print(f"Cover plan from cache ({args.text_model}, {plan_key[:12]})")
+        elif args.offline:
+            sys.exit(f"ERROR: --offline: no cached cover plan for this title, description "
+                     f"and {args.text_model}. Run once without --offline to create it.")
+        else:
+            client = OpenAI()  # reads OPENAI_API_KEY from environment
+            plan = build_cover_plan(
+                client=client,
+                description_text=description_text,
+                title=title,
+                text_model=args.text_model,
+            )
+            save_cover_plan(args.plan_cache_dir, plan_key, plan, args.text_model)
 
     if args.debug_json:
         with open(args.debug_json, "w", encoding="utf-8") as f:
@@ -425,14 +482,23 @@ def main() -> None:
             print("5. Recommended size: 1200x630 pixels (1.91:1 aspect ratio)")
         return
 
-    # 2) Generate base landscape image (GPT Image sizes are fixed; we crop later)
-    base_png = generate_base_image_png(
-        client=client,
-        image_model=args.image_model,
-        prompt=plan.image_prompt,
-        size="1536x1024",
-        quality="high",
-    )
+    # 2) Generate base landscape image (GPT Image sizes are fixed; we crop later) — or reuse the cached
+    # image if this exact prompt was rendered before
+    cache = PromptImageCache(args.cache_dir, enabled=not args.no_cache,
+                             refresh=args.refresh_cache)
+    try:
+        base_png = cached_base_image_png(
+            client=client,
+            cache=cache,
+            image_model=args.image_model,
+            prompt=plan.image_prompt,
+            out_path=out_path,
+            size="1536x1024",
+            quality="high",
+            offline=args.offline,
+        )
+    except RuntimeError as e:
+        sys.exit(f"ERROR: {e}")
 
     # 3) Crop to 1.91:1 and resize to 1200x630 (OG)
     postprocess_to_og(
@@ -446,6 +512,7 @@ def main() -> None:
     print(f"Title: {plan.title}")
     if plan.theme_keywords:
         print(f"Keywords: {', '.join(plan.theme_keywords[:10])}")
+    print(cache.summary())
 
 
 if __name__ == "__main__":
@@ -10,6 +10,7 @@
 #   generate-cover.sh --prompt-only   # Generate prompt via API (requires billing)
 #   generate-cover.sh --local-prompt  # Generate prompt locally (NO API needed)
 #   generate-cover.sh --open-browser  # Generate prompt and open ChatGPT to paste it
+#   generate-cover.sh --offline       # Re-render from the cached plan and image (no network)
 
 # Get the directory where this script lives (for finding the Python script)
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
@@ -26,8 +27,8 @@ echo ""
 echo "Project directory: $PROJECT_ROOT"
 echo ""
 
-# Check for OpenAI API key
-if [ -z "$OPENAI_API_KEY" ]; then
+# Check for OpenAI API key (not needed with --offline, which only uses cached plans and images)
+if [ -z "$OPENAI_API_KEY" ] && [[ " $* " != *" --offline "* ]]; then
     echo "ERROR: OPENAI_API_KEY environment variable is not set"
     echo "   Set it with: export OPENAI_API_KEY='your-key-here'"
     exit 1
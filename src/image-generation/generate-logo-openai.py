@@ -23,21 +23,31 @@ Optional:
   --out logo.png
   --text-model gpt-4o-mini
   --image-model gpt-image-1.5
+  --no-cache / --refresh-cache / --cache-dir  (shared prompt-hash image cache,
+      see skills/book-media-generator/scripts/story/prompt_cache.py; hits are
+      logged to logs/image-generation-usage.jsonl)
 """
 
 from __future__ import annotations
 
 import argparse
-import base64
 import json
 import os
 import re
+import sys
 from dataclasses import dataclass
 from typing import List, Optional, Tuple
 
 from openai import OpenAI
 from PIL import Image
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# The prompt cache lives with the story image generator in the book-media skill
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir,
+                                "skills", "book-media-generator", "scripts", "story"))
+from openai_images import cached_base_image_png
+from prompt_cache import PromptImageCache
+
 
 # ----------------------------
 # Theme Colors from mkdocs.yml
@@ -172,33 +182,6 @@ Return ONLY valid JSON with keys exactly matching this schema:
     )
 
 
-# ----------------------------
-# Image Generation (Images API)
-# ----------------------------
-
-def generate_base_image_png(
-    client: OpenAI,
-    image_model: str,
-    prompt: str,
-    size: str = "1024x1024",  # Square for logo
-    quality: str = "high",
-) -> bytes:
-    """
-    Generate an image via Images API (GPT Image). Returns PNG bytes.
-    """
-    img = client.images.generate(
-        model=image_model,
-        prompt=prompt,
-        size=size,
-        quality=quality,
-        output_format="png",
-        n=1,
-    )
-
-    b64 = img.data[0].b64_json
-    return base64.b64decode(b64)
-
-
 def postprocess_logo(
     png_bytes: bytes,
     out_path: str,
@@ -230,6 +213,13 @@ def main() -> None:
                         help="Image model (default: gpt-image-1.5).")
     parser.add_argument("--debug-json", default=None,
                         help="Optional path to write the intermediate logo-plan JSON.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Neither read nor write the shared prompt-hash image cache.")
+    parser.add_argument("--refresh-cache", action="store_true",
+                        help="Regenerate even if this prompt is cached, replacing the cache entry.")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Prompt cache directory (default: $BK_GENERATED_IMAGE_CACHE "
+                             "or ~/.cache/bk-generated-images).")
     args = parser.parse_args()
 
     description_text = read_text_file(args.desc)
@@ -260,11 +250,16 @@ def main() -> None:
     print(f"Icon concept: {plan.icon_concept}")
     print(f"Generating image...")
 
-    # 2) Generate square logo image
-    base_png = generate_base_image_png(
+    # 2) Generate square logo image — or reuse the cached
+    # image if this exact prompt was rendered before
+    cache = PromptImageCache(args.cache_dir, enabled=not args.no_cache,
+                             refresh=args.refresh_cache)
+    base_png = cached_base_image_png(
         client=client,
+        cache=cache,
         image_model=args.image_model,
         prompt=plan.image_prompt,
+        out_path=out_path,
         size="1024x1024",
         quality="high",
     )
@@ -278,6 +273,7 @@ def main() -> None:
 
     print(f"Wrote: {out_path}")
     print(f"Size: {args.size}x{args.size}")
+    print(cache.summary())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+GPT Image calls, usage logging and prompt caching shared by
+generate-cover-openai.py and generate-logo-openai.py.
+
+cached_base_image_png is the one entry point both generators use: it looks
+the prompt up in the shared PromptImageCache (prompt_cache.py, which lives in
+skills/book-media-generator/scripts/story/), calls the Images API only on a
+miss, and appends one record per image — generated or served from the
+cache — to logs/image-generation-usage.jsonl, the audit log the story image
+generator writes too.
+
+Usage:
+    from openai_images import cached_base_image_png
+    from prompt_cache import PromptImageCache
+
+    cache = PromptImageCache()
+    png_bytes = cached_base_image_png(None, cache, "gpt-image-1.5", prompt,
+                                      "cover.png", size="1536x1024")
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from openai import OpenAI
+
+# The prompt cache lives with the story image generator in the book-media skill
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir,
+                                "skills", "book-media-generator", "scripts", "story"))
+from prompt_cache import PromptImageCache
+
+
+# Machine-readable audit log shared with the story image generator: one JSONL
+# record per image, including images served from the prompt cache.
+USAGE_LOG = os.path.join("logs", "image-generation-usage.jsonl")
+
+# GPT Image pricing (USD per 1M tokens: text input, image output) as of
+# early 2026, for the cost estimate in the usage log.
+# Source: https://platform.openai.com/docs/pricing
+IMAGE_PRICES_PER_1M = {
+    "gpt-image-1.5": (5.00, 32.00),
+    "gpt-image-1": (5.00, 40.00),
+    "gpt-image-1-mini": (2.00, 8.00),
+}
+
+
+def generate_base_image_png(
+    client: OpenAI,
+    image_model: str,
+    prompt: str,
+    size: str,
+    quality: str = "high",
+) -> Tuple[bytes, Dict[str, int]]:
+    """
+    Generate an image via Images API (GPT Image). Returns (PNG bytes, token usage).
+    Note: GPT Image models return base64-encoded image bytes in b64_json.
+    """
+    img = client.images.generate(
+        model=image_model,
+        prompt=prompt,
+        size=size,
+        quality=quality,
+        # For GPT Image, output_format is supported (png/jpeg/webp). Default is png.
+        output_format="png",
+        n=1,
+    )
+
+    b64 = img.data[0].b64_json
+    usage = getattr(img, "usage", None)
+    tokens = {
+        name: getattr(usage, name, 0) or 0
+        for name in ("input_tokens", "output_tokens", "total_tokens")
+    }
+    return base64.b64decode(b64), tokens
+
+
+def append_usage(record: Dict[str, Any]) -> None:
+    os.makedirs(os.path.dirname(USAGE_LOG), exist_ok=True)
+    with open(USAGE_LOG, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def log_image_usage(
+    out_path: str,
+    image_model: str,
+    size: str,
+    quality: str,
+    usage: Dict[str, int],
+) -> Dict[str, Any]:
+    """
+    Append one record for a generated image to logs/image-generation-usage.jsonl,
+    with tokens from the Images API response and the estimated cost
+    (0 for models missing from IMAGE_PRICES_PER_1M).
+    """
+    price_in, price_out = IMAGE_PRICES_PER_1M.get(image_model, (0.0, 0.0))
+    input_tokens = usage.get("input_tokens", 0)
+    output_tokens = usage.get("output_tokens", 0)
+    record = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "file": out_path,
+        "model": image_model,
+        "size": size,
+        "quality": quality,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": usage.get("total_tokens", 0) or (input_tokens + output_tokens),
+        "paid_tier_cost_usd": round(
+            input_tokens * price_in / 1_000_000 + output_tokens * price_out / 1_000_000, 6),
+    }
+    append_usage(record)
+    return record
+
+
+def log_cache_hit(
+    out_path: str,
+    image_model: str,
+    size: str,
+    quality: str,
+    meta: Dict[str, Any],
+    key: str,
+) -> Dict[str, Any]:
+    """Append the usage record for an image served from the prompt cache."""
+    record = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "file": out_path,
+        "model": image_model,
+        "size": size,
+        "quality": quality,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "total_tokens": 0,
+        "paid_tier_cost_usd": 0.0,
+        "cache_hit": True,
+        "saved_cost_usd": round(float(meta.get("cost_usd") or 0.0), 6),
+        "cache_key": key,
+    }
+    append_usage(record)
+    return record
+
+
+def cached_base_image_png(
+    client: Optional[OpenAI],
+    cache: PromptImageCache,
+    image_model: str,
+    prompt: str,
+    out_path: str,
+    size: str,
+    quality: str = "high",
+    offline: bool = False,
+) -> bytes:
+    """
+    generate_base_image_png through the shared prompt cache. The raw API image
+    is cached (before any crop/resize), keyed by model, prompt, size and
+    quality, so re-rendering the same prompt costs nothing. Either way one
+    record is appended to the usage log.
+
+    The OpenAI client is only created (if None) on a cache miss; with
+    offline=True a miss raises RuntimeError instead.
+    """
+    key = cache.key(image_model, prompt, {"size": size, "quality": quality})
+    hit = cache.get(key)
+    if hit is not None:
+        png_bytes, meta = hit
+        record = log_cache_hit(out_path, image_model, size, quality, meta, key)
+        print(f"Image from prompt cache (saved ${record['saved_cost_usd']:.4f})")
+        return png_bytes
+
+    if offline:
+        raise RuntimeError(
+            f"--offline: no cached {image_model} {size} image for this prompt. "
+            "Run once without --offline to generate it."
+        )
+    if client is None:
+        client = OpenAI()  # reads OPENAI_API_KEY from environment
+    png_bytes, usage = generate_base_image_png(
+        client=client,
+        image_model=image_model,
+        prompt=prompt,
+        size=size,
+        quality=quality,
+    )
+    record = log_image_usage(out_path, image_model, size, quality, usage)
+    cache.put(key, png_bytes, {
+        "model": image_model,
+        "params": {"size": size, "quality": quality},
+        "cost_usd": record["paid_tier_cost_usd"],
+        "input_tokens": record["input_tokens"],
+        "output_tokens": record["output_tokens"],
+        "prompt_excerpt": " ".join(prompt.split())[:160],
+    })
+    print(f"Tokens in/out: {record['input_tokens']}/{record['output_tokens']}  "
+          f"estimated cost: ${record['paid_tier_cost_usd']:.4f}")
+    return png_bytes
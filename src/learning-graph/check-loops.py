@@ -3,102 +3,95 @@
 Check for loops (cycles) in a vis-network learning graph JSON file.
 
 This script reads a learning graph in vis-network JSON format and detects
-any cycles in the directed graph. If cycles are found, it reports the
-nodes involved in each cycle.
+any cycles in the directed graph. Each strongly connected component that
+contains a cycle is reported once, with a shortest witness loop through it.
+
+The search is learning_graph.find_cycles(), an iterative colour-marking DFS
+(Tarjan's SCC algorithm) over the compiled CSR graph shared with
+analyze-graph.py, so it runs in O(V+E) and cannot hit Python's recursion
+limit on long prerequisite chains.
 
 Usage:
-    python check-loops.py <path-to-learning-graph.json>
+    python check-loops.py <path-to-learning-graph.json> [--json]
+
+Exit codes:
+    0 - No loops found
+    1 - Loops found or the file could not be read
 """
 
+import argparse
 import json
 import sys
-from collections import defaultdict
-
-
-def load_graph(filepath):
-    """Load a vis-network JSON file and return nodes and edges."""
-    with open(filepath, 'r') as f:
-        data = json.load(f)
-
-    nodes = {node['id']: node.get('label', str(node['id'])) for node in data.get('nodes', [])}
-    edges = data.get('edges', [])
-
-    return nodes, edges
-
-
-def build_adjacency_list(edges):
-    """Build an adjacency list from edges."""
-    adj = defaultdict(list)
-    for edge in edges:
-        from_node = edge['from']
-        to_node = edge['to']
-        adj[from_node].append(to_node)
-    return adj
-
-
-def find_cycles(nodes, adj):
-    """
-    Find all cycles in a directed graph using DFS.
-
-    Returns a list of cycles, where each cycle is a list of node IDs.
-    """
-    WHITE = 0  # Not visited
-    GRAY = 1   # Currently in recursion stack
-    BLACK = 2  # Completely processed
-
-    color = {node_id: WHITE for node_id in nodes}
-    parent = {node_id: None for node_id in nodes}
-    cycles = []
-
-    def dfs(node, path):
-        color[node] = GRAY
-        path.append(node)
-
-        for neighbor in adj.get(node, []):
-            if neighbor not in color:
-                # Node exists in edges but not in nodes list
-                continue
-
-            if color[neighbor] == GRAY:
-                # Found a cycle - extract the cycle from path
-                cycle_start_idx = path.index(neighbor)
-                cycle = path[cycle_start_idx:]
-                cycles.append(cycle)
-            elif color[neighbor] == WHITE:
-                dfs(neighbor, path)
-
-        path.pop()
-        color[node] = BLACK
-
-    for node_id in nodes:
-        if color[node_id] == WHITE:
-            dfs(node_id, [])
-
-    return cycles
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# The compiled learning-graph model lives with the learning-graph skill
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "skills" / "learning-graph-generator"))
+from learning_graph import LearningGraph, find_cycles, load_learning_graph
+
+def build_report(filepath: str, graph: LearningGraph, cycles: List[List[int]],
+                 load_seconds: float, search_seconds: float) -> Dict[str, Any]:
+    """Build the machine-readable result written by --json."""
+    return {
+        'file': filepath,
+        'nodes': graph.num_concepts,
+        'edges': graph.num_edges,
+        'loopCount': len(cycles),
+        'loops': [
+            {
+                'ids': [graph.ids[i] for i in cycle],
+                'labels': [graph.labels[i] for i in cycle],
+            }
+            for cycle in cycles
+        ],
+        'timing': {
+            'loadSeconds': round(load_seconds, 4),
+            'searchSeconds': round(search_seconds, 4),
+        },
+    }
+
+
+def fail(message: str, as_json: bool, filepath: str):
+    """Report a fatal error in the requested format and exit 1."""
+    if as_json:
+        print(json.dumps({'file': filepath, 'error': message}, indent=2))
+    else:
+        print(f"Error: {message}")
+    sys.exit(1)
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python check-loops.py <path-to-learning-graph.json>")
-        sys.exit(1)
-
-    filepath = sys.argv[1]
-
+    parser = argparse.ArgumentParser(
+        description="Check a vis-network learning graph JSON file for loops."
+    )
+    parser.add_argument("filepath", help="Path to learning-graph.json")
+    parser.add_argument("--json", action="store_true",
+                        help="Print a machine-readable JSON result")
+    args = parser.parse_args()
+    filepath = args.filepath
+
+    start = time.perf_counter()
     try:
-        nodes, edges = load_graph(filepath)
+        graph = load_learning_graph(filepath)
     except FileNotFoundError:
-        print(f"Error: File not found: {filepath}")
-        sys.exit(1)
+        fail(f"File not found: {filepath}", args.json, filepath)
     except json.JSONDecodeError as e:
-        print(f"Error: Invalid JSON in file: {e}")
-        sys.exit(1)
+        fail(f"Invalid JSON in file: {e}", args.json, filepath)
+    load_seconds = time.perf_counter() - start
 
-    if not nodes:
+    if not graph.num_concepts and not args.json:
         print("Warning: No nodes found in the graph.")
         sys.exit(0)
 
-    adj = build_adjacency_list(edges)
-    cycles = find_cycles(nodes, adj)
+    start = time.perf_counter()
+    cycles = find_cycles(graph)
+    search_seconds = time.perf_counter() - start
+
+    if args.json:
+        report = build_report(filepath, graph, cycles, load_seconds, search_seconds)
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        sys.exit(1 if cycles else 0)
 
     if not cycles:
         print(f'No Loops Found in file {filepath}.')
@@ -106,14 +99,18 @@ def main():
         print(f"Found {len(cycles)} loop(s) in the graph:\n")
         for i, cycle in enumerate(cycles, 1):
             print(f"Loop {i}:")
-            cycle_labels = [f"  {node_id}: {nodes.get(node_id, 'Unknown')}" for node_id in cycle]
+            cycle_labels = [f"  {graph.ids[node]}: {graph.labels[node]}" for node in cycle]
             print("\n".join(cycle_labels))
             # Show the cycle path
-            path_labels = [nodes.get(node_id, str(node_id)) for node_id in cycle]
+            path_labels = [graph.labels[node] for node in cycle]
             path_labels.append(path_labels[0])  # Close the loop for display
             print(f"  Path: {' -> '.join(path_labels)}")
             print()
-        sys.exit(1)
+
+    print(f"Checked {graph.num_concepts} nodes and {graph.num_edges} edges in "
+          f"{load_seconds + search_seconds:.3f}s "
+          f"(load {load_seconds:.3f}s, search {search_seconds:.3f}s)")
+    sys.exit(1 if cycles else 0)
 
 
 if __name__ == "__main__":
@@ -20,7 +20,7 @@ import sys
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from shared import (
-    find_project_root, kebab_case,
+    find_project_root, kebab_case, SimCatalog,
     GREEN, RED, YELLOW, CYAN, BOLD, DIM, RESET, CHECK, CROSS, WARN, ARROW,
 )
 
@@ -61,16 +61,12 @@ def _infer_sim_id(title, details_text=""):
     return kebab_case(title)
 
 
-def _read_canvas_height(sim_dir):
-    """Parse JS files in a sim directory to find canvas height."""
-    if not os.path.isdir(sim_dir):
+def _read_canvas_height(sim):
+    """Parse JS files in a sim directory (a shared.SimDir) to find canvas height."""
+    if sim is None:
         return None
-    for fname in os.listdir(sim_dir):
-        if not fname.endswith(".js"):
-            continue
-        path = os.path.join(sim_dir, fname)
-        with open(path, encoding="utf-8", errors="ignore") as f:
-            content = f.read()
+    for fname in sim.names(".js"):
+        content = sim.read(fname)
         # Look for createCanvas(w, h) pattern
         m = re.search(r"createCanvas\(\s*\w+\s*,\s*(\d+)\s*\)", content)
         if m:
@@ -83,8 +79,12 @@ def _read_canvas_height(sim_dir):
 
 
 def process_chapter(chapter_path, project_dir, dry_run=False,
-                    fix_heights=False, fix_paths=False, verbose=False):
-    """Process a single chapter file. Returns (changes_made, report)."""
+                    fix_heights=False, fix_paths=False, verbose=False,
+                    catalog=None):
+    """Process a single chapter file. Returns (changes_made, report).
+
+    Pass a shared.SimCatalog to reuse one sim scan across chapters.
+    """
     with open(chapter_path, encoding="utf-8") as f:
         content = f.read()
 
@@ -93,7 +93,8 @@ def process_chapter(chapter_path, project_dir, dry_run=False,
     new_lines = list(lines)  # work on a copy
     offset = 0  # track line insertions
 
-    sims_dir = os.path.join(project_dir, "docs", "sims")
+    if catalog is None and fix_heights:
+        catalog = SimCatalog(project_dir)
 
     # Pass 1: Fix typos and paths throughout the file
     if fix_heights or fix_paths:
@@ -153,12 +154,11 @@ def process_chapter(chapter_path, project_dir, dry_run=False,
 
         if not has_iframe and details_line is not None:
             sim_id = _infer_sim_id(title, details_text)
-            sim_path = os.path.join(sims_dir, sim_id)
 
             # Determine height
             height = "450px"
             if fix_heights:
-                canvas_h = _read_canvas_height(sim_path)
+                canvas_h = _read_canvas_height(catalog.get(sim_id))
                 if canvas_h:
                     height = f"{canvas_h + 2}px"
 
@@ -187,8 +187,7 @@ def process_chapter(chapter_path, project_dir, dry_run=False,
                 im = IFRAME_RE.search(new_lines[j])
                 if im:
                     sim_id_found = im.group(2)
-                    sim_path = os.path.join(sims_dir, sim_id_found)
-                    canvas_h = _read_canvas_height(sim_path)
+                    canvas_h = _read_canvas_height(catalog.get(sim_id_found))
                     if canvas_h:
                         correct_h = f"{canvas_h + 2}px"
                         new_lines[j] = re.sub(
@@ -255,6 +254,8 @@ def main():
     else:
         chapter_dirs = [args.chapter]
 
+    catalog = SimCatalog(project_dir) if args.fix_heights else None
+
     total_changes = 0
     for ch in chapter_dirs:
         index_path = os.path.join(chapters_dir, ch, "index.md")
@@ -271,6 +272,7 @@ def main():
             fix_heights=args.fix_heights,
             fix_paths=args.fix_paths,
             verbose=args.verbose,
+            catalog=catalog,
         )
         total_changes += n
 
@@ -18,63 +18,46 @@ Usage:
 import argparse
 import html
 import os
-import re
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from shared import (
-    find_project_root, parse_yaml_frontmatter,
+    find_project_root, parse_yaml_frontmatter, SimCatalog,
     GREEN, RED, YELLOW, CYAN, BOLD, DIM, RESET, CHECK, CROSS, WARN, ARROW,
 )
 
 SKIP_DIRS = {"TODO"}
 
 
-def _extract_title(index_path):
-    """Display title: frontmatter ``title`` > first ``# Heading`` > dir name."""
-    with open(index_path, encoding="utf-8") as f:
-        content = f.read()
-    fm, _ = parse_yaml_frontmatter(content)
-    if fm.get("title"):
-        return fm["title"].strip()
-    m = re.search(r"^#\s+(.+)$", content, re.MULTILINE)
-    if m:
-        return m.group(1).strip()
-    return os.path.basename(os.path.dirname(index_path)).replace("-", " ").title()
-
-
-def _find_screenshot(sim_dir, name):
+def _find_screenshot(sim):
     """Return the screenshot filename for a sim, or None.
 
     Prefers ``<name>.png``; otherwise the first ``.png`` alphabetically that is
     not an obvious non-screenshot (icon/logo).
     """
-    preferred = f"{name}.png"
-    if os.path.isfile(os.path.join(sim_dir, preferred)):
+    preferred = f"{sim.sim_id}.png"
+    if sim.has(preferred):
         return preferred
-    pngs = sorted(f for f in os.listdir(sim_dir) if f.lower().endswith(".png"))
+    pngs = sorted(f for f in sim.files if f.lower().endswith(".png"))
     return pngs[0] if pngs else None
 
 
 def scan_sims(project_dir, verbose=False):
     """Return a list of dicts sorted by title: {name, title, shot}."""
-    sims_dir = os.path.join(project_dir, "docs", "sims")
-    if not os.path.isdir(sims_dir):
+    catalog = SimCatalog(project_dir)
+    if not os.path.isdir(catalog.sims_dir):
         print(f"{RED}{CROSS} docs/sims/ not found in {project_dir}{RESET}")
         return []
     sims = []
-    for name in sorted(os.listdir(sims_dir)):
-        if name in SKIP_DIRS or name.startswith("."):
-            continue
-        sim_dir = os.path.join(sims_dir, name)
-        index_path = os.path.join(sim_dir, "index.md")
-        if not os.path.isfile(index_path):
+    for sim in catalog:
+        if sim.sim_id in SKIP_DIRS or not sim.has("index.md"):
             continue
         sims.append({
-            "name": name,
-            "title": _extract_title(index_path),
-            "shot": _find_screenshot(sim_dir, name),
+            "name": sim.sim_id,
+            "title": sim.title().strip(),
+            "shot": _find_screenshot(sim),
         })
+    catalog.save()
     sims.sort(key=lambda s: s["title"].lower())
     if verbose:
         missing = [s["name"] for s in sims if not s["shot"]]
@@ -3,6 +3,7 @@ Shared utilities for MicroSim batch processing scripts.
 Standard library only, Python 3.7+.
 """
 
+import json
 import os
 import re
 
@@ -137,3 +138,192 @@ LIBRARY_CSS = {
     "vis-timeline": "https://cdn.jsdelivr.net/npm/vis-timeline@7.7.3/styles/vis-timeline-graph2d.min.css",
     "Leaflet":      "https://unpkg.com/leaflet@1.9.4/dist/leaflet.css",
 }
+
+
+# ── Sim catalog ───────────────────────────────────────────────────────
+CATALOG_CACHE = os.path.join(".cache", "microsim-utils", "sim-catalog.json")
+# Bump when the snapshot layout or any parsed field changes
+CATALOG_VERSION = 1
+
+
+class SimDir:
+    """One ``docs/sims/<sim_id>/`` directory from a :class:`SimCatalog`.
+
+    The file listing comes from the catalog scan. File contents are read on
+    first use and kept for the rest of the run; the parsed fields
+    (``frontmatter``, ``heading``, ``metadata``, ``library``) are also kept
+    in the catalog snapshot while the directory's files are unchanged.
+    """
+
+    def __init__(self, sim_id, path, files, parsed=None):
+        self.sim_id = sim_id
+        self.path = path
+        self.files = files      # {file name: [size, mtime_ns]}
+        self.parsed = parsed if parsed is not None else {}
+        self.dirty = False
+        self._text = {}
+
+    def has(self, name):
+        """True if the sim directory contains a file called *name*."""
+        return name in self.files
+
+    def file_path(self, name):
+        return os.path.join(self.path, name)
+
+    def names(self, suffix):
+        """Sorted names of the files ending in *suffix*."""
+        return sorted(n for n in self.files if n.endswith(suffix))
+
+    def read(self, name):
+        """Text of a file in the sim directory, or ``None`` if it is absent."""
+        if name not in self._text:
+            if name not in self.files:
+                return None
+            with open(self.file_path(name), encoding="utf-8", errors="ignore") as f:
+                self._text[name] = f.read()
+        return self._text[name]
+
+    def _parsed(self, key, compute):
+        if key not in self.parsed:
+            self.parsed[key] = compute()
+            self.dirty = True
+        return self.parsed[key]
+
+    @property
+    def index_md(self):
+        return self.read("index.md")
+
+    @property
+    def frontmatter(self):
+        """Flat frontmatter dict of ``index.md`` (empty if there is none)."""
+        return self._parsed(
+            "frontmatter",
+            lambda: parse_yaml_frontmatter(self.index_md or "")[0],
+        )
+
+    @property
+    def heading(self):
+        """Text of the first ``# Heading`` in ``index.md``, or ``None``."""
+        def first_heading():
+            m = re.search(r"^#\s+(.+)$", self.index_md or "", re.MULTILINE)
+            return m.group(1).strip() if m else None
+        return self._parsed("heading", first_heading)
+
+    @property
+    def metadata(self):
+        """Parsed ``metadata.json``, or ``None`` if it is missing or invalid."""
+        def load():
+            text = self.read("metadata.json")
+            if text is None:
+                return None
+            try:
+                return json.loads(text)
+            except ValueError:
+                return None
+        return self._parsed("metadata", load)
+
+    @property
+    def library(self):
+        """JavaScript library detected from ``main.html`` (see detect_library)."""
+        return self._parsed(
+            "library",
+            lambda: detect_library(self.read("main.html") or ""),
+        )
+
+    def title(self):
+        """Display title: frontmatter ``title`` > first ``# Heading`` > dir name."""
+        return (self.frontmatter.get("title") or self.heading
+                or self.sim_id.replace("-", " ").title())
+
+
+class SimCatalog:
+    """Every sim directory under ``docs/sims/`` of a project, scanned once.
+
+    Each sim directory is listed with a single ``os.scandir`` pass that also
+    records the size and mtime of every file. Contents are only read when a
+    script asks for them.
+
+    The parsed fields are kept in a snapshot at
+    ``.cache/microsim-utils/sim-catalog.json`` in the project and reused for
+    any sim whose file names, sizes and mtimes all still match, so a chain
+    of these tools reads each ``index.md`` and ``metadata.json`` once
+    between edits. Call :meth:`save` before exiting to keep what was parsed.
+    """
+
+    def __init__(self, project_dir, use_cache=True):
+        self.project_dir = project_dir
+        self.sims_dir = os.path.join(project_dir, "docs", "sims")
+        self.cache_path = os.path.join(project_dir, CATALOG_CACHE)
+        self.use_cache = use_cache
+        self.sims = {}
+
+        cached = self._load_snapshot() if use_cache else {}
+        self.stale = True
+        if not os.path.isdir(self.sims_dir):
+            return
+        with os.scandir(self.sims_dir) as entries:
+            dirs = sorted(e.name for e in entries
+                          if e.is_dir() and not e.name.startswith("."))
+        unchanged = len(dirs) == len(cached)
+        for sim_id in dirs:
+            path = os.path.join(self.sims_dir, sim_id)
+            files = {}
+            with os.scandir(path) as entries:
+                for e in entries:
+                    if e.is_file():
+                        st = e.stat()
+                        files[e.name] = [st.st_size, st.st_mtime_ns]
+            previous = cached.get(sim_id)
+            parsed = None
+            if previous and previous.get("files") == files:
+                parsed = previous.get("parsed")
+            else:
+                unchanged = False
+            self.sims[sim_id] = SimDir(sim_id, path, files, parsed)
+        self.stale = not unchanged
+
+    def _load_snapshot(self):
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            if snapshot.get("version") == CATALOG_VERSION:
+                return snapshot["sims"]
+        except (OSError, ValueError, AttributeError, KeyError):
+            pass
+        return {}
+
+    def __iter__(self):
+        """Sim directories in name order."""
+        return iter(self.sims.values())
+
+    def __len__(self):
+        return len(self.sims)
+
+    def get(self, sim_id):
+        """The :class:`SimDir` for *sim_id*, or ``None``."""
+        return self.sims.get(sim_id)
+
+    def save(self):
+        """Write the snapshot atomically if the scan or parsing changed it.
+
+        A cache directory that cannot be written is silently skipped.
+        """
+        if not self.use_cache:
+            return
+        if not self.stale and not any(sim.dirty for sim in self):
+            return
+        snapshot = {
+            "version": CATALOG_VERSION,
+            "sims": {
+                sim.sim_id: {"files": sim.files, "parsed": sim.parsed}
+                for sim in self
+            },
+        }
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass
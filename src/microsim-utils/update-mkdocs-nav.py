@@ -13,52 +13,33 @@ Usage:
 
 import argparse
 import os
-import re
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from shared import (
-    find_project_root, parse_yaml_frontmatter,
+    find_project_root, SimCatalog,
     GREEN, RED, YELLOW, CYAN, BOLD, DIM, RESET, CHECK, CROSS, WARN, ARROW,
 )
 
 
-def _extract_title(index_path):
-    """Get the display title from an index.md file.
+def scan_sims(project_dir, verbose=False):
+    """Return a sorted list of (display_title, nav_path) tuples.
 
-    Priority: frontmatter ``title`` > first ``# Heading`` > directory name.
+    Display titles come from ``SimDir.title()``: frontmatter ``title`` >
+    first ``# Heading`` > directory name.
     """
-    with open(index_path, encoding="utf-8") as f:
-        content = f.read()
-
-    fm, rest = parse_yaml_frontmatter(content)
-    if fm.get("title"):
-        return fm["title"]
-
-    m = re.search(r"^#\s+(.+)$", content, re.MULTILINE)
-    if m:
-        return m.group(1).strip()
-
-    # Fallback to directory name title-cased
-    dirname = os.path.basename(os.path.dirname(index_path))
-    return dirname.replace("-", " ").title()
-
-
-def scan_sims(project_dir, verbose=False):
-    """Return a sorted list of (display_title, nav_path) tuples."""
-    sims_dir = os.path.join(project_dir, "docs", "sims")
-    if not os.path.isdir(sims_dir):
+    catalog = SimCatalog(project_dir)
+    if not os.path.isdir(catalog.sims_dir):
         print(f"{RED}{CROSS} docs/sims/ not found in {project_dir}{RESET}")
         return []
 
     entries = []
-    for name in sorted(os.listdir(sims_dir)):
-        index_path = os.path.join(sims_dir, name, "index.md")
-        if not os.path.isfile(index_path):
+    for sim in catalog:
+        if not sim.has("index.md"):
             continue
-        title = _extract_title(index_path)
-        nav_path = f"sims/{name}/index.md"
-        entries.append((title, nav_path))
+        nav_path = f"sims/{sim.sim_id}/index.md"
+        entries.append((sim.title(), nav_path))
+    catalog.save()
 
     # Sort alphabetically by title (case-insensitive)
     entries.sort(key=lambda e: e[0].lower())
@@ -19,7 +19,8 @@ Scoring Rubric (100 points):
 
 Usage:
     python3 validate-sims.py [--project-dir PATH] [--sim NAME]
-        [--min-score N] [--output FILE] [--format table|json] [--verbose]
+        [--min-score N] [--output FILE] [--format table|json] [--jobs N]
+        [--verbose]
 """
 
 import argparse
@@ -27,10 +28,11 @@ import json
 import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from shared import (
-    find_project_root, parse_yaml_frontmatter, detect_library,
+    find_project_root, SimCatalog,
     GREEN, RED, YELLOW, CYAN, BOLD, DIM, RESET, CHECK, CROSS, WARN, ARROW,
 )
 
@@ -40,14 +42,12 @@ REQUIRED_METADATA_FIELDS = [
 ]
 
 
-def _check_main_html(sim_dir):
+def _check_main_html(sim):
     """Check main.html: exists (5), has schema meta tag (3), has <main> tag (2)."""
-    path = os.path.join(sim_dir, "main.html")
-    if not os.path.isfile(path):
+    if not sim.has("main.html"):
         return 0, ["main.html missing"]
 
-    with open(path, encoding="utf-8", errors="ignore") as f:
-        content = f.read()
+    content = sim.read("main.html")
 
     score = 5  # exists
     issues = []
@@ -65,19 +65,16 @@ def _check_main_html(sim_dir):
     return score, issues
 
 
-def _check_metadata_json(sim_dir):
+def _check_metadata_json(sim):
     """Check metadata.json: present (10), valid fields (20)."""
-    path = os.path.join(sim_dir, "metadata.json")
-    if not os.path.isfile(path):
+    if not sim.has("metadata.json"):
         return 0, ["metadata.json missing"]
 
     score = 10  # present
     issues = []
 
-    try:
-        with open(path, encoding="utf-8") as f:
-            data = json.load(f)
-    except (json.JSONDecodeError, ValueError):
+    data = sim.metadata
+    if not isinstance(data, dict):
         issues.append("metadata.json: invalid JSON")
         return score, issues
 
@@ -113,14 +110,12 @@ def _check_metadata_json(sim_dir):
     return score, issues
 
 
-def _check_index_md(sim_dir):
+def _check_index_md(sim):
     """Check index.md structure (35 points)."""
-    path = os.path.join(sim_dir, "index.md")
-    if not os.path.isfile(path):
+    if not sim.has("index.md"):
         return 0, ["index.md missing"]
 
-    with open(path, encoding="utf-8") as f:
-        content = f.read()
+    content = sim.index_md
 
     score = 0
     issues = []
@@ -142,7 +137,7 @@ def _check_index_md(sim_dir):
         issues.append("index.md: missing # title header")
 
     # YAML basic: title + description (3)
-    fm, _ = parse_yaml_frontmatter(content)
+    fm = sim.frontmatter
     if fm.get("title") and fm.get("description"):
         score += 3
     else:
@@ -185,60 +180,49 @@ def _check_index_md(sim_dir):
     return score, issues
 
 
-def _check_image(sim_dir):
+def _check_image(sim):
     """Check for screenshot PNG (5 points)."""
-    for f in os.listdir(sim_dir):
-        if f.endswith(".png") and f not in ("favicon.png", "icon.png"):
+    for f in sim.names(".png"):
+        if f not in ("favicon.png", "icon.png"):
             return 5, []
     return 0, ["screenshot PNG missing"]
 
 
-def _check_lesson_plan(sim_dir):
+def _check_lesson_plan(sim):
     """Check for Lesson Plan section (10 points)."""
-    path = os.path.join(sim_dir, "index.md")
-    if not os.path.isfile(path):
+    content = sim.index_md
+    if content is None:
         return 0, ["index.md missing"]
-    with open(path, encoding="utf-8") as f:
-        content = f.read()
     if re.search(r'^##\s+[Ll]esson\s*[Pp]lan', content, re.MULTILINE):
         return 10, []
     return 0, ["index.md: missing Lesson Plan section"]
 
 
-def _check_references(sim_dir):
+def _check_references(sim):
     """Check for References section (5 points)."""
-    path = os.path.join(sim_dir, "index.md")
-    if not os.path.isfile(path):
+    content = sim.index_md
+    if content is None:
         return 0, ["index.md missing"]
-    with open(path, encoding="utf-8") as f:
-        content = f.read()
     if re.search(r'^##\s+[Rr]eferences', content, re.MULTILINE):
         return 5, []
     return 0, ["index.md: missing References section"]
 
 
-def _check_p5_conventions(sim_dir):
+def _check_p5_conventions(sim):
     """Check p5.js-specific conventions (5 points).
 
     Only applies to p5.js sims. Non-p5 sims get full marks.
     """
-    html_path = os.path.join(sim_dir, "main.html")
-    if not os.path.isfile(html_path):
+    if not sim.has("main.html"):
         return 5, []  # Can't determine library, give benefit of doubt
 
-    with open(html_path, encoding="utf-8", errors="ignore") as f:
-        html = f.read()
-
-    lib = detect_library(html)
-    if lib != "p5.js":
+    if sim.library != "p5.js":
         return 5, []  # Not p5.js, full marks
 
     # Find JS files
     js_content = ""
-    for fname in os.listdir(sim_dir):
-        if fname.endswith(".js"):
-            with open(os.path.join(sim_dir, fname), encoding="utf-8", errors="ignore") as f:
-                js_content += f.read() + "\n"
+    for fname in sim.names(".js"):
+        js_content += sim.read(fname) + "\n"
 
     if not js_content:
         return 0, ["p5.js: no JS file found"]
@@ -283,16 +267,17 @@ def _check_p5_conventions(sim_dir):
     return score, issues
 
 
-def validate_sim(sim_dir, verbose=False):
-    """Validate a single sim and return (total_score, category_scores, issues)."""
+def validate_sim(sim, verbose=False):
+    """Validate a single sim (a shared.SimDir) and return
+    (total_score, category_scores, issues)."""
     categories = {
-        "main_html":    _check_main_html(sim_dir),
-        "metadata":     _check_metadata_json(sim_dir),
-        "index_md":     _check_index_md(sim_dir),
-        "image":        _check_image(sim_dir),
-        "lesson_plan":  _check_lesson_plan(sim_dir),
-        "references":   _check_references(sim_dir),
-        "p5_conventions": _check_p5_conventions(sim_dir),
+        "main_html":    _check_main_html(sim),
+        "metadata":     _check_metadata_json(sim),
+        "index_md":     _check_index_md(sim),
+        "image":        _check_image(sim),
+        "lesson_plan":  _check_lesson_plan(sim),
+        "references":   _check_references(sim),
+        "p5_conventions": _check_p5_conventions(sim),
     }
 
     total = 0
@@ -306,6 +291,36 @@ def validate_sim(sim_dir, verbose=False):
     return total, scores, all_issues
 
 
+def _validate_worker(sim):
+    """Pool worker: validate one sim, returning its parsed catalog fields too."""
+    score, cat_scores, issues = validate_sim(sim)
+    return score, cat_scores, issues, sim.parsed
+
+
+def iter_validated(sims, jobs=1):
+    """Yield (sim, score, category_scores, issues) for each sim.
+
+    With jobs > 1 the sims are validated on a process pool and yielded as
+    they complete, so the order is not stable; sort before printing.
+    Fields the workers parsed are copied back into each SimDir so
+    SimCatalog.save() still caches them.
+    """
+    if jobs <= 1 or len(sims) <= 1:
+        for sim in sims:
+            yield (sim,) + validate_sim(sim)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(_validate_worker, sim): sim for sim in sims}
+        for future in as_completed(futures):
+            sim = futures[future]
+            score, cat_scores, issues, parsed = future.result()
+            if parsed != sim.parsed:
+                sim.parsed = parsed
+                sim.dirty = True
+            yield sim, score, cat_scores, issues
+
+
 def format_table(results, verbose=False):
     """Format results as a text table."""
     lines = []
@@ -352,8 +367,11 @@ def main():
                         help="Write results to JSON file")
     parser.add_argument("--format", choices=["table", "json"], default="table",
                         help="Output format (default: table)")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Validate on N worker processes (0 = one per CPU)")
     parser.add_argument("--verbose", action="store_true")
     args = parser.parse_args()
+    jobs = args.jobs or os.cpu_count() or 1
 
     project_dir = args.project_dir or find_project_root()
     sims_dir = os.path.join(project_dir, "docs", "sims")
@@ -363,32 +381,30 @@ def main():
         sys.exit(1)
 
     # Determine which sims to validate
+    catalog = SimCatalog(project_dir)
     if args.sim:
-        sim_dirs = [args.sim]
+        sims = [catalog.get(args.sim)] if catalog.get(args.sim) else []
     else:
-        sim_dirs = sorted([
-            d for d in os.listdir(sims_dir)
-            if os.path.isdir(os.path.join(sims_dir, d))
-            and not d.startswith(".")
-        ])
+        sims = list(catalog)
 
     results = []
-    for name in sim_dirs:
-        sim_path = os.path.join(sims_dir, name)
-        if not os.path.isdir(sim_path):
-            continue
-
-        score, cat_scores, issues = validate_sim(sim_path, verbose=args.verbose)
+    for done, (sim, score, cat_scores, issues) in enumerate(iter_validated(sims, jobs), 1):
+        if jobs > 1:
+            # Stream progress to stderr so --format json stays parseable
+            print(f"{DIM}[{done}/{len(sims)}] {sim.sim_id}: {score}{RESET}",
+                  file=sys.stderr)
 
         if score < args.min_score:
             continue
 
         results.append({
-            "sim_id": name,
+            "sim_id": sim.sim_id,
             "score": score,
             "categories": cat_scores,
             "issues": issues,
         })
+    results.sort(key=lambda r: r["sim_id"])
+    catalog.save()
 
     if args.output:
         # Strip ANSI for JSON output
@@ -4,41 +4,186 @@ Image Compression Script for Web Optimization
 Compresses large images to approximately 300KB while preserving original format.
 JPEGs stay as JPEGs (better for photos), PNGs stay as PNGs (better for graphics).
 Images will not be resized below MIN_WIDTH pixels to ensure they fill the column width.
+
+For each image the largest scale and then the highest JPEG quality that fit
+the target are found by bisection, encoding into memory. Images are
+compressed in parallel (--jobs), and compressed files are recorded in
+.cache/compress-images/manifest.json so reruns skip them. Outputs are also
+kept in the shared content-addressed image cache (see image_cache.py), so an
+image already compressed in another book is copied instead of re-encoded.
 """
 
+import argparse
+import json
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from io import BytesIO
 from PIL import Image, ImageOps
 import shutil
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from image_cache import ImageCache, DEFAULT_MAX_MB
+
 # Minimum width in pixels - images should fill the column width
 MIN_WIDTH = 800
+# Never shrink below this fraction of the original size
+MIN_SCALE = 0.15
+# Stop bisecting the scale once the bracket is narrower than this
+SCALE_TOLERANCE = 0.02
+# JPEG quality search range
+MIN_QUALITY = 45
+MAX_QUALITY = 85
+
+# Files already compressed (path -> [size, mtime_ns] after compression), so
+# reruns skip them without opening them again
+MANIFEST_PATH = Path(".cache") / "compress-images" / "manifest.json"
+MANIFEST_VERSION = 1
 
 def get_file_size_kb(filepath):
     """Get file size in KB"""
     return os.path.getsize(filepath) / 1024
 
-def compress_image(input_path, target_size_kb=300, min_compression=0, max_compression=9):
+def file_signature(filepath):
+    """[size, mtime_ns] used to tell whether a file changed since it was compressed"""
+    stat = os.stat(filepath)
+    return [stat.st_size, stat.st_mtime_ns]
+
+def load_manifest(path):
+    """Return {absolute path: signature} from the last runs, or {} if unreadable"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') == MANIFEST_VERSION:
+            return data['files']
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+    return {}
+
+def save_manifest(path, files):
+    """Write the manifest atomically"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': MANIFEST_VERSION, 'files': files}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+class Encoder:
+    """Encode one image at a given scale and JPEG quality into memory.
+
+    The resized copy for the most recent scale is kept, so a quality search
+    at a fixed scale only re-encodes.
+    """
+
+    def __init__(self, img, is_jpeg):
+        self.img = img
+        self.is_jpeg = is_jpeg
+        self.scale = None
+        self.resized = None
+        self.count = 0
+
+    def resize(self, scale):
+        if scale != self.scale:
+            if scale < 1.0:
+                width, height = self.img.size
+                self.resized = self.img.resize((int(width * scale), int(height * scale)),
+                                               Image.Resampling.LANCZOS)
+            else:
+                self.resized = self.img
+            self.scale = scale
+        return self.resized
+
+    def encode(self, scale, quality=None):
+        """Return the encoded bytes at this scale (and quality for JPEG)"""
+        buffer = BytesIO()
+        if self.is_jpeg:
+            self.resize(scale).save(buffer, "JPEG", quality=quality, optimize=True)
+        else:
+            self.resize(scale).save(buffer, "PNG", compress_level=9, optimize=True)
+        self.count += 1
+        return buffer.getvalue()
+
+def search_encoding(encoder, min_scale, target_bytes):
+    """
+    Find the largest scale, then the highest JPEG quality, that fits target_bytes.
+
+    Encoded size grows with both scale and quality, so each is bisected:
+    first the scale at MIN_QUALITY between min_scale and 1.0, then the
+    quality between MIN_QUALITY and MAX_QUALITY at that scale.
+
+    Returns (data, scale, quality, reached_target). When even min_scale at
+    MIN_QUALITY is too large, that smallest encoding is returned.
+    """
+    quality = MIN_QUALITY if encoder.is_jpeg else None
+
+    data = encoder.encode(min_scale, quality)
+    if len(data) > target_bytes:
+        return data, min_scale, quality, False
+    best_scale, best_data = min_scale, data
+
+    if min_scale < 1.0:
+        data = encoder.encode(1.0, quality)
+        if len(data) <= target_bytes:
+            best_scale, best_data = 1.0, data
+        else:
+            low, high = min_scale, 1.0
+            while high - low > SCALE_TOLERANCE:
+                mid = (low + high) / 2
+                data = encoder.encode(mid, quality)
+                if len(data) <= target_bytes:
+                    low, best_scale, best_data = mid, mid, data
+                else:
+                    high = mid
+
+    if encoder.is_jpeg:
+        low, high = MIN_QUALITY, MAX_QUALITY
+        while low < high:
+            mid = (low + high + 1) // 2
+            data = encoder.encode(best_scale, mid)
+            if len(data) <= target_bytes:
+                low, quality, best_data = mid, mid, data
+            else:
+                high = mid - 1
+
+    return best_data, best_scale, quality, True
+
+def compress_image(input_path, target_size_kb=300):
     """
     Compress an image to approximately the target size in KB.
     Keeps JPEGs as JPEGs and PNGs as PNGs for optimal compression.
 
+    Candidate encodings are written to in-memory buffers; only the chosen
+    one is written back over the image. Runs in worker processes, so the
+    progress lines are returned in the result instead of printed.
+
     Args:
         input_path: Path to input image
         target_size_kb: Target size in KB (default 300)
-        min_compression: Minimum compression level (0=fastest)
-        max_compression: Maximum compression level (9=best for PNG, 95 quality for JPEG)
+
+    Returns:
+        dict with 'path', 'status' ('compressed', 'already', or 'error'),
+        'lines' to print, and 'final_size' in KB
     """
+    lines = []
+    result = {'path': input_path, 'status': 'error', 'lines': lines, 'final_size': None}
     try:
         # Determine if this is a JPEG or PNG
         is_jpeg = input_path.suffix.lower() in ['.jpg', '.jpeg']
 
+        original_size = get_file_size_kb(input_path)
+
+        # If already small enough, skip
+        if original_size <= target_size_kb:
+            lines.append(f"  Already optimized: {original_size:.1f}KB")
+            result.update(status='already', final_size=original_size)
+            return result
+
         # Create backup
         backup_path = str(input_path) + ".backup"
         if not os.path.exists(backup_path):
             shutil.copy2(input_path, backup_path)
-            print(f"  Backup created: {backup_path}")
+            lines.append(f"  Backup created: {backup_path}")
 
         # Open and optimize image
         with Image.open(input_path) as img:
@@ -48,9 +193,7 @@ def compress_image(input_path, target_size_kb=300, min_compression=0, max_compre
             # Handle color modes
             if is_jpeg:
                 # JPEG doesn't support transparency, convert to RGB
-                if img.mode in ('RGBA', 'LA', 'P'):
-                    img = img.convert('RGB')
-                elif img.mode not in ('RGB',):
+                if img.mode not in ('RGB',):
                     img = img.convert('RGB')
             else:
                 # PNG: preserve transparency
@@ -61,115 +204,101 @@ def compress_image(input_path, target_size_kb=300, min_compression=0, max_compre
                 elif img.mode not in ('RGB', 'RGBA'):
                     img = img.convert('RGB')
 
-            original_size = get_file_size_kb(input_path)
-
-            # If already small enough, skip
-            if original_size <= target_size_kb:
-                print(f"  Already optimized: {original_size:.1f}KB")
-                return True
-
             # Get original dimensions
             original_width, original_height = img.size
-            print(f"  Original dimensions: {original_width}x{original_height}")
-            print(f"  Format: {'JPEG' if is_jpeg else 'PNG'}")
-
-            best_size = float('inf')
-            best_img = img.copy()
+            lines.append(f"  Original dimensions: {original_width}x{original_height}")
+            lines.append(f"  Format: {'JPEG' if is_jpeg else 'PNG'}")
 
             # Calculate the minimum resize factor to maintain MIN_WIDTH
             min_resize_factor = MIN_WIDTH / original_width if original_width > MIN_WIDTH else 1.0
-
-            # Try different resize factors - be more aggressive for very large files
-            if original_size > 1000:  # Over 1MB, start with smaller sizes
-                resize_factors = [0.6, 0.5, 0.4, 0.35, 0.3, 0.25, 0.2, 0.15]
-            elif original_size > 500:  # Over 500KB
-                resize_factors = [0.8, 0.7, 0.6, 0.5, 0.4, 0.3, 0.25, 0.2]
-            else:  # Smaller files, try compression first
-                resize_factors = [1.0, 0.9, 0.8, 0.7, 0.6, 0.5, 0.4, 0.3, 0.25, 0.2]
-
-            # Filter out resize factors that would make the image narrower than MIN_WIDTH
-            resize_factors = [f for f in resize_factors if f >= min_resize_factor]
-            if not resize_factors:
-                resize_factors = [min_resize_factor]  # Use minimum allowed factor
-
-            print(f"  Minimum width: {MIN_WIDTH}px (min resize factor: {min_resize_factor:.2f})")
-
-            # For JPEG, also try different quality levels
-            jpeg_qualities = [85, 75, 65, 55, 45] if is_jpeg else [None]
-
-            for resize_factor in resize_factors:
-                # Resize image if needed
-                if resize_factor < 1.0:
-                    new_width = int(original_width * resize_factor)
-                    new_height = int(original_height * resize_factor)
-                    resized_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                    print(f"  Trying resize: {resize_factor:.1%} ({new_width}x{new_height})")
-                else:
-                    resized_img = img
-                    print(f"  Trying original size with max compression")
-
-                temp_path = str(input_path) + ".temp"
-
-                if is_jpeg:
-                    # Try different JPEG quality levels at this size
-                    for quality in jpeg_qualities:
-                        resized_img.save(temp_path, "JPEG", quality=quality, optimize=True)
-                        temp_size = get_file_size_kb(temp_path)
-
-                        if resize_factor == 1.0 or quality == jpeg_qualities[0]:
-                            print(f"    Quality {quality}: {temp_size:.1f}KB")
-
-                        if temp_size <= target_size_kb:
-                            best_size = temp_size
-                            best_img = resized_img.copy()
-                            final_width, final_height = resized_img.size
-                            print(f"  ✓ Found suitable size: {temp_size:.1f}KB at {final_width}x{final_height} (quality={quality})")
-                            os.remove(temp_path)
-                            break
-
-                    if best_size <= target_size_kb:
-                        break
-                else:
-                    # PNG compression
-                    resized_img.save(temp_path, "PNG", compress_level=9, optimize=True)
-                    temp_size = get_file_size_kb(temp_path)
-                    print(f"    Result: {temp_size:.1f}KB")
-
-                    if temp_size <= target_size_kb:
-                        best_size = temp_size
-                        best_img = resized_img.copy()
-                        final_width, final_height = resized_img.size
-                        print(f"  ✓ Found suitable size: {temp_size:.1f}KB at {final_width}x{final_height}")
-                        os.remove(temp_path)
-                        break
-
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
-
-            # If we couldn't get under target size, use the smallest we achieved while respecting MIN_WIDTH
-            if best_size == float('inf'):
-                print(f"  Warning: Could not reach target size, using smallest allowed size (min width: {MIN_WIDTH}px)")
-                fallback_factor = max(min_resize_factor, 0.2)
-                best_img = img.resize((int(original_width * fallback_factor), int(original_height * fallback_factor)), Image.Resampling.LANCZOS)
-
-            # Save with best image found - keep original format
-            if is_jpeg:
-                best_img.save(input_path, "JPEG", quality=45, optimize=True)
+            min_resize_factor = max(min_resize_factor, MIN_SCALE)
+            lines.append(f"  Minimum width: {MIN_WIDTH}px (min resize factor: {min_resize_factor:.2f})")
+
+            encoder = Encoder(img, is_jpeg)
+            data, scale, quality, reached = search_encoding(
+                encoder, min_resize_factor, target_size_kb * 1024)
+            if scale < 1.0:
+                final_width, final_height = int(original_width * scale), int(original_height * scale)
             else:
-                best_img.save(input_path, "PNG", compress_level=9, optimize=True)
+                final_width, final_height = original_width, original_height
+
+        if reached:
+            quality_note = f" (quality={quality})" if is_jpeg else ""
+            lines.append(f"  ✓ Found suitable size: {len(data) / 1024:.1f}KB at "
+                         f"{final_width}x{final_height}{quality_note} after {encoder.count} encodes")
+        else:
+            lines.append(f"  Warning: Could not reach target size, using smallest allowed size (min width: {MIN_WIDTH}px)")
+
+        # Write the chosen encoding - original format, atomically
+        temp_path = str(input_path) + ".temp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, input_path)
 
-            final_size = get_file_size_kb(input_path)
-            compression_ratio = (1 - final_size / original_size) * 100
-            final_width, final_height = best_img.size
+        final_size = get_file_size_kb(input_path)
+        compression_ratio = (1 - final_size / original_size) * 100
 
-            print(f"  Final result: {original_size:.1f}KB → {final_size:.1f}KB ({compression_ratio:.1f}% reduction)")
-            print(f"  Dimensions: {original_width}x{original_height} → {final_width}x{final_height}")
+        lines.append(f"  Final result: {original_size:.1f}KB → {final_size:.1f}KB ({compression_ratio:.1f}% reduction)")
+        lines.append(f"  Dimensions: {original_width}x{original_height} → {final_width}x{final_height}")
 
-            return True
+        result.update(status='compressed', final_size=final_size)
+        return result
 
     except Exception as e:
-        print(f"  ERROR: {e}")
-        return False
+        lines.append(f"  ERROR: {e}")
+        return result
+
+def iter_compressed(images, target_size_kb, jobs):
+    """
+    Yield compress_image() results for each path.
+
+    With jobs > 1 the images are compressed on a process pool and results
+    are yielded as they complete, in no particular order.
+    """
+    if jobs <= 1 or len(images) <= 1:
+        for filepath in images:
+            yield compress_image(filepath, target_size_kb)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(compress_image, filepath, target_size_kb) for filepath in images]
+        for future in as_completed(futures):
+            yield future.result()
+
+def cache_key(cache, filepath, target_size_kb):
+    """Image cache key for compressing this file's bytes with the current settings"""
+    params = {
+        'target_kb': target_size_kb,
+        'format': 'jpeg' if filepath.suffix.lower() in ['.jpg', '.jpeg'] else 'png',
+        'min_width': MIN_WIDTH,
+        'min_scale': MIN_SCALE,
+        'scale_tolerance': SCALE_TOLERANCE,
+        'quality': [MIN_QUALITY, MAX_QUALITY],
+    }
+    return cache.key(filepath.read_bytes(), 'compress-images', params)
+
+def apply_cached(filepath, data):
+    """Replace an image with a cached compressed output, like compress_image would"""
+    lines = []
+    result = {'path': filepath, 'status': 'error', 'lines': lines, 'final_size': None}
+    try:
+        original_size = get_file_size_kb(filepath)
+        backup_path = str(filepath) + ".backup"
+        if not os.path.exists(backup_path):
+            shutil.copy2(filepath, backup_path)
+            lines.append(f"  Backup created: {backup_path}")
+        temp_path = str(filepath) + ".temp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, filepath)
+        final_size = get_file_size_kb(filepath)
+        lines.append(f"  ♻️  Reused output from the image cache")
+        lines.append(f"  Final result: {original_size:.1f}KB → {final_size:.1f}KB "
+                     f"({(1 - final_size / original_size) * 100:.1f}% reduction)")
+        result.update(status='compressed', final_size=final_size)
+    except Exception as e:
+        lines.append(f"  ERROR: {e}")
+    return result
 
 def find_large_images(root_dir, min_size_kb=500):
     """Find all images larger than min_size_kb"""
@@ -187,10 +316,33 @@ def find_large_images(root_dir, min_size_kb=500):
     return sorted(large_images, key=lambda x: x[1], reverse=True)
 
 def main():
+    parser = argparse.ArgumentParser(
+        description="Compress large images in a docs tree to about --target-kb each."
+    )
+    parser.add_argument("directory", nargs="?", type=Path,
+                        help="Directory to scan (default: ./docs)")
+    parser.add_argument("--target-kb", type=int, default=300,
+                        help="Target size per image in KB (default 300)")
+    parser.add_argument("--min-kb", type=int, default=500,
+                        help="Only compress images at least this large in KB (default 500)")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                        help="Number of images to compress in parallel (default: CPU count)")
+    parser.add_argument("--force", action="store_true",
+                        help="Recompress images even if the manifest says they are done")
+    parser.add_argument("--manifest", type=Path, default=MANIFEST_PATH,
+                        help=f"Manifest of compressed images (default {MANIFEST_PATH})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Do not read or write the shared image cache")
+    parser.add_argument("--cache-dir", type=Path, default=None,
+                        help="Shared image cache directory (default: $BK_IMAGE_CACHE or ~/.cache/bk-images)")
+    parser.add_argument("--cache-max-mb", type=float, default=DEFAULT_MAX_MB,
+                        help=f"Evict least recently used cache entries above this size (default {DEFAULT_MAX_MB})")
+    args = parser.parse_args()
+
     # Determine starting directory
-    if len(sys.argv) > 1:
+    if args.directory:
         # Use command line argument if provided
-        docs_dir = Path(sys.argv[1])
+        docs_dir = args.directory
         print(f"📂 Using directory from command line: {docs_dir.absolute()}")
     else:
         # Check current working directory for 'docs' subdirectory
@@ -217,40 +369,81 @@ def main():
 
     # Find all large images
     print("🔍 Scanning for large images...")
-    large_images = find_large_images(docs_dir, min_size_kb=500)
-    
+    found = find_large_images(docs_dir, min_size_kb=args.min_kb)
+
+    # Skip images this script already compressed and that have not changed since
+    manifest = load_manifest(args.manifest)
+    large_images = [(filepath, size_kb) for filepath, size_kb in found
+                    if args.force or manifest.get(str(filepath.resolve())) != file_signature(filepath)]
+    skipped = len(found) - len(large_images)
+    if skipped:
+        print(f"⏭️  Skipping {skipped} images already compressed (see {args.manifest})")
+
     if not large_images:
-        print("✅ No large images found (>500KB)")
+        print(f"✅ No large images found (>{args.min_kb}KB)")
         return
-    
-    print(f"\n📊 Found {len(large_images)} images larger than 500KB:")
+
+    print(f"\n📊 Found {len(large_images)} images larger than {args.min_kb}KB:")
     total_original_size = 0
-    
+    original_sizes = {}
+
     for filepath, size_kb in large_images:
         print(f"  {filepath}: {size_kb:.1f}KB")
         total_original_size += size_kb
-    
+        original_sizes[filepath] = size_kb
+
     print(f"\n📈 Total size of large images: {total_original_size:.1f}KB ({total_original_size/1024:.1f}MB)")
-    
+
     # Automatically proceed with compression
-    print(f"\n🚀 Starting compression of {len(large_images)} images to ~300KB each...")
-    
+    jobs = max(1, min(args.jobs, len(large_images)))
+    print(f"\n🚀 Starting compression of {len(large_images)} images to ~{args.target_kb}KB each...")
+
     # Compress images
-    print(f"\n🔄 Compressing {len(large_images)} images...")
+    print(f"\n🔄 Compressing {len(large_images)} images with {jobs} worker(s)...")
     successful = 0
     failed = 0
     total_final_size = 0
-    
-    for i, (filepath, original_size) in enumerate(large_images, 1):
-        print(f"\n[{i}/{len(large_images)}] Processing: {filepath}")
-        
-        if compress_image(filepath, target_size_kb=300):
-            successful += 1
-            total_final_size += get_file_size_kb(filepath)
-        else:
-            failed += 1
-            total_final_size += original_size  # Keep original size if failed
-    
+
+    # Identical source bytes compressed with the same settings (here or in
+    # another book) are copied from the shared cache instead of re-encoded
+    cache = ImageCache(args.cache_dir, args.cache_max_mb, enabled=not args.no_cache)
+    keys = {}
+    cached = []
+    images = []
+    for filepath, _ in large_images:
+        if cache.enabled:
+            keys[filepath] = cache_key(cache, filepath, args.target_kb)
+            data = cache.get(keys[filepath])
+            if data is not None:
+                cached.append((filepath, data))
+                continue
+        images.append(filepath)
+
+    def results():
+        for filepath, data in cached:
+            yield apply_cached(filepath, data)
+        for result in iter_compressed(images, args.target_kb, jobs):
+            if result['status'] == 'compressed' and result['path'] in keys:
+                cache.put(keys[result['path']], result['path'].read_bytes())
+            yield result
+
+    try:
+        for i, result in enumerate(results(), 1):
+            filepath = result['path']
+            print(f"\n[{i}/{len(large_images)}] Processing: {filepath}")
+            for line in result['lines']:
+                print(line)
+
+            if result['status'] == 'error':
+                failed += 1
+                total_final_size += original_sizes[filepath]  # Keep original size if failed
+            else:
+                successful += 1
+                total_final_size += result['final_size']
+                manifest[str(filepath.resolve())] = file_signature(filepath)
+    finally:
+        save_manifest(args.manifest, manifest)
+
     # Summary
     print(f"\n✅ Compression Complete!")
     print(f"📊 Results:")
@@ -268,6 +461,7 @@ def main():
         print(f"  • Saved: {savings:.1f}KB ({savings/1024:.1f}MB, {savings_percent:.1f}%)")
     
     print(f"\n💡 Backup files (.backup) created for safety")
+    cache.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
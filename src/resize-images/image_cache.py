@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache of optimized images, shared by every book.
+
+Outputs are stored under a key derived from the SHA-256 of the source image
+bytes plus the tool name and its parameters, so the same mascot or logo
+compressed with the same settings in another textbook repo is reused
+instead of re-encoded. The cache lives in ~/.cache/bk-images (or
+$BK_IMAGE_CACHE, or $XDG_CACHE_HOME/bk-images) and is kept under a size
+limit by evicting the least recently used entries; a hit refreshes an
+entry's mtime, which is what the eviction order goes by.
+
+Usage:
+    from image_cache import ImageCache
+
+    cache = ImageCache()
+    key = cache.key(source_path.read_bytes(), "compress-images", {"target_kb": 300})
+    data = cache.get(key)
+    if data is None:
+        data = encode(...)
+        cache.put(key, data)
+    cache.close()   # evict down to the size limit and print hit/miss stats
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+DEFAULT_MAX_MB = 1024
+# Bump to invalidate every entry when the key scheme changes
+CACHE_VERSION = 1
+
+
+def default_cache_dir():
+    """$BK_IMAGE_CACHE, else $XDG_CACHE_HOME/bk-images, else ~/.cache/bk-images"""
+    if os.environ.get("BK_IMAGE_CACHE"):
+        return Path(os.environ["BK_IMAGE_CACHE"]).expanduser()
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "bk-images"
+
+
+class ImageCache:
+    """Size-bounded LRU store of optimized image bytes keyed by content hash."""
+
+    def __init__(self, cache_dir=None, max_mb=DEFAULT_MAX_MB, enabled=True):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.evicted = 0
+        self.bytes_reused = 0
+
+    @staticmethod
+    def key(source_bytes, tool, params):
+        """Cache key for this source image processed by tool with params"""
+        h = hashlib.sha256()
+        h.update(json.dumps([CACHE_VERSION, tool, params], sort_keys=True).encode())
+        h.update(b"\0")
+        h.update(hashlib.sha256(source_bytes).digest())
+        return h.hexdigest()
+
+    def _path(self, key):
+        return self.cache_dir / key[:2] / key
+
+    def get(self, key):
+        """Return the cached output bytes, or None on a miss"""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        self.hits += 1
+        self.bytes_reused += len(data)
+        return data
+
+    def put(self, key, data):
+        """Store output bytes under key (atomically)"""
+        if not self.enabled:
+            return
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{key}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+            self.stored += 1
+        except OSError as e:
+            print(f"⚠️  Could not write image cache entry: {e}")
+
+    def entries(self):
+        """(mtime, size, path) for every cached output"""
+        entries = []
+        if not self.cache_dir.is_dir():
+            return entries
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".tmp"):
+                    continue
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits max_bytes"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        if total > self.max_bytes:
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                self.evicted += 1
+        return total
+
+    def close(self):
+        """Evict down to the size limit and print this run's stats"""
+        if not self.enabled:
+            return
+        total = self.evict()
+        lookups = self.hits + self.misses
+        hit_rate = (self.hits / lookups * 100) if lookups else 0.0
+        print(f"\n🗄️  Image cache: {self.hits} hits, {self.misses} misses ({hit_rate:.0f}% hit rate), "
+              f"{self.stored} stored, {self.evicted} evicted")
+        print(f"   Reused {self.bytes_reused / 1024:.1f}KB; cache holds "
+              f"{total / (1024 * 1024):.1f}MB of {self.max_bytes / (1024 * 1024):.0f}MB in {self.cache_dir}")
@@ -2,6 +2,8 @@
 """
 Complete image optimization workflow
 Runs all three scripts in the correct sequence
+Compression goes through the shared image cache (see image_cache.py), so
+images already optimized in another book are reused rather than re-encoded
 """
 
 import subprocess
@@ -37,7 +39,7 @@ def main():
     success_count = 0
     
     # Step 1: Compress images
-    if run_script("compress_images.py", "Image Compression"):
+    if run_script("compress-images.py", "Image Compression"):
         success_count += 1
     else:
         print("❌ Stopping workflow due to compression failure")
@@ -16,9 +16,13 @@ Modes:
 
 import argparse
 import sys
+from io import BytesIO
 from pathlib import Path
 from PIL import Image, ImageOps
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from image_cache import ImageCache
+
 # Standard social media preview dimensions
 TARGET_WIDTH = 1200
 TARGET_HEIGHT = 630
@@ -95,7 +99,8 @@ def resize_stretch(img: Image.Image) -> Image.Image:
 
 
 def process_image(input_path: str, output_path: str, mode: str = 'fit',
-                 bg_color: str = 'white', verbose: bool = False) -> bool:
+                 bg_color: str = 'white', verbose: bool = False,
+                 cache: ImageCache = None) -> bool:
     """
     Process a single image file.
 
@@ -105,11 +110,25 @@ def process_image(input_path: str, output_path: str, mode: str = 'fit',
         mode: Resize mode ('fit', 'fill', or 'stretch')
         bg_color: Background color for 'fit' mode
         verbose: Print detailed information
+        cache: Shared image cache to reuse an identical earlier result from
 
     Returns:
         True if successful, False otherwise
     """
     try:
+        # Reuse the output for identical source bytes and settings
+        key = None
+        if cache is not None and cache.enabled:
+            params = {'mode': mode, 'background': bg_color,
+                      'size': [TARGET_WIDTH, TARGET_HEIGHT], 'quality': 95}
+            key = cache.key(Path(input_path).read_bytes(), 'social-media', params)
+            data = cache.get(key)
+            if data is not None:
+                Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+                Path(output_path).write_bytes(data)
+                print(f"Saved: {output_path} (from image cache)")
+                return True
+
         # Open the image
         img = Image.open(input_path)
 
@@ -141,7 +160,11 @@ def process_image(input_path: str, output_path: str, mode: str = 'fit',
         output_dir.mkdir(parents=True, exist_ok=True)
 
         # Save the result
-        result.save(output_path, 'JPEG', quality=95, optimize=True)
+        buffer = BytesIO()
+        result.save(buffer, 'JPEG', quality=95, optimize=True)
+        Path(output_path).write_bytes(buffer.getvalue())
+        if key is not None:
+            cache.put(key, buffer.getvalue())
 
         if verbose:
             print(f"Output: {output_path}")
@@ -205,17 +228,25 @@ Examples:
         action='store_true',
         help='Print detailed information'
     )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Do not read or write the shared image cache ($BK_IMAGE_CACHE or ~/.cache/bk-images)'
+    )
 
     args = parser.parse_args()
 
     # Process the image
+    cache = ImageCache(enabled=not args.no_cache)
     success = process_image(
         args.input,
         args.output,
         args.mode,
         args.background,
-        args.verbose
+        args.verbose,
+        cache
     )
+    cache.close()
 
     # Exit with appropriate code
     sys.exit(0 if success else 1)
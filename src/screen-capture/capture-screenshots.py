@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+MicroSim Batch Screenshot Capture
+
+Captures <sim-name>.png for many MicroSims with one headless Chromium
+process. Sims are loaded concurrently in --jobs browser tabs; each page is
+rendered at the target height plus 200px and the screenshot is clipped to
+the target height in the browser, so no temporary files or Pillow pass are
+needed.
+
+A sim is captured once it signals readiness (window.microsimReady, or its
+canvas/control layout unchanged across two animation frames after its web
+fonts have loaded), capped at --delay seconds, followed by a short --settle
+pause so the first frames are painted. --min-wait sets a floor on the time
+after page load: layout stability cannot see assets fetched by loadFont() or
+preload() or WEBGL content that draws late, so bk-capture-screenshot passes
+its delay here to keep the fixed render wait single captures always had.
+
+Sims whose main.html, .js and .css files (and capture size) hash the same as
+at their last capture, and whose PNG still exists, are skipped. The hashes
+are kept in .cache/screenshots/manifest.json under the project root (the
+parent of the docs/ directory the sims live in), wherever the tool is run
+from.
+
+Usage:
+    python capture-screenshots.py [SIM_DIR ...] [--sims-dir docs/sims]
+        [--missing-only] [--force] [--jobs N] [--delay S] [--min-wait S]
+        [--height H]
+
+Prerequisites:
+    pip install playwright
+    playwright install chromium
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    from playwright.async_api import async_playwright
+except ImportError:
+    async_playwright = None
+
+# The readiness check is shared with the microsim-utils iframe height tester
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "skills" / "microsim-utils" / "scripts"))
+from microsim_ready import WAIT_READY_JS
+
+WINDOW_WIDTH = 800
+DEFAULT_HEIGHT = 600
+CAPTURE_MARGIN = 200          # px rendered below the target height, then clipped
+DEFAULT_JOBS = 4
+DEFAULT_DELAY = 3.0           # s — max wait for a sim to signal readiness
+DEFAULT_SETTLE = 0.5          # s — extra paint time after readiness
+DEFAULT_MIN_WAIT = 0.0        # s — never capture sooner than this after load
+MANIFEST_PATH = Path(".cache") / "screenshots" / "manifest.json"  # under the project root
+MANIFEST_VERSION = 1
+
+# Software WebGL so p5.js WEBGL canvases do not render blank, and file://
+# pages allowed to load CDN scripts and sibling files
+CHROMIUM_ARGS = [
+    "--use-gl=angle",
+    "--use-angle=swiftshader",
+    "--hide-scrollbars",
+    "--disable-web-security",
+    "--allow-file-access-from-files",
+]
+
+READY_SELECTORS = "canvas, svg, button, input, select, textarea"
+
+
+@dataclass
+class CaptureJob:
+    name: str
+    sim_dir: Path
+    height: int
+    digest: str
+
+
+@dataclass
+class CaptureResult:
+    name: str
+    status: str          # CAPTURED, SKIPPED, ERROR
+    seconds: float = 0.0
+    size_kb: float = 0.0
+    ready_signal: str = ""
+    error: str = ""
+
+
+def extract_iframe_height(index_md: Path) -> int | None:
+    """The iframe height declared in a sim's index.md, if any."""
+    if not index_md.exists():
+        return None
+    text = index_md.read_text(encoding="utf-8", errors="ignore")
+    match = re.search(r'<iframe[^>]*\bheight="(\d+)(px)?"', text, re.IGNORECASE)
+    return int(match.group(1)) if match else None
+
+
+def source_digest(sim_dir: Path, width: int, height: int) -> str:
+    """SHA-256 over main.html, every .js/.css file, and the capture size."""
+    h = hashlib.sha256(f"{width}x{height}".encode())
+    for path in sorted(sim_dir.iterdir()):
+        if path.name == "main.html" or path.suffix in (".js", ".css"):
+            h.update(b"\0" + path.name.encode() + b"\0")
+            h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def project_root(path: Path) -> Path:
+    """The parent of the docs/ directory containing path, else the current directory."""
+    for parent in (path.resolve(), *path.resolve().parents):
+        if parent.name == "docs":
+            return parent.parent
+    return Path.cwd()
+
+
+def load_manifest(path: Path) -> dict:
+    """{sim directory: digest} from the last run, or {} if unreadable."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("version") == MANIFEST_VERSION:
+            return data["sims"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+    return {}
+
+
+def save_manifest(path: Path, sims: dict):
+    """Write the manifest atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps({"version": MANIFEST_VERSION, "sims": sims},
+                                   indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def discover_sims(sims_dir: Path) -> list[Path]:
+    """MicroSim directories under sims_dir that contain a main.html."""
+    if not sims_dir.is_dir():
+        print(f"❌ Sims directory not found: {sims_dir}", file=sys.stderr)
+        sys.exit(1)
+    return [d for d in sorted(sims_dir.iterdir())
+            if d.is_dir() and (d / "main.html").exists()]
+
+
+async def capture_sim(page, job: CaptureJob, delay: float, settle: float,
+                      min_wait: float = DEFAULT_MIN_WAIT) -> CaptureResult:
+    """Load one sim, wait until it is ready, and write its clipped PNG."""
+    started = time.perf_counter()
+    url = (job.sim_dir / "main.html").resolve().as_uri()
+    output = job.sim_dir / f"{job.name}.png"
+    try:
+        await page.set_viewport_size({"width": WINDOW_WIDTH,
+                                      "height": job.height + CAPTURE_MARGIN})
+        await page.goto(url, wait_until="load", timeout=30000)
+        loaded = time.perf_counter()
+        ready_signal = await page.evaluate(
+            WAIT_READY_JS, {"sel": READY_SELECTORS, "timeoutMs": int(delay * 1000)},
+        )
+        remaining = min_wait - (time.perf_counter() - loaded)
+        if remaining > 0:
+            await page.wait_for_timeout(int(remaining * 1000))
+        if settle:
+            await page.wait_for_timeout(int(settle * 1000))
+        png = await page.screenshot(
+            clip={"x": 0, "y": 0, "width": WINDOW_WIDTH, "height": job.height},
+        )
+    except Exception as e:
+        return CaptureResult(job.name, "ERROR", time.perf_counter() - started,
+                             error=(str(e).splitlines() or [type(e).__name__])[0])
+    output.write_bytes(png)
+    return CaptureResult(job.name, "CAPTURED", time.perf_counter() - started,
+                         size_kb=len(png) / 1024, ready_signal=ready_signal)
+
+
+async def capture_worker(browser, queue: asyncio.Queue, args, manifest: dict,
+                         results: list, total: int):
+    """Capture sims from the queue in one tab until the queue is empty."""
+    context = await browser.new_context()
+    page = await context.new_page()
+    try:
+        while True:
+            try:
+                job = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            result = await capture_sim(page, job, args.delay, args.settle, args.min_wait)
+            results.append(result)
+            if result.status == "CAPTURED":
+                manifest[str(job.sim_dir.resolve())] = job.digest
+                print(f"  [{len(results)}/{total}] ✅ {job.name} "
+                      f"({WINDOW_WIDTH}x{job.height}, {result.size_kb:.0f} KB) "
+                      f"in {result.seconds:.1f}s ({result.ready_signal})")
+            else:
+                print(f"  [{len(results)}/{total}] ❌ {job.name} — {result.error}")
+    finally:
+        await context.close()
+
+
+async def run_captures(jobs: list[CaptureJob], args, manifest: dict) -> list[CaptureResult]:
+    """Capture every job with one browser and a pool of --jobs tabs."""
+    queue: asyncio.Queue = asyncio.Queue()
+    for job in jobs:
+        queue.put_nowait(job)
+    results: list[CaptureResult] = []
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True, args=CHROMIUM_ARGS,
+                                          executable_path=args.chrome)
+        try:
+            workers = [
+                capture_worker(browser, queue, args, manifest, results, len(jobs))
+                for _ in range(max(1, min(args.jobs, len(jobs))))
+            ]
+            await asyncio.gather(*workers)
+        finally:
+            await browser.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Capture MicroSim screenshots in parallel with one headless Chromium."
+    )
+    parser.add_argument("sim_dirs", nargs="*", type=Path,
+                        help="MicroSim directories to capture (default: every sim in --sims-dir)")
+    parser.add_argument("--sims-dir", type=Path, default=Path("docs/sims"),
+                        help="Directory containing MicroSim folders (default: docs/sims)")
+    parser.add_argument("--missing-only", action="store_true",
+                        help="Only capture sims that have no <sim-name>.png yet")
+    parser.add_argument("--force", action="store_true",
+                        help="Capture even when the sources are unchanged since the last capture")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS,
+                        help=f"Number of parallel browser tabs (default {DEFAULT_JOBS})")
+    parser.add_argument("--delay", type=float, default=DEFAULT_DELAY,
+                        help=f"Max seconds to wait for a sim to be ready (default {DEFAULT_DELAY})")
+    parser.add_argument("--min-wait", type=float, default=DEFAULT_MIN_WAIT,
+                        help="Minimum seconds after page load before capturing, even if the "
+                             f"sim is ready sooner (default {DEFAULT_MIN_WAIT})")
+    parser.add_argument("--settle", type=float, default=DEFAULT_SETTLE,
+                        help=f"Extra seconds after readiness before capturing (default {DEFAULT_SETTLE})")
+    parser.add_argument("--height", type=int, default=None,
+                        help="Image height for every sim (default: the iframe height "
+                             f"in each index.md, else {DEFAULT_HEIGHT})")
+    parser.add_argument("--manifest", type=Path, default=None,
+                        help=f"Source-hash manifest (default: <project root>/{MANIFEST_PATH}, "
+                             "the project root being the parent of docs/)")
+    parser.add_argument("--chrome", default=None,
+                        help="Chrome/Chromium executable (default: Playwright's Chromium)")
+    args = parser.parse_args()
+
+    if async_playwright is None:
+        print("❌ Playwright is not installed. Install it with:", file=sys.stderr)
+        print("   pip install playwright && playwright install chromium", file=sys.stderr)
+        sys.exit(1)
+
+    sim_dirs = args.sim_dirs or discover_sims(args.sims_dir)
+    if args.manifest is None:
+        args.manifest = project_root(sim_dirs[0] if sim_dirs else args.sims_dir) / MANIFEST_PATH
+    manifest = load_manifest(args.manifest)
+
+    jobs: list[CaptureJob] = []
+    skipped = 0
+    for sim_dir in sim_dirs:
+        if not (sim_dir / "main.html").exists():
+            print(f"  ❌ {sim_dir.name} — main.html not found in {sim_dir}")
+            continue
+        name = sim_dir.resolve().name
+        png = sim_dir / f"{name}.png"
+        if args.missing_only and png.exists():
+            skipped += 1
+            continue
+        height = args.height or extract_iframe_height(sim_dir / "index.md") or DEFAULT_HEIGHT
+        digest = source_digest(sim_dir, WINDOW_WIDTH, height)
+        if not args.force and png.exists() and manifest.get(str(sim_dir.resolve())) == digest:
+            skipped += 1
+            continue
+        jobs.append(CaptureJob(name, sim_dir, height, digest))
+
+    print(f"📸 Capturing {len(jobs)} MicroSim(s) with {min(args.jobs, len(jobs)) or 1} tab(s); "
+          f"{skipped} unchanged or already captured\n")
+
+    started = time.perf_counter()
+    results: list[CaptureResult] = []
+    if jobs:
+        try:
+            results = asyncio.run(run_captures(jobs, args, manifest))
+        finally:
+            save_manifest(args.manifest, manifest)
+    elapsed = time.perf_counter() - started
+
+    captured = sum(1 for r in results if r.status == "CAPTURED")
+    failed = sum(1 for r in results if r.status == "ERROR")
+    print(f"\n--- Summary ---")
+    print(f"  Captured: {captured}  Skipped: {skipped}  Failed: {failed}  "
+          f"Wall time: {elapsed:.1f}s")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
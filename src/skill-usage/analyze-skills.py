@@ -1,19 +1,186 @@
 #!/usr/bin/env python3
-"""Analyze skill usage logs to identify patterns, performance metrics, and token usage."""
-
+"""Analyze skill usage logs to identify patterns, performance metrics, and token usage.
+
+The JSONL logs are streamed line by line into compact columnar arrays (epochs
+as floats, session/skill/prompt strings interned, token counts as ints) and
+every report aggregate is computed in a single pass over those columns, so
+memory stays small however long the activity logs grow.
+
+The aggregates are kept in a rollup store (skill-usage-rollup.json in the
+log directory) together with the byte offset consumed in each log. Each run
+ingests only the lines appended since the previous run, merges them into the
+rollup, and renders the report from it. --rebuild starts over from byte 0.
+"""
+
+import hashlib
+import heapq
+from bisect import bisect_right
 import json
+import math
+import os
+from array import array
 from collections import Counter, defaultdict
 from datetime import datetime
 from pathlib import Path
 import sys
 from io import StringIO
 
-def load_jsonl(filepath):
-    """Load JSONL file into list of dicts."""
-    if not filepath.exists():
-        return []
-    with open(filepath) as f:
-        return [json.loads(line) for line in f if line.strip()]
+# Sentinel for a missing token count or prompt in an int column
+MISSING = -1
+UNKNOWN_PROMPT = "Unknown prompt"
+TOKEN_FIELDS = ('input_tokens', 'output_tokens', 'total_tokens',
+                'cache_read_tokens', 'cache_creation_tokens')
+# Prompts are only ever grouped and displayed by this many leading characters
+PROMPT_KEY_CHARS = 100
+RECENT_LIMIT = 20
+TIMELINE_LIMIT = 15
+
+ROLLUP_FILE = "skill-usage-rollup.json"
+# Bump when the rollup layout or counting rules change
+ROLLUP_VERSION = 1
+PROMPTS_LOG = "prompts.jsonl"
+SKILLS_LOG = "skill-usage.jsonl"
+
+
+class Interner:
+    """Map repeated strings to small integer codes."""
+
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def __call__(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def iter_jsonl(filepath, start=0):
+    """Stream (byte offset, end offset, record) triples from a JSONL file.
+
+    Blank lines and lines that are not valid JSON yield a record of None.
+    A last line without its newline is still being written and is not
+    yielded, so the final end offset is always safe to resume from.
+    """
+    with open(filepath, 'rb') as f:
+        f.seek(start)
+        offset = start
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            line_start = offset
+            offset += len(line)
+            record = None
+            if line.strip():
+                try:
+                    record = json.loads(line.decode('utf-8'))
+                except ValueError:
+                    pass
+            yield line_start, offset, record
+
+
+def read_records(filepath, offsets):
+    """Re-read the JSONL records that start at the given byte offsets."""
+    records = []
+    with open(filepath, 'rb') as f:
+        for offset in offsets:
+            f.seek(offset)
+            records.append(json.loads(f.readline().decode('utf-8')))
+    return records
+
+
+def parse_tokens(value):
+    """Token count as an int, or MISSING for absent and 'null' values."""
+    if value is None or value == 'null' or value == '':
+        return MISSING
+    return int(value)
+
+
+def parse_duration(value):
+    """Logged duration in seconds, or NaN when it is unknown or zero."""
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        return math.nan
+    return seconds if seconds != 0 else math.nan
+
+
+class PromptLog:
+    """prompts.jsonl as parallel arrays, one entry per prompt.
+
+    Reading starts at byte offset `start`. `seeds` are (session, epoch, text)
+    prompts from already-consumed lines, placed before the new rows so new
+    skill events can still match them; they have no offset.
+    """
+
+    def __init__(self, filepath, sessions, start=0, seeds=()):
+        self.filepath = filepath
+        self.sessions = sessions
+        self.texts = Interner()
+        self.epoch = array('d')
+        self.session = array('l')
+        self.text = array('l')
+        self.offset = array('q')
+        for session, epoch, text in seeds:
+            self.append(MISSING, {'session': session, 'epoch': epoch, 'prompt': text})
+        self.seeded = len(self.epoch)
+        self.end_offset = start
+        if filepath.exists():
+            for offset, self.end_offset, record in iter_jsonl(filepath, start):
+                if record is not None:
+                    self.append(offset, record)
+
+    def __len__(self):
+        return len(self.epoch)
+
+    def append(self, offset, record):
+        self.epoch.append(float(record['epoch']))
+        self.session.append(self.sessions(record['session']))
+        self.text.append(self.texts((record.get('prompt') or '')[:PROMPT_KEY_CHARS]))
+        self.offset.append(offset)
+
+    def prompt(self, row):
+        return self.texts.values[self.text[row]]
+
+
+class SkillEventLog:
+    """skill-usage.jsonl as parallel arrays, one entry per start/end event."""
+
+    def __init__(self, filepath, sessions, start=0):
+        self.filepath = filepath
+        self.sessions = sessions
+        self.skills = Interner()
+        self.epoch = array('d')
+        self.is_end = array('b')
+        self.session = array('l')
+        self.skill = array('l')
+        self.duration = array('d')
+        self.tokens = {field: array('q') for field in TOKEN_FIELDS}
+        self.offset = array('q')
+        self.end_offset = start
+        if filepath.exists():
+            for offset, self.end_offset, record in iter_jsonl(filepath, start):
+                if record is not None:
+                    self.append(offset, record)
+
+    def __len__(self):
+        return len(self.epoch)
+
+    def append(self, offset, record):
+        event = record.get('event')
+        if event not in ('start', 'end'):
+            return
+        self.epoch.append(float(record['epoch']))
+        self.is_end.append(event == 'end')
+        self.session.append(self.sessions(record['session']))
+        self.skill.append(self.skills(record['skill']))
+        self.duration.append(parse_duration(record.get('duration_seconds')))
+        for field in TOKEN_FIELDS:
+            self.tokens[field].append(parse_tokens(record.get(field)))
+        self.offset.append(offset)
+
 
 def format_duration(seconds):
     """Format duration in human-readable format."""
@@ -42,135 +209,375 @@ def format_tokens(count):
         return f"{count/1_000:.1f}K"
     return str(count)
 
-def correlate_prompts_with_skills(prompts, skill_events):
-    """Match user prompts with skill invocations by session ID and timestamp."""
-    # Index prompts by session and epoch for better matching
-    prompts_by_session = defaultdict(list)
-    for prompt in prompts:
-        prompts_by_session[prompt['session']].append({
-            'epoch': int(prompt['epoch']),
-            'prompt': prompt['prompt'],
-            'timestamp': prompt['timestamp']
-        })
 
-    # Sort prompts by epoch within each session
-    for session in prompts_by_session:
-        prompts_by_session[session].sort(key=lambda x: x['epoch'])
-
-    # Build a map of start events to calculate duration
-    start_events = {}
-    for event in skill_events:
-        if event['event'] == 'start':
-            key = f"{event['session']}-{event['skill']}-{event['epoch']}"
-            start_events[key] = int(event['epoch'])
-
-    # Correlate skill events with nearest preceding prompt
-    correlated = []
-    for event in skill_events:
-        if event['event'] != 'end':
-            continue
+def correlate_prompts_with_skills(prompts, events):
+    """Match skill end events with their session's nearest preceding prompt.
 
-        session = event['session']
-        skill_epoch = int(event['epoch'])
-
-        # Find the most recent prompt before this skill event
-        best_prompt = "Unknown prompt"
-        prompt_epoch = None
-        session_prompts = prompts_by_session.get(session, [])
-        for p in reversed(session_prompts):
-            if p['epoch'] <= skill_epoch:
-                best_prompt = p['prompt']
-                prompt_epoch = p['epoch']
-                break
+    Prompt epochs are indexed per session and start epochs per (session,
+    skill) as sorted arrays, so both lookups are a bisect: O(n log n)
+    overall instead of a scan per event.
 
-        # Get duration from the event, or calculate from start event
-        duration = event.get('duration_seconds', 'unknown')
-        if duration == 'unknown' or duration == '0' or duration == 0:
-            # Try to find matching start event
-            for key, start_epoch in start_events.items():
-                if key.startswith(f"{session}-{event['skill']}-"):
-                    if start_epoch <= skill_epoch:
-                        duration = skill_epoch - start_epoch
-                        break
-
-        # Calculate time from prompt to skill completion
-        prompt_to_completion = None
-        if prompt_epoch:
-            prompt_to_completion = skill_epoch - prompt_epoch
-
-        correlated.append({
-            'skill': event['skill'],
-            'prompt': best_prompt,
-            'duration': duration,
-            'prompt_to_completion': prompt_to_completion,
-            'timestamp': event['timestamp'],
-            'epoch': skill_epoch,
-            'session': session,
-            'input_tokens': event.get('input_tokens'),
-            'output_tokens': event.get('output_tokens'),
-            'total_tokens': event.get('total_tokens'),
-            'cache_read_tokens': event.get('cache_read_tokens'),
-            'cache_creation_tokens': event.get('cache_creation_tokens')
-        })
+    Returns a dict of arrays aligned with the end events: 'row' (event row),
+    'prompt' (prompt row, or MISSING) and 'duration' (seconds, NaN if unknown).
+    """
+    # Prompt rows per session, sorted by epoch, with a parallel epoch array
+    prompts_by_session = defaultdict(list)
+    for row in range(len(prompts)):
+        prompts_by_session[prompts.session[row]].append(row)
+    prompt_index = {}
+    for session, rows in prompts_by_session.items():
+        rows.sort(key=prompts.epoch.__getitem__)
+        prompt_index[session] = (rows, array('d', (prompts.epoch[row] for row in rows)))
+
+    # Sorted start epochs per (session, skill) to calculate missing durations
+    start_epochs = defaultdict(lambda: array('d'))
+    for row in range(len(events)):
+        if not events.is_end[row]:
+            start_epochs[(events.session[row], events.skill[row])].append(events.epoch[row])
+    for epochs in start_epochs.values():
+        if any(a > b for a, b in zip(epochs, epochs[1:])):
+            epochs[:] = array('d', sorted(epochs))
+
+    correlated = {'row': array('l'), 'prompt': array('l'), 'duration': array('d')}
+    no_prompts = ([], array('d'))
+    for row in range(len(events)):
+        if not events.is_end[row]:
+            continue
 
-    return correlated
+        session = events.session[row]
+        skill_epoch = events.epoch[row]
 
+        # Most recent prompt at or before this skill event
+        rows, epochs = prompt_index.get(session, no_prompts)
+        i = bisect_right(epochs, skill_epoch)
+        prompt_row = rows[i - 1] if i else MISSING
 
-def analyze_prompt_timing(prompts):
-    """Analyze timing between prompts to understand session activity."""
-    if len(prompts) < 2:
-        return []
+        # Get duration from the event, or from the nearest preceding start
+        duration = events.duration[row]
+        if math.isnan(duration):
+            starts = start_epochs.get((session, events.skill[row]))
+            if starts:
+                i = bisect_right(starts, skill_epoch)
+                if i:
+                    duration = skill_epoch - starts[i - 1]
 
-    # Sort by epoch
-    sorted_prompts = sorted(prompts, key=lambda x: int(x['epoch']))
+        correlated['row'].append(row)
+        correlated['prompt'].append(prompt_row)
+        correlated['duration'].append(duration)
+
+    return correlated
 
-    timing_data = []
-    for i in range(1, len(sorted_prompts)):
-        prev = sorted_prompts[i-1]
-        curr = sorted_prompts[i]
 
-        time_diff = int(curr['epoch']) - int(prev['epoch'])
+def analyze_prompt_timing(latest_prompts):
+    """Gaps between consecutive prompts to understand session activity.
 
+    `latest_prompts` is the rollup's ascending list of the newest prompts;
+    the first one only supplies the time of its successor's predecessor.
+    """
+    timing_data = []
+    for prev, curr in zip(latest_prompts, latest_prompts[1:]):
         timing_data.append({
             'timestamp': curr['timestamp'],
             'prompt': curr['prompt'][:80],
-            'seconds_since_prev': time_diff,
+            'seconds_since_prev': int(curr['epoch']) - int(prev['epoch']),
             'session': curr['session']
         })
 
     return timing_data
 
-def generate_report(log_dir, project_dir=None):
+
+def summarize_usage(prompts, events, correlated, invocation_base=0, prompt_base=0,
+                    recent_limit=RECENT_LIMIT, timeline_limit=TIMELINE_LIMIT):
+    """Compute every report aggregate in one pass over the correlated columns.
+
+    `invocation_base` and `prompt_base` are the invocations and prompts
+    already in the rollup, so the sequence numbers kept on recent entries
+    and latest prompts are global across runs.
+    """
+    skill_counts = Counter()
+    skill_tokens = defaultdict(lambda: {
+        'input': 0, 'output': 0, 'total': 0,
+        'cache_read': 0, 'cache_creation': 0, 'count': 0,
+        'total_time': 0, 'time_count': 0
+    })
+    prompt_counts = Counter()
+    totals = {'tokens': 0, 'cache_read': 0, 'cache_creation': 0, 'time': 0, 'timed': 0}
+    recent = []  # min-heap of (epoch, -index) for the newest invocations
+
+    tokens = events.tokens
+    for i, row in enumerate(correlated['row']):
+        skill = events.skill[row]
+        data = skill_tokens[skill]
+        skill_counts[skill] += 1
+        data['count'] += 1
+
+        total = tokens['total_tokens'][row]
+        if total > 0:
+            data['total'] += total
+            totals['tokens'] += total
+        if tokens['input_tokens'][row] > 0:
+            data['input'] += tokens['input_tokens'][row]
+        if tokens['output_tokens'][row] > 0:
+            data['output'] += tokens['output_tokens'][row]
+        cache_read = tokens['cache_read_tokens'][row]
+        if cache_read > 0:
+            data['cache_read'] += cache_read
+            totals['cache_read'] += cache_read
+        cache_create = tokens['cache_creation_tokens'][row]
+        if cache_create > 0:
+            data['cache_creation'] += cache_create
+            totals['cache_creation'] += cache_create
+
+        # Track timing from prompt to completion
+        prompt_row = correlated['prompt'][i]
+        if prompt_row != MISSING:
+            prompt_counts[prompts.text[prompt_row]] += 1
+            prompt_to_completion = events.epoch[row] - prompts.epoch[prompt_row]
+            if prompt_to_completion > 0:
+                data['total_time'] += prompt_to_completion
+                data['time_count'] += 1
+                totals['time'] += prompt_to_completion
+                totals['timed'] += 1
+
+        entry = (events.epoch[row], -i)
+        if len(recent) < recent_limit:
+            heapq.heappush(recent, entry)
+        elif entry > recent[0]:
+            heapq.heapreplace(recent, entry)
+
+    # Newest first; re-read only the displayed rows for their timestamps
+    recent_index = [-neg_i for _, neg_i in sorted(recent, reverse=True)]
+    recent_rows = [correlated['row'][i] for i in recent_index]
+    records = read_records(events.filepath, [events.offset[row] for row in recent_rows])
+    recent_entries = []
+    for i, row, record in zip(recent_index, recent_rows, records):
+        total = tokens['total_tokens'][row]
+        prompt_row = correlated['prompt'][i]
+        recent_entries.append({
+            'epoch': events.epoch[row],
+            'seq': invocation_base + i,
+            'timestamp': record['timestamp'],
+            'skill': events.skills.values[events.skill[row]],
+            'total_tokens': total if total != MISSING else None,
+            'prompt': prompts.prompt(prompt_row) if prompt_row != MISSING else UNKNOWN_PROMPT,
+            'prompt_to_completion': (events.epoch[row] - prompts.epoch[prompt_row]
+                                     if prompt_row != MISSING else None),
+        })
+
+    # Newest timeline_limit+1 prompts read in this run, oldest first
+    new_rows = range(prompts.seeded, len(prompts))
+    latest = heapq.nlargest(timeline_limit + 1, new_rows,
+                            key=lambda row: (prompts.epoch[row], row))
+    latest.reverse()
+    records = read_records(prompts.filepath, [prompts.offset[row] for row in latest])
+    latest_prompts = []
+    for row, record in zip(latest, records):
+        latest_prompts.append({
+            'epoch': prompts.epoch[row],
+            'seq': prompt_base + row - prompts.seeded,
+            'timestamp': record['timestamp'],
+            'prompt': prompts.prompt(row),
+            'session': prompts.sessions.values[prompts.session[row]],
+        })
+
+    skill_names = events.skills.values
+    prompt_texts = prompts.texts.values
+    return {
+        'invocations': len(correlated['row']),
+        'skill_counts': {skill_names[s]: c for s, c in skill_counts.items()},
+        'skill_tokens': {skill_names[s]: data for s, data in skill_tokens.items()},
+        'total_tokens': totals['tokens'],
+        'total_cache_read': totals['cache_read'],
+        'total_cache_creation': totals['cache_creation'],
+        'total_time': totals['time'],
+        'timed_count': totals['timed'],
+        'prompt_counts': {prompt_texts[t]: c for t, c in prompt_counts.items()},
+        'recent': recent_entries,
+        'latest_prompts': latest_prompts,
+    }
+
+
+def merge_summaries(base, new, recent_limit=RECENT_LIMIT, timeline_limit=TIMELINE_LIMIT):
+    """Fold the summary of newly appended log lines into the rollup summary.
+
+    Counts and totals add up; dict insertion order is kept (first seen
+    first) so ties sort exactly as they would in a full rebuild.
+    """
+    merged = dict(base)
+    for key in ('invocations', 'total_tokens', 'total_cache_read',
+                'total_cache_creation', 'total_time', 'timed_count'):
+        merged[key] = base[key] + new[key]
+
+    for key in ('skill_counts', 'prompt_counts'):
+        counts = dict(base[key])
+        for name, count in new[key].items():
+            counts[name] = counts.get(name, 0) + count
+        merged[key] = counts
+
+    skill_tokens = {skill: dict(data) for skill, data in base['skill_tokens'].items()}
+    for skill, data in new['skill_tokens'].items():
+        if skill not in skill_tokens:
+            skill_tokens[skill] = dict(data)
+            continue
+        for field, value in data.items():
+            skill_tokens[skill][field] += value
+    merged['skill_tokens'] = skill_tokens
+
+    merged['recent'] = heapq.nlargest(recent_limit, base['recent'] + new['recent'],
+                                      key=lambda entry: (entry['epoch'], -entry['seq']))
+    latest = sorted(base['latest_prompts'] + new['latest_prompts'],
+                    key=lambda entry: (entry['epoch'], entry['seq']))
+    merged['latest_prompts'] = latest[-(timeline_limit + 1):]
+    return merged
+
+
+def empty_rollup():
+    """A rollup that has consumed nothing."""
+    return {
+        'version': ROLLUP_VERSION,
+        'logs': {},
+        'events_seen': 0,
+        'prompt_rows': 0,
+        'session_prompts': {},
+        'summary': {
+            'invocations': 0, 'skill_counts': {}, 'skill_tokens': {},
+            'total_tokens': 0, 'total_cache_read': 0, 'total_cache_creation': 0,
+            'total_time': 0, 'timed_count': 0, 'prompt_counts': {},
+            'recent': [], 'latest_prompts': [],
+        },
+    }
+
+
+def log_head(filepath, length):
+    """sha256 of the first `length` bytes (up to 1 KiB) of a log file.
+
+    Stored with each consumed offset so a rotated or rewritten log is
+    noticed even when it has grown past the old offset.
+    """
+    with open(filepath, 'rb') as f:
+        return hashlib.sha256(f.read(min(length, 1024))).hexdigest()
+
+
+def load_rollup(log_dir):
+    """Load the rollup, or an empty one if it is missing, stale or invalid."""
+    rollup_path = log_dir / ROLLUP_FILE
+    try:
+        with open(rollup_path, encoding='utf-8') as f:
+            rollup = json.load(f)
+    except (OSError, ValueError):
+        return empty_rollup()
+    if rollup.get('version') != ROLLUP_VERSION:
+        return empty_rollup()
+
+    for name in (PROMPTS_LOG, SKILLS_LOG):
+        consumed = rollup['logs'].get(name)
+        if consumed is None:
+            continue
+        filepath = log_dir / name
+        if (not filepath.exists()
+                or filepath.stat().st_size < consumed['offset']
+                or log_head(filepath, consumed['offset']) != consumed['head']):
+            # The log was truncated, rotated or replaced: start over
+            return empty_rollup()
+    return rollup
+
+
+def save_rollup(log_dir, rollup):
+    """Write the rollup atomically next to the logs."""
+    rollup_path = log_dir / ROLLUP_FILE
+    tmp_path = rollup_path.with_name(rollup_path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(rollup, f, ensure_ascii=False)
+    os.replace(tmp_path, rollup_path)
+
+
+def update_rollup(log_dir, rebuild=False):
+    """Ingest only the log lines appended since the last run.
+
+    Each log is read from the byte offset recorded in the rollup. The last
+    prompt of every session is carried over so new skill events can still
+    be matched with a prompt from an earlier run; the hooks append both logs
+    in time order, so no older prompt is ever needed. Returns the updated
+    rollup.
+    """
+    rollup = empty_rollup() if rebuild else load_rollup(log_dir)
+    offsets = {name: consumed['offset'] for name, consumed in rollup['logs'].items()}
+
+    sessions = Interner()
+    seeds = [(session, epoch, text)
+             for session, (epoch, text) in rollup['session_prompts'].items()]
+    prompts = PromptLog(log_dir / PROMPTS_LOG, sessions,
+                        start=offsets.get(PROMPTS_LOG, 0), seeds=seeds)
+    events = SkillEventLog(log_dir / SKILLS_LOG, sessions,
+                           start=offsets.get(SKILLS_LOG, 0))
+
+    if len(events) or len(prompts) > prompts.seeded:
+        correlated = correlate_prompts_with_skills(prompts, events)
+        new = summarize_usage(prompts, events, correlated,
+                              invocation_base=rollup['summary']['invocations'],
+                              prompt_base=rollup['prompt_rows'])
+        rollup['summary'] = merge_summaries(rollup['summary'], new)
+        rollup['events_seen'] += len(events)
+        rollup['prompt_rows'] += len(prompts) - prompts.seeded
+
+        # Keep the newest prompt per session, as the bisect lookup would pick it
+        last_prompt = {}
+        for row in range(len(prompts)):
+            last_prompt[prompts.session[row]] = max(
+                last_prompt.get(prompts.session[row], (-math.inf, -1)),
+                (prompts.epoch[row], row))
+        rollup['session_prompts'] = {
+            sessions.values[session]: [epoch, prompts.prompt(row)]
+            for session, (epoch, row) in last_prompt.items()
+        }
+
+    for name, log in ((PROMPTS_LOG, prompts), (SKILLS_LOG, events)):
+        if log.filepath.exists():
+            rollup['logs'][name] = {'offset': log.end_offset,
+                                    'head': log_head(log.filepath, log.end_offset)}
+    save_rollup(log_dir, rollup)
+    return rollup
+
+
+def generate_report(log_dir, project_dir=None, rebuild=False):
     """Generate skill usage report and return as string."""
     log_dir = Path(log_dir)
+
+    # Bring the rollup up to date with anything appended to the logs
+    rollup = update_rollup(log_dir, rebuild)
+
+    if not rollup['events_seen']:
+        output = StringIO()
+        output.write("No skill usage data found yet.\n")
+        output.write(f"Logs will be created in: {log_dir}\n")
+        output.write("\nUse skills in Claude Code and they'll be tracked automatically.\n")
+        return output.getvalue(), False
+
+    return render_report(rollup['summary'], log_dir, project_dir), True
+
+
+def render_report(summary, log_dir, project_dir=None):
+    """Render the markdown report from summarize_usage() aggregates."""
     output = StringIO()
 
     def write(text=""):
         output.write(text + "\n")
 
-    # Load logs
-    prompts = load_jsonl(log_dir / "prompts.jsonl")
-    skill_events = load_jsonl(log_dir / "skill-usage.jsonl")
-
-    if not skill_events:
-        write("No skill usage data found yet.")
-        write(f"Logs will be created in: {log_dir}")
-        write("\nUse skills in Claude Code and they'll be tracked automatically.")
-        return output.getvalue(), False
-
-    # Correlate prompts with skills
-    correlated = correlate_prompts_with_skills(prompts, skill_events)
+    skill_counts = Counter(summary['skill_counts'])
+    skill_tokens = summary['skill_tokens']
+    total_tokens_all = summary['total_tokens']
+    total_cache_read = summary['total_cache_read']
+    total_cache_creation = summary['total_cache_creation']
 
     write("# Skill Usage Report")
     write()
     write(f"**Project:** {project_dir.name if project_dir else 'Unknown'}<br/>")
     write(f"**Log directory:** `{log_dir}`<br/>")
-    write(f"**Total skill invocations:** {len(correlated)}<br/>")
+    write(f"**Total skill invocations:** {summary['invocations']}<br/>")
     write(f"**Report generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     write()
 
     # Skill frequency analysis
-    skill_counts = Counter(entry['skill'] for entry in correlated)
     write("## Skill Usage Summary")
     write()
     for skill, count in skill_counts.most_common():
@@ -180,46 +587,6 @@ def generate_report(log_dir, project_dir=None):
     write()
     write("## Token Usage by Skill")
     write()
-    skill_tokens = defaultdict(lambda: {
-        'input': 0, 'output': 0, 'total': 0,
-        'cache_read': 0, 'cache_creation': 0, 'count': 0,
-        'total_time': 0, 'time_count': 0
-    })
-
-    total_tokens_all = 0
-    total_cache_read = 0
-    total_cache_creation = 0
-
-    for entry in correlated:
-        skill = entry['skill']
-        skill_tokens[skill]['count'] += 1
-
-        if entry.get('total_tokens') and entry['total_tokens'] != 'null':
-            tokens = int(entry['total_tokens'])
-            skill_tokens[skill]['total'] += tokens
-            total_tokens_all += tokens
-
-        if entry.get('input_tokens') and entry['input_tokens'] != 'null':
-            skill_tokens[skill]['input'] += int(entry['input_tokens'])
-
-        if entry.get('output_tokens') and entry['output_tokens'] != 'null':
-            skill_tokens[skill]['output'] += int(entry['output_tokens'])
-
-        if entry.get('cache_read_tokens') and entry['cache_read_tokens'] != 'null':
-            cache_read = int(entry['cache_read_tokens'])
-            skill_tokens[skill]['cache_read'] += cache_read
-            total_cache_read += cache_read
-
-        if entry.get('cache_creation_tokens') and entry['cache_creation_tokens'] != 'null':
-            cache_create = int(entry['cache_creation_tokens'])
-            skill_tokens[skill]['cache_creation'] += cache_create
-            total_cache_creation += cache_create
-
-        # Track timing from prompt to completion
-        if entry.get('prompt_to_completion') and entry['prompt_to_completion'] > 0:
-            skill_tokens[skill]['total_time'] += entry['prompt_to_completion']
-            skill_tokens[skill]['time_count'] += 1
-
     write("| Skill | Invocations | Total Tokens | Avg Time | Cache Read | Cache Creation |")
     write("|-------|-------------|--------------|----------|------------|----------------|")
 
@@ -244,10 +611,10 @@ def generate_report(log_dir, project_dir=None):
         write(f"| Estimated API cost | ${total_tokens_all * 0.000003:.2f} |")
 
     # Timing summary
-    total_time = sum(e.get('prompt_to_completion', 0) or 0 for e in correlated)
-    timed_skills = [e for e in correlated if e.get('prompt_to_completion') and e['prompt_to_completion'] > 0]
-    if timed_skills:
-        avg_time = total_time // len(timed_skills)
+    total_time = summary['total_time']
+    timed_count = summary['timed_count']
+    if timed_count:
+        avg_time = total_time // timed_count
         write()
         write("## Timing Summary")
         write()
@@ -255,15 +622,14 @@ def generate_report(log_dir, project_dir=None):
         write(f"|--------|-------|")
         write(f"| Total time in skills | {format_duration(total_time)} |")
         write(f"| Average time per skill | {format_duration(avg_time)} |")
-        write(f"| Skills with timing data | {len(timed_skills)} of {len(correlated)} |")
+        write(f"| Skills with timing data | {timed_count} of {summary['invocations']} |")
 
     # Common prompts that trigger skills
     write()
     write("## Common Prompts")
     write()
-    prompt_counts = Counter(entry['prompt'][:100] for entry in correlated if entry['prompt'] != "Unknown prompt")
     shown = 0
-    for prompt, count in prompt_counts.most_common(10):
+    for prompt, count in Counter(summary['prompt_counts']).most_common(10):
         if count > 1 or shown < 5:
             truncated = prompt[:80] + "..." if len(prompt) > 80 else prompt
             write(f"- {count}x: \"{truncated}\"")
@@ -277,21 +643,21 @@ def generate_report(log_dir, project_dir=None):
     write()
     write("| Timestamp | Skill | Tokens | Time from Prompt | Prompt (truncated) |")
     write("|-----------|-------|--------|------------------|---------------------|")
-    for entry in sorted(correlated, key=lambda x: x['timestamp'], reverse=True)[:20]:
+    for entry in summary['recent']:
         tokens = format_tokens(entry.get('total_tokens'))
         prompt_short = entry['prompt'][:50].replace('|', '\\|').replace('\n', ' ')
         time_from_prompt = format_duration(entry.get('prompt_to_completion')) if entry.get('prompt_to_completion') else 'N/A'
         write(f"| {entry['timestamp']} | {entry['skill']} | {tokens} | {time_from_prompt} | {prompt_short}... |")
 
     # Session activity timing
-    prompt_timing = analyze_prompt_timing(prompts)
+    prompt_timing = analyze_prompt_timing(summary['latest_prompts'])
     if prompt_timing:
         write()
         write("## Session Activity Timeline")
         write()
         write("| Timestamp | Time Since Previous | Prompt (truncated) |")
         write("|-----------|---------------------|---------------------|")
-        for entry in prompt_timing[-15:]:  # Last 15 entries
+        for entry in prompt_timing:
             time_since = format_duration(entry['seconds_since_prev'])
             prompt_short = entry['prompt'][:60].replace('|', '\\|').replace('\n', ' ')
             write(f"| {entry['timestamp']} | {time_since} | {prompt_short}... |")
@@ -332,7 +698,7 @@ def generate_report(log_dir, project_dir=None):
         else:
             write(f"❌ Low cache utilization ({cache_hit_ratio:.1f}% cache hits)")
 
-    return output.getvalue(), True
+    return output.getvalue()
 
 def generate_html_report(markdown_content, project_name="Skill Usage"):
     """Convert markdown report to styled HTML."""
@@ -565,9 +931,10 @@ def generate_html_report(markdown_content, project_name="Skill Usage"):
     return html
 
 
-def analyze_skill_usage(log_dir, output_file=None, project_dir=None, output_format='markdown'):
+def analyze_skill_usage(log_dir, output_file=None, project_dir=None, output_format='markdown',
+                        rebuild=False):
     """Analyze skill usage patterns and generate report."""
-    report, success = generate_report(log_dir, project_dir)
+    report, success = generate_report(log_dir, project_dir, rebuild)
 
     # Generate HTML if requested
     if output_format == 'html':
@@ -606,6 +973,8 @@ def main():
     parser.add_argument('-o', '--output', help='Output file path')
     parser.add_argument('-p', '--project', help='Project directory (for context)')
     parser.add_argument('--html', action='store_true', help='Generate HTML report instead of markdown')
+    parser.add_argument('--rebuild', action='store_true',
+                        help=f'Discard {ROLLUP_FILE} and re-read the logs from the start')
 
     args = parser.parse_args()
 
@@ -642,7 +1011,7 @@ def main():
         return
 
     output_format = 'html' if args.html else 'markdown'
-    analyze_skill_usage(log_dir, output_file, project_dir, output_format)
+    analyze_skill_usage(log_dir, output_file, project_dir, output_format, args.rebuild)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark correlate_prompts_with_skills in analyze-skills.py.
+
+Builds synthetic prompt and skill-event columns in memory (up to 1M skill
+events by default, no files written) and times the correlation step at
+doubling sizes:
+
+  linear  - the previous lookups: a reversed scan of the session's prompts
+            and a scan of the (session, skill) start list for every end
+            event; only run up to --linear-max events
+  bisect  - correlate_prompts_with_skills: sorted per-session prompt epochs
+            and per-(session, skill) start epochs, one bisect per lookup
+
+The "per n log n" column stays roughly flat when the step scales as
+O(n log n).
+
+Usage:
+    python benchmark-correlation.py [--max-events 1000000] [--linear-max 64000]
+"""
+
+import argparse
+import math
+import random
+import time
+from array import array
+from collections import defaultdict
+from importlib.util import spec_from_file_location, module_from_spec
+from pathlib import Path
+
+_this_dir = Path(__file__).resolve().parent
+_spec = spec_from_file_location("analyze_skills", _this_dir / "analyze-skills.py")
+analyze_skills = module_from_spec(_spec)
+_spec.loader.exec_module(analyze_skills)
+
+SKILLS = [f"skill-{i}" for i in range(40)]
+NO_FILE = Path("/nonexistent/benchmark.jsonl")
+
+
+def build_logs(events: int, sessions: int = 50, seed: int = 3):
+    """Return (PromptLog, SkillEventLog) with `events` start/end events."""
+    rng = random.Random(seed)
+    interner = analyze_skills.Interner()
+    prompts = analyze_skills.PromptLog(NO_FILE, interner)
+    skill_events = analyze_skills.SkillEventLog(NO_FILE, interner)
+    epoch = 1_700_000_000
+    for n in range(events // 2):
+        session = f"session-{n % sessions}"
+        epoch += rng.randint(1, 30)
+        prompts.append(0, {'epoch': epoch, 'session': session,
+                           'prompt': f"prompt {rng.randint(0, 2000)}"})
+        skill = rng.choice(SKILLS)
+        epoch += rng.randint(1, 10)
+        skill_events.append(0, {'epoch': epoch, 'session': session,
+                                'skill': skill, 'event': 'start'})
+        epoch += rng.randint(1, 300)
+        skill_events.append(0, {'epoch': epoch, 'session': session, 'skill': skill,
+                                'event': 'end', 'duration_seconds': 'unknown',
+                                'total_tokens': 1000})
+    return prompts, skill_events
+
+
+def linear_correlate(prompts, events):
+    """The scan-based lookups that correlate_prompts_with_skills replaced."""
+    prompts_by_session = defaultdict(list)
+    for row in range(len(prompts)):
+        prompts_by_session[prompts.session[row]].append(row)
+    for rows in prompts_by_session.values():
+        rows.sort(key=prompts.epoch.__getitem__)
+
+    start_epochs = defaultdict(list)
+    for row in range(len(events)):
+        if not events.is_end[row]:
+            start_epochs[(events.session[row], events.skill[row])].append(events.epoch[row])
+
+    correlated = {'row': array('l'), 'prompt': array('l'), 'duration': array('d')}
+    for row in range(len(events)):
+        if not events.is_end[row]:
+            continue
+        session = events.session[row]
+        skill_epoch = events.epoch[row]
+        prompt_row = analyze_skills.MISSING
+        for p in reversed(prompts_by_session.get(session, [])):
+            if prompts.epoch[p] <= skill_epoch:
+                prompt_row = p
+                break
+        duration = events.duration[row]
+        if math.isnan(duration):
+            for start_epoch in start_epochs.get((session, events.skill[row]), []):
+                if start_epoch <= skill_epoch:
+                    duration = skill_epoch - start_epoch
+                    break
+        correlated['row'].append(row)
+        correlated['prompt'].append(prompt_row)
+        correlated['duration'].append(duration)
+    return correlated
+
+
+def timed(func, prompts, events):
+    """Return (seconds, result) for one correlation run."""
+    start = time.perf_counter()
+    result = func(prompts, events)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-events", type=int, default=1_000_000)
+    parser.add_argument("--linear-max", type=int, default=64_000)
+    parser.add_argument("--start", type=int, default=15_625)
+    args = parser.parse_args()
+
+    print("| Events | Strategy | Time (s) | Per n log n (ns) |")
+    print("|-------:|----------|---------:|-----------------:|")
+    size = args.start
+    while size <= args.max_events:
+        prompts, events = build_logs(size)
+        scale = size * math.log2(size)
+        bisect_time, fast = timed(analyze_skills.correlate_prompts_with_skills, prompts, events)
+        print(f"| {size:,} | bisect | {bisect_time:.3f} | {bisect_time / scale * 1e9:.1f} |")
+        if size <= args.linear_max:
+            linear_time, slow = timed(linear_correlate, prompts, events)
+            print(f"| {size:,} | linear | {linear_time:.3f} | {linear_time / scale * 1e9:.1f} |")
+            if list(slow['prompt']) != list(fast['prompt']):
+                print(f"| {size:,} | ❌ prompt matches differ | | |")
+        size *= 2
+
+
+if __name__ == "__main__":
+    main()